@@ -0,0 +1,47 @@
+"""Benchmark of the JSON decoders on the response fixtures in tests/fixtures.
+
+Compares decoding the raw response bytes with every installed decoder to the old path of response.json(),
+which decodes the bytes to text first. Decoders that are not installed are skipped.
+
+Run from the repository root: python benchmarks/bench_decoders.py"""
+import json
+import os
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from benzinga.decoders import AUTO_DECODERS, load_decoder  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+ENDPOINTS = ("instruments", "financials", "options_activity")
+
+
+def text_json(body):
+    return json.loads(body.decode("utf-8"))
+
+
+def decoders():
+    found = {"json (text)": text_json}
+    for name in AUTO_DECODERS:
+        try:
+            found[name] = load_decoder(name)
+        except ImportError:
+            print("%s is not installed, skipped" % name)
+    return found
+
+
+def main(number=500):
+    candidates = decoders()
+    print("%-18s %-14s %12s %10s" % ("endpoint", "decoder", "us per call", "MB/s"))
+    for endpoint in ENDPOINTS:
+        with open(os.path.join(FIXTURES, endpoint + ".json"), "rb") as fh:
+            body = fh.read()
+        for name, decode in candidates.items():
+            seconds = min(timeit.repeat(lambda: decode(body), number=number, repeat=5)) / number
+            print("%-18s %-14s %12.1f %10.1f" % (endpoint, name, seconds * 1e6, len(body) / seconds / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Microbenchmark of the tracing hook overhead per call.
+
+Calls are answered by a stub transport adapter, so the numbers show the client's own cost: without hooks, with
+one hook whose callbacks do nothing, and with the OpenTelemetry adapter when opentelemetry-sdk is installed.
+
+Run from the repository root: python benchmarks/bench_hooks.py"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from requests.adapters import BaseAdapter  # noqa: E402
+from requests.models import Response  # noqa: E402
+
+from benzinga import financial_data  # noqa: E402
+from benzinga.tracing import RequestHook  # noqa: E402
+
+BODY = b'{"ratings": [{"id": "1", "ticker": "AAPL", "date": "2024-01-02", "pt_current": "200"}]}'
+
+
+class StubAdapter(BaseAdapter):
+    """Transport adapter answering every request with BODY, without any network."""
+
+    def send(self, request, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response.headers["Content-Type"] = "application/json"
+        response._content = BODY
+        return response
+
+    def close(self):
+        pass
+
+
+def client(hooks=None):
+    fin = financial_data.Benzinga("token", log=False, hooks=hooks)
+    fin.session.mount("https://", StubAdapter())
+    return fin
+
+
+def opentelemetry_hooks():
+    try:
+        from opentelemetry.sdk.trace import TracerProvider
+    except ImportError:
+        return None
+    from benzinga.tracing import OpenTelemetryHook
+    return [OpenTelemetryHook(tracer_provider=TracerProvider())]
+
+
+def main(number=1000, repeat=15):
+    cases = {"no hooks": None, "no-op hook": [RequestHook()], "opentelemetry": opentelemetry_hooks()}
+    if cases["opentelemetry"] is None:
+        print("opentelemetry-sdk is not installed, skipped")
+        del cases["opentelemetry"]
+    clients = {label: client(hooks) for label, hooks in cases.items()}
+    best = dict.fromkeys(clients, float("inf"))
+    # The cases take turns in every round, so that drift of the machine's speed hits them all alike.
+    for _ in range(repeat):
+        for label, fin in clients.items():
+            seconds = timeit.timeit(lambda: fin.ratings(company_tickers="AAPL"), number=number) / number
+            best[label] = min(best[label], seconds)
+    baseline = best["no hooks"]
+    print("%-14s %12s %10s" % ("hooks", "us per call", "overhead"))
+    for label, seconds in best.items():
+        print("%-14s %12.1f %9.1f%%" % (label, seconds * 1e6, (seconds / baseline - 1) * 100))
+
+    # The dispatch alone, without the request around it: what a no-op hook adds, and what the "if self.hooks"
+    # test costs a client without hooks.
+    traced, plain = clients["no-op hook"], clients["no hooks"]
+    params = {"token": "token", "parameters[tickers]": "AAPL", "page": None}
+
+    def dispatch():
+        context = traced._trace_start("ratings", "https://api.benzinga.com/api/v2/calendar/ratings", params)
+        traced._trace_end(context, 200, 0.01, 100, 0)
+
+    def check():
+        return traced._trace_start if plain.hooks else None
+
+    for label, function in (("no-op hook dispatch", dispatch), ("no hooks check", check)):
+        seconds = min(timeit.repeat(function, number=100000, repeat=5)) / 100000
+        print("%-20s %9.3f us" % (label, seconds * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Microbenchmark of parameter validation cost per call.
+
+Run from the repository root: python benchmarks/bench_validation.py"""
+import datetime as dt
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benzinga.param_check import VALIDATORS  # noqa: E402
+
+CASES = {
+    "calendar_check (exact types)": ("calendar_check", {
+        "token": "token", "page": 0, "pagesize": 1000, "parameters[date_from]": "2024-01-02",
+        "parameters[date_to]": "2024-01-31", "parameters[tickers]": "AAPL,MSFT", "parameters[importance]": None,
+        "parameters[updated]": None,
+    }),
+    "calendar_check (coerced date)": ("calendar_check", {
+        "token": "token", "page": 0, "pagesize": 1000, "parameters[date_from]": dt.date(2024, 1, 2),
+        "parameters[date_to]": dt.date(2024, 1, 31), "parameters[tickers]": "AAPL,MSFT",
+    }),
+    "autocomplete_check": ("autocomplete_check", {
+        "apikey": "token", "query": "AAP", "limit": 10, "searchMethod": None, "exchanges": None, "types": None,
+    }),
+    "news_check": ("news_check", {
+        "token": "token", "pageSize": 100, "page": 0, "displayOutput": "full", "date": None, "dateFrom": None,
+    }),
+}
+
+
+def main(number=200000):
+    print("%-32s %12s" % ("check", "ns per call"))
+    for label, (check, params) in CASES.items():
+        validate = VALIDATORS[check]
+        # Coercions change the dict in place, so every call gets a fresh copy; the copy is measured separately.
+        total = min(timeit.repeat(lambda: validate(dict(params)), number=number, repeat=5))
+        copy = min(timeit.repeat(lambda: dict(params), number=number, repeat=5))
+        print("%-32s %12.0f" % (label, (total - copy) / number * 1e9))
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,43 @@
 name = "benzinga"
+
+# Submodules and public classes are imported on first attribute access, so "import benzinga" does not pull in
+# requests, structlog or aiohttp until a client is actually used.
+_SUBMODULES = (
+    "async_client", "backfill", "benzinga_errors", "cache", "candles", "client", "concurrency", "config", "decoders",
+    "endpoints", "export", "fields", "financial_data", "frames", "metrics", "news_data", "output", "param_check",
+    "rate_limit", "records", "streaming", "sync", "timeseries", "tracing",
+)
+_ATTRIBUTES = {
+    "Benzinga": "financial_data",
+    "News": "news_data",
+    "AsyncBenzinga": "async_client",
+    "AsyncNews": "async_client",
+    "ResponseCache": "cache",
+    "DiskCache": "cache",
+    "RateLimiter": "rate_limit",
+    "AIMDController": "concurrency",
+    "CalendarSync": "sync",
+    "CalendarExport": "export",
+    "CandleStore": "timeseries",
+    "MetricsRegistry": "metrics",
+    "RequestHook": "tracing",
+    "OpenTelemetryHook": "tracing",
+}
+
+# The asyncio clients need the optional aiohttp dependency and are left out of "from benzinga import *".
+__all__ = [attribute for attribute, module in _ATTRIBUTES.items() if module != "async_client"]
+
+
+def __getattr__(attribute):
+    import importlib
+    if attribute in _SUBMODULES:
+        return importlib.import_module("." + attribute, __name__)
+    if attribute in _ATTRIBUTES:
+        value = getattr(importlib.import_module("." + _ATTRIBUTES[attribute], __name__), attribute)
+        globals()[attribute] = value
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, attribute))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ATTRIBUTES) | set(_SUBMODULES))
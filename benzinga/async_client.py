@@ -0,0 +1,294 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+import aiohttp
+from .backfill import date_shards, split_shard, merge_records
+from .benzinga_errors import IncorrectParameterEntry
+from .client import page_records, get_logger
+from .config import RETRIES, BACKOFF_FACTOR, STATUS_FORCELIST
+from .rate_limit import retry_after_seconds
+from .financial_data import Benzinga, CALENDAR_KEYS
+from .news_data import News, NewsCursor
+from .output import records_converter
+
+
+class AsyncClientMixin:
+
+    def __init__(self, api_token, log=True, pool_maxsize=10, max_concurrency=50, session=None,
+                 retries=RETRIES, backoff_factor=BACKOFF_FACTOR, timeout=10, cache=None, rate_limiter=None,
+                 concurrency=None, **client_options):
+        """Asyncio transport for the Benzinga and News clients. Every public method of the synchronous client is
+        exposed as a coroutine with the same arguments, all calls share one aiohttp connection pool and at most
+        max_concurrency requests are in flight at once. Errors are raised as the same benzinga_errors exceptions.
+
+        Arguments:
+            Required - api_token (str)
+            Optional:
+            log (bool) - log the status code and endpoint of every call
+            pool_maxsize (int) - maximum number of connections open per host
+            max_concurrency (int) - maximum number of requests in flight at once
+            session (aiohttp.ClientSession) - an existing session to share between clients. It is not closed
+            by the client.
+            retries (int) - retries for connection errors and 429/5xx responses
+            backoff_factor (float) - exponential backoff factor between retries
+            timeout (int) - total timeout of one request in seconds
+            cache (bool or ResponseCache) - cache responses in memory with per-endpoint ttls
+            rate_limiter (RateLimiter) - pace requests per host with a token bucket
+            concurrency (bool or AIMDController) - adapt the number of requests in flight per base url, within
+            max_concurrency, backing off on 429/5xx responses
+            the options of the wrapped client, e.g. token_cache for AsyncNews"""
+        super().__init__(api_token, log=log, pool_maxsize=pool_maxsize, cache=cache, rate_limiter=rate_limiter,
+                         concurrency=concurrency, **client_options)
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._async_session = session
+        self._owns_session = session is None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _get_async_session(self):
+        if self._async_session is None or self._async_session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.pool_maxsize)
+            self._async_session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self._async_session
+
+    async def close(self):
+        """Public Method: Close the aiohttp session if it is owned by the client."""
+        session, self._async_session = self._async_session, None
+        if session is not None and self._owns_session:
+            await session.close()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' with the asyncio clients")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __retry_delay(self, attempt, retry_after=None):
+        return retry_after_seconds(retry_after, self.backoff_factor * (2 ** attempt))
+
+    async def _request(self, endpoint, url, params, transform=None):
+        """Private Method: Coroutine version of the client request. Retries connection errors and 429/5xx
+        responses with exponential backoff, honouring Retry-After, before mapping the final status code to the
+        benzinga_errors exceptions.
+
+        Arguments:
+            endpoint (str) - name of the public method making the call
+            url (str) - endpoint url built by the client
+            params (dict) - query parameters
+            transform (callable) - optional post-processing applied to the decoded response
+
+        Returns:
+            the decoded JSON response"""
+        params = {key: value for key, value in params.items() if value is not None}
+        key, hit, result = self._cache_get(endpoint, url, params)
+        if hit:
+            return result if transform is None else transform(result)
+        session = self._get_async_session()
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        host = urlsplit(url).netloc
+        started, attempt, status = time.perf_counter(), 0, None
+        context = self._trace_start(endpoint, url, params) if self.hooks else None
+        try:
+            async with self._semaphore, self._concurrency_slot(url) as slot:
+                for attempt in range(self.retries + 1):
+                    if self.rate_limiter is not None:
+                        await asyncio.sleep(self.rate_limiter.reserve(host))
+                    try:
+                        async with session.get(url, headers=self.headers, params=params, timeout=timeout) as response:
+                            headers_received, status = time.perf_counter(), response.status
+                            if response.status in STATUS_FORCELIST and attempt < self.retries:
+                                delay = self.__retry_delay(attempt, response.headers.get("Retry-After"))
+                                slot.overloaded()
+                                if response.status == 429 and self.rate_limiter is not None:
+                                    self.rate_limiter.pause(host, delay)
+                                    delay = 0
+                            else:
+                                statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
+                                    endpoint=response.url, status_code=response.status
+                                )
+                                if self.log:
+                                    get_logger().info(statement)
+                                self._check_status(response.status)
+                                body = await response.read()
+                                received = time.perf_counter()
+                                result = self._decode_json(body)
+                                break
+                    except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                        if attempt >= self.retries:
+                            raise
+                        delay = self.__retry_delay(attempt)
+                    await asyncio.sleep(delay)
+        except Exception as err:
+            if self.metrics is not None:
+                self.metrics.observe_error(endpoint, url, err, attempt)
+            if context is not None:
+                self._trace_end(context, status, None, None, attempt, err)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe(
+                endpoint, url, status, received - started, headers_received - started, len(body),
+                time.perf_counter() - received, attempt
+            )
+        if context is not None:
+            self._trace_end(context, status, headers_received - started, len(body), attempt)
+        if key is not None:
+            self.cache.set(key, result)
+        return result if transform is None else transform(result)
+
+    async def _stream_records(self, endpoint, url, params, key, record_filter=None, convert=None):
+        """Private Method: Async generator version of the streamed request. Connection errors and 429/5xx
+        responses are retried until the headers of a good response arrive, then the body is parsed while it is
+        read. The read timeout applies to each chunk rather than to the whole body."""
+        from .streaming import STREAM_CHUNK_SIZE, RecordParser
+        params = {name: value for name, value in params.items() if value is not None}
+        session = self._get_async_session()
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        host = urlsplit(url).netloc
+        started, attempt, size, status = time.perf_counter(), 0, 0, None
+        context = self._trace_start(endpoint, url, params) if self.hooks else None
+        try:
+            async with self._semaphore:
+                async with self._concurrency_slot(url) as slot:
+                    for attempt in range(self.retries + 1):
+                        if self.rate_limiter is not None:
+                            await asyncio.sleep(self.rate_limiter.reserve(host))
+                        try:
+                            response = await session.get(url, headers=self.headers, params=params, timeout=timeout)
+                        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                            if attempt >= self.retries:
+                                raise
+                            delay = self.__retry_delay(attempt)
+                        else:
+                            if response.status not in STATUS_FORCELIST or attempt >= self.retries:
+                                break
+                            response.release()
+                            delay = self.__retry_delay(attempt, response.headers.get("Retry-After"))
+                            slot.overloaded()
+                            if response.status == 429 and self.rate_limiter is not None:
+                                self.rate_limiter.pause(host, delay)
+                                delay = 0
+                        await asyncio.sleep(delay)
+                headers_received, status = time.perf_counter(), response.status
+                try:
+                    if self.log:
+                        get_logger().info("Status Code: {status_code} Endpoint: {endpoint}".format(
+                            endpoint=response.url, status_code=response.status
+                        ))
+                    self._check_status(response.status)
+                    parser = RecordParser(key)
+                    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        size += len(chunk)
+                        for record in parser.feed(chunk):
+                            if record_filter is None or record_filter(record):
+                                yield record if convert is None else convert(record)
+                    parser.close()
+                finally:
+                    response.release()
+        except Exception as err:
+            if self.metrics is not None:
+                self.metrics.observe_error(endpoint, url, err, attempt)
+            if context is not None:
+                self._trace_end(context, status, None, size, attempt, err)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe(
+                endpoint, url, status, time.perf_counter() - started, headers_received - started, size, None,
+                attempt
+            )
+        if context is not None:
+            self._trace_end(context, status, headers_received - started, size, attempt)
+
+    async def _request_batch(self, endpoint, url, params_list, merge, transform=None):
+        """Private Method: Coroutine version of the batch request. The requests are gathered concurrently,
+        bounded by max_concurrency, and merged in the order of params_list."""
+        results = await asyncio.gather(*(self._request(endpoint, url, params) for params in params_list))
+        result = results[0] if len(results) == 1 else merge(results)
+        return result if transform is None else transform(result)
+
+    async def _paginate(self, fetch, key, params, record_filter=None, convert=None):
+        """Private Method: Async generator version of the paginated iterator. The next page is fetched in a
+        background task while the records of the current one are consumed."""
+        params = dict(params)
+        page = params.pop("page", None) or 0
+        pagesize = params.get("pagesize")
+        task = asyncio.ensure_future(fetch(page=page, **params))
+        try:
+            while True:
+                records = page_records(await task, key)
+                if not records:
+                    return
+                last_page = pagesize is not None and len(records) < pagesize
+                if not last_page:
+                    page += 1
+                    task = asyncio.ensure_future(fetch(page=page, **params))
+                for record in records:
+                    if record_filter is None or record_filter(record):
+                        yield record if convert is None else convert(record)
+                if last_page:
+                    return
+        finally:
+            task.cancel()
+
+
+class AsyncBenzinga(AsyncClientMixin, Benzinga):
+    """Asyncio version of financial_data.Benzinga. Every public data method is a coroutine."""
+
+    async def __fetch_shard(self, calendar, shard, pagesize, kwargs):
+        fetch, key = getattr(self, calendar), CALENDAR_KEYS[calendar]
+        params = dict(kwargs, pagesize=pagesize, date_from=shard[0].isoformat(), date_to=shard[1].isoformat())
+        records = page_records(await fetch(page=0, **params), key)
+        if len(records) < pagesize:
+            return records
+        if shard[0] < shard[1]:
+            halves = await asyncio.gather(
+                *(self.__fetch_shard(calendar, half, pagesize, kwargs) for half in split_shard(shard))
+            )
+            return halves[0] + halves[1]
+        return records + [record async for record in self._paginate(fetch, key, dict(params, page=1))]
+
+    async def backfill(self, calendar, date_from, date_to, shard="week", pagesize=1000, **kwargs):
+        """Public Method: Coroutine version of Benzinga.backfill. Shards are gathered concurrently, dense shards
+        are split in half, and the deduplicated records are returned as one list sorted by date."""
+        if calendar not in CALENDAR_KEYS:
+            raise IncorrectParameterEntry(
+                "calendar must be one of %s. You entered %s" % (", ".join(CALENDAR_KEYS), calendar)
+            )
+        importance = kwargs.pop("importance", None)
+        record_filter = None if importance is None else (lambda record: record.get("importance") == importance)
+        output = kwargs.pop("output", None)
+        convert = None if output is None else records_converter(calendar, output)
+        shards = date_shards(date_from, date_to, shard)
+        shard_records = await asyncio.gather(
+            *(self.__fetch_shard(calendar, date_shard, pagesize, kwargs) for date_shard in shards)
+        )
+        seen = set()
+        records = [record for records in shard_records for record in merge_records(records, seen, record_filter)]
+        return records if convert is None else convert(records)
+
+
+class AsyncNews(AsyncClientMixin, News):
+    """Asyncio version of news_data.News. Every public data method is a coroutine."""
+
+    async def validate(self):
+        """Public Method: Coroutine version of News.validate."""
+        result = super().validate()
+        return (await result) if asyncio.iscoroutine(result) else result
+
+    async def stream(self, company_tickers=None, channel=None, display_output=None, updated_since=None,
+                     pagesize=100, min_interval=1.0, max_interval=30.0, seen_size=10000, on_lag=None):
+        """Public Method: Async generator version of News.stream."""
+        cursor = NewsCursor(updated_since, pagesize, min_interval, max_interval, seen_size=seen_size, on_lag=on_lag)
+        while True:
+            stories = await self.news(display_output=display_output, company_tickers=company_tickers,
+                                      channel=channel, **cursor.params())
+            new_stories, delay = cursor.advance(stories)
+            for story in new_stories:
+                yield story
+            if delay:
+                await asyncio.sleep(delay)
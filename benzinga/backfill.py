@@ -0,0 +1,60 @@
+import calendar
+import datetime as dt
+from .benzinga_errors import IncorrectParameterEntry
+
+SHARD_SIZES = ("day", "week", "month")
+
+
+def to_date(value):
+    """Parse a "YYYY-MM-DD" string, or pass through a date."""
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    return dt.date.fromisoformat(value)
+
+
+def date_shards(date_from, date_to, shard="week"):
+    """Split the inclusive range date_from..date_to into consecutive (start, end) date shards of one day, one
+    week (Monday to Sunday) or one calendar month. The first and last shards are clipped to the range."""
+    if shard not in SHARD_SIZES:
+        raise IncorrectParameterEntry("shard must be one of %s. You entered %s" % (", ".join(SHARD_SIZES), shard))
+    start, end = to_date(date_from), to_date(date_to)
+    if start > end:
+        raise IncorrectParameterEntry("date_from %s is after date_to %s" % (start, end))
+    shards = []
+    while start <= end:
+        if shard == "day":
+            shard_end = start
+        elif shard == "week":
+            shard_end = start + dt.timedelta(days=6 - start.weekday())
+        else:
+            shard_end = start.replace(day=calendar.monthrange(start.year, start.month)[1])
+        shard_end = min(shard_end, end)
+        shards.append((start, shard_end))
+        start = shard_end + dt.timedelta(days=1)
+    return shards
+
+
+def split_shard(shard):
+    """Split a shard of more than one day into two halves."""
+    start, end = shard
+    middle = start + dt.timedelta(days=(end - start).days // 2)
+    return [(start, middle), (middle + dt.timedelta(days=1), end)]
+
+
+def record_sort_key(record):
+    return record.get("date") or "", record.get("time") or ""
+
+
+def merge_records(records, seen, record_filter=None):
+    """Yield the records of one shard sorted by date, skipping records whose id is already in seen and records
+    rejected by record_filter."""
+    for record in sorted(records, key=record_sort_key):
+        record_id = record.get("id")
+        if record_id is not None:
+            if record_id in seen:
+                continue
+            seen.add(record_id)
+        if record_filter is None or record_filter(record):
+            yield record
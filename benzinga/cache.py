@@ -0,0 +1,308 @@
+import datetime as dt
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+# Seconds a cached response stays fresh, per public method. Endpoints that are not listed use the cache's
+# default_ttl, which is 0 (not cached) unless set.
+MINUTE, HOUR, DAY = 60, 3600, 86400
+FUNDAMENTALS_TTL = 6 * HOUR
+DEFAULT_TTLS = {
+    "quote": 5,
+    "delayed_quote": 15,
+    "movers": MINUTE,
+    "auto_complete": DAY,
+    "security": DAY,
+    "logos": 7 * DAY,
+    "ticker_detail": HOUR,
+    "instruments": 15 * MINUTE,
+    "fundamentals": FUNDAMENTALS_TTL,
+    "financials": FUNDAMENTALS_TTL,
+    "valuation_ratios": FUNDAMENTALS_TTL,
+    "earning_ratios": FUNDAMENTALS_TTL,
+    "operation_ratios": FUNDAMENTALS_TTL,
+    "share_class": FUNDAMENTALS_TTL,
+    "earning_reports": FUNDAMENTALS_TTL,
+    "alpha_beta": FUNDAMENTALS_TTL,
+    "company_profile": FUNDAMENTALS_TTL,
+    "company": FUNDAMENTALS_TTL,
+    "share_class_profile": FUNDAMENTALS_TTL,
+    "asset_classification": FUNDAMENTALS_TTL,
+    "summary": FUNDAMENTALS_TTL,
+    "price_history": HOUR,
+    "bars": MINUTE,
+    "chart": MINUTE,
+}
+
+# Parameters that do not change the response and are left out of cache keys.
+IGNORED_PARAMS = ("token", "apikey")
+
+# Historical endpoints whose response can no longer change once the requested window has closed.
+HISTORICAL_ENDPOINTS = ("price_history", "bars", "chart")
+
+# DiskCache keeps the access times of hits in memory and writes them in one batch once this many are pending or
+# the oldest is this many seconds old.
+ACCESS_BATCH = 100
+ACCESS_INTERVAL = 5.0
+
+# Least recently used entries read per step of a DiskCache eviction.
+EVICT_BATCH = 64
+
+# Schema of the DiskCache database. The triggers keep the total size of the stored responses in cache_meta, in
+# the transaction of every insert, update and delete, so it never has to be summed over the table.
+DISK_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, "
+    "expires REAL, accessed REAL NOT NULL, size INTEGER NOT NULL, value BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)",
+    "CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO cache_meta (name, value) SELECT 'bytes', COALESCE(SUM(size), 0) FROM responses",
+    "CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN "
+    "UPDATE cache_meta SET value = value + new.size WHERE name = 'bytes'; END",
+    "CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN "
+    "UPDATE cache_meta SET value = value - old.size WHERE name = 'bytes'; END",
+    "CREATE TRIGGER IF NOT EXISTS responses_resize AFTER UPDATE OF size ON responses BEGIN "
+    "UPDATE cache_meta SET value = value - old.size + new.size WHERE name = 'bytes'; END",
+)
+
+
+def cache_key(endpoint, url, params):
+    """Build the cache key of a request from the endpoint name, the url and its parameters. Parameters that are
+    None or carry the api token are dropped and the rest are sorted, so equivalent calls share one entry."""
+    normalized = tuple(sorted(
+        (name, ",".join(map(str, value)) if isinstance(value, (list, tuple)) else str(value))
+        for name, value in params.items()
+        if value is not None and name not in IGNORED_PARAMS
+    ))
+    return endpoint, url, normalized
+
+
+def closed_window(key):
+    """Return True when the key is a historical request (price_history, bars, chart) for a date range that ended
+    before today, so its response can be cached permanently."""
+    endpoint, _, params = key
+    if endpoint not in HISTORICAL_ENDPOINTS:
+        return False
+    params = dict(params)
+    if endpoint == "price_history":
+        date_to = params.get("symbol", "").rsplit(":", 1)[-1]
+    else:
+        date_to = params.get("to")
+    try:
+        return dt.date.fromisoformat(date_to) < dt.date.today()
+    except (TypeError, ValueError):
+        return False
+
+
+class ResponseCache:
+
+    def __init__(self, maxsize=1024, ttls=None, default_ttl=0):
+        """In-memory response cache with a freshness policy per endpoint and least-recently-used eviction. It is
+        shared by all threads using a client. Cached responses are returned as-is and must not be modified.
+
+        Arguments:
+            Optional:
+            maxsize (int) - maximum number of cached responses. Default: 1024
+            ttls (dict) - seconds to cache each endpoint (public method name), merged over DEFAULT_TTLS
+            default_ttl (int) - seconds to cache endpoints without a ttl, 0 to skip them. Default: 0"""
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl(self, endpoint):
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def key_ttl(self, key):
+        """Seconds to keep the response of key: the endpoint ttl, or None (forever) for closed historical
+        windows."""
+        return None if closed_window(key) else self.ttl(key[0])
+
+    def get(self, key):
+        """Return (True, response) for a fresh entry, or (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value, ttl=None):
+        """Store a response under key for ttl seconds, or for the key's ttl. None in ttls means forever."""
+        ttl = self.key_ttl(key) if ttl is None else ttl
+        if ttl is not None and ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (None if ttl is None else time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def cacheable(self, endpoint):
+        ttl = self.ttl(endpoint)
+        return ttl is None or ttl > 0
+
+    def invalidate(self, endpoint=None):
+        """Public Method: Drop the cached responses of one endpoint, or of every endpoint when none is given."""
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == endpoint]:
+                    del self._entries[key]
+
+    def stats(self):
+        """Public Method: Hit and miss counters and the current number of entries."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache(ResponseCache):
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024, ttls=None, default_ttl=0):
+        """Persistent response cache in a SQLite database, so cached responses survive restarts. It uses the same
+        keys and per-endpoint ttls as ResponseCache, stores responses as compressed JSON, evicts the least
+        recently used entries once max_bytes is exceeded and can be shared by several processes. Responses of
+        historical endpoints for windows that have closed are kept until evicted.
+
+        Arguments:
+            Required - path (str) - SQLite database file
+            Optional:
+            max_bytes (int) - maximum size of the stored responses. Default: 512 MB
+            ttls (dict) - seconds to cache each endpoint (public method name), merged over DEFAULT_TTLS
+            default_ttl (int) - seconds to cache endpoints without a ttl, 0 to skip them. Default: 0"""
+        super().__init__(ttls=ttls, default_ttl=default_ttl)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._accessed = {}
+        self._accessed_since = None
+        conn = self.__connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            # BEGIN IMMEDIATE makes the check of cache_meta and the creation of the triggers atomic between
+            # processes opening the same database.
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in DISK_SCHEMA:
+                conn.execute(statement)
+
+    def __connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @staticmethod
+    def __digest(key):
+        return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+    def get(self, key):
+        digest, now = self.__digest(key), time.time()
+        with self.__connect() as conn:
+            row = conn.execute("SELECT value, expires FROM responses WHERE key = ?", (digest,)).fetchone()
+            if row is not None and (row[1] is None or row[1] > now):
+                with self._lock:
+                    self.hits += 1
+                    self._accessed[digest] = now
+                    if self._accessed_since is None:
+                        self._accessed_since = now
+                    flush = len(self._accessed) >= ACCESS_BATCH or now - self._accessed_since >= ACCESS_INTERVAL
+                if flush:
+                    self.__flush_accessed(conn)
+                return True, json.loads(zlib.decompress(row[0]))
+            if row is not None:
+                conn.execute("DELETE FROM responses WHERE key = ?", (digest,))
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def __flush_accessed(self, conn):
+        """Private Method: Write the access times of the hits since the last flush in one statement."""
+        with self._lock:
+            accessed, self._accessed, self._accessed_since = self._accessed, {}, None
+        if accessed:
+            conn.executemany(
+                "UPDATE responses SET accessed = MAX(accessed, ?) WHERE key = ?",
+                [(when, digest) for digest, when in accessed.items()],
+            )
+
+    def set(self, key, value, ttl=None):
+        ttl = self.key_ttl(key) if ttl is None else ttl
+        if ttl is not None and ttl <= 0:
+            return
+        blob, now = zlib.compress(json.dumps(value).encode()), time.time()
+        with self.__connect() as conn:
+            # An upsert rather than INSERT OR REPLACE: the rows REPLACE deletes do not fire the delete trigger.
+            conn.execute(
+                "INSERT INTO responses (key, endpoint, expires, accessed, size, value) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET endpoint = excluded.endpoint, expires = excluded.expires, "
+                "accessed = excluded.accessed, size = excluded.size, value = excluded.value",
+                (self.__digest(key), key[0], None if ttl is None else now + ttl, now, len(blob), blob),
+            )
+            if self.__total(conn) > self.max_bytes:
+                self.__flush_accessed(conn)
+                conn.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (now,))
+                total = self.__total(conn)
+                while total > self.max_bytes:
+                    oldest = conn.execute(
+                        "SELECT key, size FROM responses ORDER BY accessed LIMIT ?", (EVICT_BATCH,)
+                    ).fetchall()
+                    if not oldest:
+                        break
+                    for digest, size in oldest:
+                        if total <= self.max_bytes:
+                            break
+                        conn.execute("DELETE FROM responses WHERE key = ?", (digest,))
+                        total -= size
+
+    @staticmethod
+    def __total(conn):
+        return conn.execute("SELECT value FROM cache_meta WHERE name = 'bytes'").fetchone()[0]
+
+    def invalidate(self, endpoint=None):
+        """Public Method: Drop the cached responses of one endpoint, or of every endpoint when none is given."""
+        with self.__connect() as conn:
+            if endpoint is None:
+                conn.execute("DELETE FROM responses")
+            else:
+                conn.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+
+    def stats(self):
+        """Public Method: Hit and miss counters of this process, and the number and size of stored responses."""
+        with self.__connect() as conn:
+            size = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            total = self.__total(conn)
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": size,
+            "bytes": total,
+        }
+
+    def __len__(self):
+        with self.__connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
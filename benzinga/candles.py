@@ -0,0 +1,66 @@
+import datetime as dt
+
+# Price columns of a candle, returned as float64 arrays next to the int64 "time" array.
+OHLCV = ("open", "high", "low", "close", "volume")
+
+
+def candle_series(response, symbols=()):
+    """Return [(symbol, candles)] for a decoded bars, chart or price_history response. The endpoints answer with
+    a list of {"symbol", "candles"} objects, a single such object, a {symbol: candles} dict or a bare list of
+    candles; symbols fills in the ticker when the response does not carry it."""
+    fallback = symbols[0] if len(symbols) == 1 else None
+    if not response:
+        return []
+    if isinstance(response, dict):
+        if "candles" in response:
+            return [(response.get("symbol", fallback), response["candles"] or [])]
+        series = []
+        for symbol, value in response.items():
+            if isinstance(value, dict):
+                value = value.get("candles")
+            if isinstance(value, list):
+                series.append((symbol, value))
+        return series
+    if all(isinstance(item, dict) and "candles" in item for item in response):
+        return [(item.get("symbol", fallback), item["candles"] or []) for item in response]
+    return [(fallback, response)]
+
+
+def iso_millis(value):
+    """Milliseconds since the epoch of an ISO 8601 date time. A value without an offset is taken as UTC, so the
+    result does not depend on the timezone of the machine."""
+    moment = dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=dt.timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def epoch_millis(candles):
+    """Timestamps of the candles in milliseconds since the epoch, from their "time" field or, when it is missing,
+    their ISO 8601 "dateTime"."""
+    times = [candle.get("time") for candle in candles]
+    if None not in times:
+        return times
+    return [iso_millis(candle["dateTime"]) if candle.get("time") is None else candle["time"] for candle in candles]
+
+
+def ohlcv_arrays(candles):
+    """Convert a list of decoded candles into contiguous NumPy arrays: "time" (int64 epoch milliseconds) and
+    "open", "high", "low", "close", "volume" (float64, NaN where a value is missing)."""
+    import numpy as np
+    arrays = {"time": np.array(epoch_millis(candles), dtype=np.int64)}
+    for name in OHLCV:
+        arrays[name] = np.array([candle.get(name) for candle in candles], dtype=np.float64)
+    return arrays
+
+
+def candle_arrays(response, symbols=()):
+    """Convert a decoded bars, chart or price_history response into {symbol: ohlcv_arrays}.
+
+    Arguments:
+        response (list or dict) - decoded JSON response
+        symbols (tuple) - requested tickers, naming the series of single symbol responses
+
+    Returns:
+        dict of symbol to {"time", "open", "high", "low", "close", "volume"} arrays"""
+    return {symbol: ohlcv_arrays(candles) for symbol, candles in candle_series(response, symbols)}
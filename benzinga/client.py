@@ -0,0 +1,501 @@
+import threading
+import time
+from urllib.parse import urlsplit
+from .benzinga_errors import (
+    TokenAuthenticationError,
+    RateLimitError,
+    ServiceUnavailableError,
+    PreconditionFailedError,
+    NotFoundError,
+    BadRequestError,
+    GatewayTimeoutError,
+    URLIncorrectlyFormattedError)
+
+from .config import (requests_retry_session, RETRIES, BACKOFF_FACTOR, STATUS_FORCELIST, SYMBOL_CHUNK_SIZE,
+                     SYMBOL_CHUNK_LENGTH)
+from .concurrency import AIMDController, NULL_SLOT, OVERLOAD_STATUSES
+from .decoders import check_decoder, json_decoder
+
+
+_log = None
+
+
+def get_logger():
+    """Return the structlog logger of the package. structlog is imported on the first call, so importing the
+    package stays cheap."""
+    global _log
+    if _log is None:
+        import structlog
+        _log = structlog.get_logger()
+    return _log
+
+
+def chunk_symbols(symbols, chunk_size=SYMBOL_CHUNK_SIZE, chunk_length=SYMBOL_CHUNK_LENGTH):
+    """Split a list of tickers, or a comma separated string of tickers, into comma separated strings that each
+    hold at most chunk_size tickers and chunk_length characters. The ticker order is kept."""
+    if isinstance(symbols, str):
+        symbols = symbols.split(",")
+    chunks, current, length = [], [], 0
+    for symbol in symbols:
+        symbol = symbol.strip()
+        if not symbol:
+            continue
+        if current and (len(current) >= chunk_size or length + len(symbol) + 1 > chunk_length):
+            chunks.append(",".join(current))
+            current, length = [], 0
+        current.append(symbol)
+        length += len(symbol) + 1
+    if current:
+        chunks.append(",".join(current))
+    return chunks
+
+
+def merge_responses(responses):
+    """Merge the decoded responses of a chunked call into one response, in chunk order. Lists are concatenated
+    and dicts are merged key by key, concatenating the lists they hold."""
+    merged = None
+    for response in responses:
+        if merged is None:
+            merged = response
+        elif isinstance(merged, list) and isinstance(response, list):
+            merged = merged + response
+        elif isinstance(merged, dict) and isinstance(response, dict):
+            merged = dict(merged)
+            for key, value in response.items():
+                if isinstance(merged.get(key), list) and isinstance(value, list):
+                    merged[key] = merged[key] + value
+                elif isinstance(merged.get(key), dict) and isinstance(value, dict):
+                    merged[key] = dict(merged[key], **value)
+                elif key not in merged or not merged[key]:
+                    merged[key] = value
+        elif not merged:
+            merged = response
+    return merged
+
+
+def page_records(response, key):
+    """Return the list of records held by one decoded page of a paginated endpoint. Empty pages come back from
+    the API as an empty list or dict."""
+    if not response:
+        return []
+    if isinstance(response, list):
+        return response
+    if key in response:
+        return response[key] or []
+    for value in response.values():
+        if isinstance(value, list):
+            return value
+    return []
+
+
+class BaseClient:
+
+    # Endpoint registry of the client (endpoints.FINANCIAL_ENDPOINTS or endpoints.NEWS_ENDPOINTS).
+    endpoints = {}
+
+    def __init__(self, api_token, log=True, pool_connections=10, pool_maxsize=10, pool_block=False, max_workers=8,
+                 cache=None, rate_limiter=None, concurrency=None, validate=True, decoder="auto", metrics=None,
+                 hooks=None):
+        """Shared transport for the Benzinga and News clients. Every call made by a client goes through one
+        long-lived requests session, so connections are kept alive and reused instead of paying a new TCP and
+        TLS handshake on each request. The session is created on first use and can be shared between threads.
+
+        Arguments:
+            Required - api_token (str)
+            Optional:
+            log (bool) - log the status code and endpoint of every call
+            pool_connections (int) - number of per-host connection pools to keep
+            pool_maxsize (int) - maximum number of connections kept alive per host, raised to fan_out_workers
+            when the worker pools are larger
+            pool_block (bool) - block instead of opening extra connections once a host pool is full
+            max_workers (int) - maximum number of requests sent in parallel by chunked, multi-ticker calls
+            cache (bool or ResponseCache) - cache responses in memory with per-endpoint ttls. True uses a
+            ResponseCache with the default ttls
+            rate_limiter (RateLimiter) - pace requests per host with a token bucket. 429 responses then pause
+            the host for the Retry-After delay instead of being retried by the session
+            concurrency (bool or AIMDController) - adapt the number of parallel requests of chunked calls and
+            backfills per base url, backing off on 429/5xx responses. True uses an AIMDController with the
+            default limits, and its max_limit replaces max_workers as the size of the worker pools
+            validate (bool) - check and coerce the parameters of every call. False skips the check for trusted,
+            high-throughput callers
+            decoder (str or callable) - JSON decoder applied to the raw response bytes: "orjson", "msgspec",
+            "json" or a callable. "auto" picks orjson or msgspec when installed and falls back to json
+            metrics (bool or MetricsRegistry) - record request counts, latencies, bytes, decode times, retries,
+            errors and cache hits per endpoint and host. True uses a new MetricsRegistry
+            hooks (list) - tracing hooks (tracing.RequestHook) called before every request and after its response
+            or error, e.g. tracing.OpenTelemetryHook"""
+        self.token = api_token
+        self.headers = {'accept': 'application/json'}
+        self.log = log
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_workers = max_workers
+        if cache is True:
+            from .cache import ResponseCache
+            cache = ResponseCache()
+        self.cache = None if cache is False else cache
+        self.rate_limiter = rate_limiter
+        self.concurrency = AIMDController() if concurrency is True else (None if concurrency is False else concurrency)
+        self.validate_params = validate
+        self.decoder = check_decoder(decoder)
+        if metrics is True:
+            from .metrics import MetricsRegistry
+            metrics = MetricsRegistry()
+        self.metrics = None if metrics is False else metrics
+        self.hooks = tuple(hooks or ())
+        self._decode = None
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled requests session, created on first access."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    status_forcelist = STATUS_FORCELIST
+                    if self.rate_limiter is not None:
+                        status_forcelist = tuple(code for code in STATUS_FORCELIST if code != 429)
+                    self._session = requests_retry_session(
+                        status_forcelist=status_forcelist,
+                        retry_rate_limited=self.rate_limiter is None,
+                        pool_connections=self.pool_connections,
+                        # Every fan-out worker keeps its connection alive, instead of the connections beyond
+                        # pool_maxsize being opened for one request and discarded.
+                        pool_maxsize=max(self.pool_maxsize, self.fan_out_workers),
+                        pool_block=self.pool_block,
+                    )
+        return self._session
+
+    def close(self):
+        """Public Method: Close the pooled session and release its connections. The client can still be used
+        afterwards, a new session is opened on the next call."""
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    def add_hook(self, hook):
+        """Public Method: Register a tracing hook, an object with before_request(context), after_response(context)
+        and on_error(context, error) methods such as a tracing.RequestHook subclass."""
+        self.hooks = self.hooks + (hook,)
+
+    def _trace_start(self, endpoint, url, params):
+        """Private Method: Create the tracing.RequestContext of a request and run the before_request hooks. Only
+        called when hooks are registered."""
+        from .tracing import RequestContext
+        context = RequestContext(endpoint, url, params)
+        for hook in self.hooks:
+            hook.before_request(context)
+        return context
+
+    def _trace_end(self, context, status, ttfb, size, retries, error=None):
+        """Private Method: Complete the context of a request and run the after_response hooks, or the on_error
+        hooks when error is set."""
+        context.duration = time.perf_counter() - context.started
+        context.status, context.ttfb, context.bytes, context.retries = status, ttfb, size, retries
+        for hook in self.hooks:
+            if error is None:
+                hook.after_response(context)
+            else:
+                hook.on_error(context, error)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _check_status(self, status_code):
+        if status_code == 400:
+            raise BadRequestError
+        if status_code == 401:
+            raise TokenAuthenticationError
+        elif status_code == 403:
+            raise TokenAuthenticationError
+        elif status_code == 404:
+            raise NotFoundError
+        elif status_code == 412:
+            raise PreconditionFailedError
+        elif status_code == 429:
+            raise RateLimitError
+        elif status_code == 500:
+            raise ServiceUnavailableError
+        elif status_code == 502:
+            raise ServiceUnavailableError
+        elif status_code == 503:
+            raise ServiceUnavailableError
+        elif status_code == 504:
+            raise GatewayTimeoutError
+
+    @property
+    def fan_out_workers(self):
+        """Size of the worker pools used by chunked calls and backfills."""
+        return self.max_workers if self.concurrency is None else self.concurrency.max_limit
+
+    def _base_url(self, url):
+        """Private Method: The base url (a url_dict entry) that url belongs to, falling back to its host."""
+        bases = [base for base in getattr(self, "url_dict", {}).values() if url.startswith(base)]
+        return max(bases, key=len) if bases else urlsplit(url).netloc
+
+    def _concurrency_slot(self, url):
+        """Private Method: Context manager holding a unit of the adaptive concurrency of url's base url while a
+        request is in flight. A no-op without a concurrency controller."""
+        return NULL_SLOT if self.concurrency is None else self.concurrency.slot(self._base_url(url))
+
+    def _decode_json(self, content):
+        """Private Method: Decode a JSON response body from bytes with the configured decoder, resolved on first
+        use."""
+        if self._decode is None:
+            self._decode = json_decoder(self.decoder)
+        return self._decode(content)
+
+    def _cache_get(self, endpoint, url, params):
+        """Private Method: Look a request up in the response cache. Returns the cache key (None when the
+        endpoint is not cached), whether it was a hit, and the cached response."""
+        if self.cache is None or not self.cache.cacheable(endpoint):
+            return None, False, None
+        from .cache import cache_key
+        key = cache_key(endpoint, url, params)
+        hit, result = self.cache.get(key)
+        if self.metrics is not None:
+            self.metrics.observe_cache(endpoint, hit)
+        return key, hit, result
+
+    def __send(self, url, params, slot, stream=False):
+        """Private Method: GET url over the pooled session. With a rate limiter every attempt is paced by the
+        host's token bucket, and a 429 pauses the host for the Retry-After delay before the request is retried.
+        Overload responses retried on the way are reported to the concurrency slot. With stream the body is left
+        unread for the caller. Returns the response and the number of retried attempts."""
+        attempts = 0
+        if self.rate_limiter is None:
+            response = self.session.get(url, headers=self.headers, params=params, timeout=10, stream=stream)
+        else:
+            host = urlsplit(url).netloc
+            for attempt in range(RETRIES + 1):
+                time.sleep(self.rate_limiter.reserve(host))
+                response = self.session.get(url, headers=self.headers, params=params, timeout=10, stream=stream)
+                if response.status_code != 429 or attempt == RETRIES:
+                    break
+                response.close()
+                attempts += 1
+                slot.overloaded()
+                from .rate_limit import retry_after_seconds
+                delay = retry_after_seconds(response.headers.get("Retry-After"), BACKOFF_FACTOR * (2 ** attempt))
+                self.rate_limiter.pause(host, delay)
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            attempts += len(retries.history)
+            if any(entry.status in OVERLOAD_STATUSES for entry in retries.history):
+                slot.overloaded()
+        return response, attempts
+
+    def _endpoint(self, name):
+        endpoint = self.endpoints.get(name)
+        if endpoint is None:
+            raise URLIncorrectlyFormattedError
+        return endpoint
+
+    def _url(self, name):
+        """Private Method: url of a registered endpoint."""
+        return self._endpoint(name).url(self.url_dict)
+
+    def _call(self, name, params, transform=None, output=None):
+        """Private Method: Request a registered endpoint. The parameters are validated against the endpoint's
+        schema unless validation is turned off, and endpoints taking a list of symbols are chunked.
+
+        Arguments:
+            name (str) - public method name, the key of the endpoint in the registry
+            params (dict) - query parameters
+            transform (callable) - optional post-processing applied to the decoded response
+            output (str) - convert the records of the response, e.g. "records" for typed record models
+
+        Returns:
+            the decoded JSON response, or its records in the requested output"""
+        endpoint = self._endpoint(name)
+        if self.validate_params and endpoint.validator is not None:
+            endpoint.validator(params)
+        url = endpoint.url(self.url_dict)
+        if output is not None:
+            from .output import response_converter
+            convert, post_process = response_converter(name, endpoint.key, output), transform
+            transform = convert if post_process is None else (lambda result: convert(post_process(result)))
+        if endpoint.symbols is not None:
+            return self._request_symbols(name, url, params, transform, endpoint.symbols)
+        return self._request(name, url, params, transform)
+
+    def _request(self, endpoint, url, params, transform=None):
+        """Private Method: Send a GET request for the endpoint url over the pooled session, log it and map error
+        status codes to the benzinga_errors exceptions. Responses of cached endpoints are served from the cache
+        while fresh.
+
+        Arguments:
+            endpoint (str) - name of the public method making the call
+            url (str) - endpoint url built by the client
+            params (dict) - query parameters
+            transform (callable) - optional post-processing applied to the decoded response
+
+        Returns:
+            the decoded JSON response"""
+        from requests.exceptions import RequestException
+        key, hit, result = self._cache_get(endpoint, url, params)
+        if hit:
+            return result if transform is None else transform(result)
+        started, retries, status = time.perf_counter(), 0, None
+        context = self._trace_start(endpoint, url, params) if self.hooks else None
+        try:
+            with self._concurrency_slot(url) as slot:
+                try:
+                    response, retries = self.__send(url, params, slot)
+                    status = response.status_code
+                    statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
+                        endpoint=response.url, status_code=response.status_code
+                    )
+                    if self.log:
+                        get_logger().info(statement)
+                    self._check_status(response.status_code)
+                except RequestException as err:
+                    if err.response is None:
+                        raise
+                    status = err.response.status_code
+                    self._check_status(status)
+                    raise
+            received = time.perf_counter()
+            result = self._decode_json(response.content)
+        except Exception as err:
+            if self.metrics is not None:
+                self.metrics.observe_error(endpoint, url, err, retries)
+            if context is not None:
+                self._trace_end(context, status, None, None, retries, err)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe(
+                endpoint, url, status, received - started, response.elapsed.total_seconds(), len(response.content),
+                time.perf_counter() - received, retries
+            )
+        if context is not None:
+            self._trace_end(context, status, response.elapsed.total_seconds(), len(response.content), retries)
+        if key is not None:
+            self.cache.set(key, result)
+        return result if transform is None else transform(result)
+
+    def _stream(self, name, params, record_filter=None, convert=None):
+        """Private Method: Request a registered endpoint and return a generator of its records, parsed one by one
+        while the response body arrives instead of decoding the whole body at once. The parameters are validated
+        right away and the request is sent on the first iteration. Streamed responses are not cached.
+
+        Arguments:
+            name (str) - public method name, the key of the endpoint in the registry
+            params (dict) - query parameters
+            record_filter (callable) - optional predicate applied to every record
+            convert (callable) - optional conversion applied to every record kept
+
+        Returns:
+            a generator of records"""
+        endpoint = self._endpoint(name)
+        if self.validate_params and endpoint.validator is not None:
+            endpoint.validator(params)
+        return self._stream_records(name, endpoint.url(self.url_dict), params, endpoint.key, record_filter, convert)
+
+    def _stream_records(self, endpoint, url, params, key, record_filter=None, convert=None):
+        """Private Method: Generator behind _stream. The concurrency slot is held until the response headers
+        arrive; the body is then read in STREAM_CHUNK_SIZE chunks and fed to a streaming.RecordParser."""
+        from requests.exceptions import RequestException
+        from .streaming import STREAM_CHUNK_SIZE, RecordParser
+        started, retries, size, status = time.perf_counter(), 0, 0, None
+        context = self._trace_start(endpoint, url, params) if self.hooks else None
+        try:
+            with self._concurrency_slot(url) as slot:
+                try:
+                    response, retries = self.__send(url, params, slot, stream=True)
+                    status = response.status_code
+                except RequestException as err:
+                    if err.response is None:
+                        raise
+                    status = err.response.status_code
+                    self._check_status(status)
+                    raise
+            with response:
+                if self.log:
+                    get_logger().info("Status Code: {status_code} Endpoint: {endpoint}".format(
+                        endpoint=response.url, status_code=response.status_code
+                    ))
+                self._check_status(response.status_code)
+                parser = RecordParser(key)
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    size += len(chunk)
+                    for record in parser.feed(chunk):
+                        if record_filter is None or record_filter(record):
+                            yield record if convert is None else convert(record)
+                parser.close()
+        except Exception as err:
+            if self.metrics is not None:
+                self.metrics.observe_error(endpoint, url, err, retries)
+            if context is not None:
+                self._trace_end(context, status, None, size, retries, err)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe(
+                endpoint, url, status, time.perf_counter() - started, response.elapsed.total_seconds(), size, None,
+                retries
+            )
+        if context is not None:
+            self._trace_end(context, status, response.elapsed.total_seconds(), size, retries)
+
+    def _request_batch(self, endpoint, url, params_list, merge, transform=None):
+        """Private Method: Send one request per params dict concurrently over the pooled session and merge the
+        decoded responses in the order of params_list. With a concurrency controller the requests in flight
+        follow its adaptive limit for the base url."""
+        if len(params_list) == 1:
+            result = self._request(endpoint, url, params_list[0])
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(self.fan_out_workers, len(params_list))) as executor:
+                results = executor.map(lambda params: self._request(endpoint, url, params), params_list)
+                result = merge(list(results))
+        return result if transform is None else transform(result)
+
+    def _request_symbols(self, endpoint, url, params, transform=None, symbols_key="symbols"):
+        """Private Method: Request an endpoint that takes a comma separated symbols parameter. A list of tickers,
+        or a string too long for one url, is split into url-safe chunks that are fetched concurrently and merged
+        back into one response in the original order."""
+        symbols = params.get(symbols_key)
+        if symbols is None or (isinstance(symbols, str) and len(symbols) <= SYMBOL_CHUNK_LENGTH):
+            return self._request(endpoint, url, params, transform)
+        params_list = [dict(params, **{symbols_key: chunk}) for chunk in chunk_symbols(symbols) or [""]]
+        return self._request_batch(endpoint, url, params_list, merge_responses, transform)
+
+    def _paginate(self, fetch, key, params, record_filter=None, convert=None):
+        """Private Method: Generator over the records of a page/pagesize endpoint. Records are yielded page by
+        page while the next page is fetched in a background thread, so only two pages are held in memory at
+        once. Iteration stops on the first empty page, or on the first short page when pagesize is set.
+
+        Arguments:
+            fetch (callable) - public method returning one page, called with page= and params
+            key (str) - response key holding the records
+            params (dict) - arguments for fetch, page is the first page to read (default 0)
+            record_filter (callable) - optional predicate applied to every record
+            convert (callable) - optional conversion applied to every record kept"""
+        params = dict(params)
+        page = params.pop("page", None) or 0
+        pagesize = params.get("pagesize")
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(fetch, page=page, **params)
+            while True:
+                records = page_records(future.result(), key)
+                if not records:
+                    return
+                last_page = pagesize is not None and len(records) < pagesize
+                if not last_page:
+                    page += 1
+                    future = executor.submit(fetch, page=page, **params)
+                for record in records:
+                    if record_filter is None or record_filter(record):
+                        yield record if convert is None else convert(record)
+                if last_page:
+                    return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
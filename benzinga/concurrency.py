@@ -0,0 +1,213 @@
+import threading
+import time
+from collections import deque
+from .benzinga_errors import RateLimitError, ServiceUnavailableError, GatewayTimeoutError
+
+# Errors, and the status codes behind them, that mean the API is overloaded and concurrency has to be cut.
+OVERLOAD_ERRORS = (RateLimitError, ServiceUnavailableError, GatewayTimeoutError)
+OVERLOAD_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AIMDLimit:
+
+    def __init__(self, initial, min_limit, max_limit, increase, decrease, latency_target, smoothing=0.1):
+        """Concurrency limit of one base url. Every successful request that answers within latency_target adds
+        increase / limit, so the limit grows by about increase per round of requests. An overload error
+        multiplies it by decrease, at most once per round trip so a burst of failures counts as one signal."""
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.smoothing = smoothing
+        self.settled = float(initial)
+        self.in_flight = 0
+        self.successes = 0
+        self.overloads = 0
+        self._last_cut = 0.0
+        self._condition = threading.Condition()
+        # Coroutines waiting for a unit, as (loop, future) pairs in arrival order.
+        self._waiters = deque()
+
+    def acquire_async(self, loop):
+        """Take a unit for a coroutine running on loop. Returns None when the unit is taken, or a future of loop
+        that is resolved once a released unit has been handed over to the coroutine."""
+        with self._condition:
+            if not self._waiters and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return None
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+            return future
+
+    def cancel_wait(self, future):
+        """Withdraw a cancelled coroutine from the queue, giving back the unit if it was already handed over."""
+        with self._condition:
+            for waiter in self._waiters:
+                if waiter[1] is future:
+                    self._waiters.remove(waiter)
+                    return
+        if future.done() and not future.cancelled():
+            self.give_back()
+
+    def give_back(self):
+        """Return a unit without counting the request, e.g. one handed over to a coroutine that was cancelled."""
+        with self._condition:
+            self.in_flight -= 1
+            self.__hand_over()
+            self._condition.notify_all()
+
+    def __hand_over(self):
+        """Hand the free units to the waiting coroutines, first come first served. Called with the lock held,
+        from any thread: the futures are resolved on their own loop."""
+        while self._waiters and self.in_flight < int(self.limit):
+            loop, future = self._waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(self.__resolve, future)
+            except RuntimeError:
+                # The waiter's loop is closed, nobody is left to take the unit.
+                continue
+            self.in_flight += 1
+
+    def __resolve(self, future):
+        if future.cancelled():
+            self.give_back()
+        else:
+            future.set_result(None)
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, started, error=None, overloaded=False):
+        """Return a unit of concurrency and adjust the limit from the outcome of the request. overloaded marks
+        a request that succeeded only after overload responses were retried."""
+        now = time.monotonic()
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded or isinstance(error, OVERLOAD_ERRORS):
+                self.overloads += 1
+                if started >= self._last_cut:
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease)
+                    self._last_cut = now
+            elif error is None:
+                self.successes += 1
+                if now - started <= self.latency_target:
+                    self.limit = min(float(self.max_limit), self.limit + self.increase / self.limit)
+            self.settled += self.smoothing * (self.limit - self.settled)
+            self.__hand_over()
+            self._condition.notify_all()
+
+
+class AIMDSlot:
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.started = None
+        self.overload = False
+
+    def overloaded(self):
+        """Flag an overload response that was retried within the slot."""
+        self.overload = True
+
+    def __enter__(self):
+        self.limit.acquire()
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.limit.release(self.started, exc_value, self.overload)
+
+    async def __aenter__(self):
+        import asyncio
+        future = self.limit.acquire_async(asyncio.get_running_loop())
+        if future is not None:
+            try:
+                await future
+            except asyncio.CancelledError:
+                self.limit.cancel_wait(future)
+                raise
+        self.started = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.limit.release(self.started, exc_value, self.overload)
+
+
+class NullSlot:
+    """Slot used when no controller is set: requests are only bounded by the client's worker pool."""
+
+    def overloaded(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+NULL_SLOT = NullSlot()
+
+
+class AIMDController:
+
+    def __init__(self, initial=4, min_limit=1, max_limit=64, increase=1.0, decrease=0.5, latency_target=2.0):
+        """Additive-increase/multiplicative-decrease concurrency controller for bulk fan-out. Each base url gets
+        its own limit, which grows while requests stay fast and error free, and is cut on RateLimitError,
+        ServiceUnavailableError or GatewayTimeoutError.
+
+        Arguments:
+            Optional:
+            initial (int) - starting concurrency per base url. Default: 4
+            min_limit (int) - lowest concurrency. Default: 1
+            max_limit (int) - highest concurrency. Default: 64
+            increase (float) - concurrency added per round of healthy requests. Default: 1
+            decrease (float) - factor applied to the concurrency on overload. Default: 0.5
+            latency_target (float) - seconds above which a request is not counted as healthy. Default: 2"""
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def limit(self, base_url):
+        with self._lock:
+            limit = self._limits.get(base_url)
+            if limit is None:
+                limit = AIMDLimit(self.initial, self.min_limit, self.max_limit, self.increase, self.decrease,
+                                  self.latency_target)
+                self._limits[base_url] = limit
+            return limit
+
+    def slot(self, base_url):
+        """Context manager (sync or async) that holds one unit of concurrency for base_url during a request."""
+        return AIMDSlot(self.limit(base_url))
+
+    def report(self):
+        """Public Method: Current and settled concurrency per base url. The settled value is a moving average
+        of the limit, suitable for capacity planning."""
+        with self._lock:
+            limits = dict(self._limits)
+        return {
+            base_url: {
+                "limit": int(limit.limit),
+                "settled": round(limit.settled, 2),
+                "in_flight": limit.in_flight,
+                "successes": limit.successes,
+                "overloads": limit.overloads,
+            }
+            for base_url, limit in limits.items()
+        }
@@ -1,24 +1,48 @@
-import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
-import time
-t0 = time.time()
+RETRIES = 5
+BACKOFF_FACTOR = 0.3
+STATUS_FORCELIST = (429, 500, 502, 503, 504)
+
+# Multi-ticker calls are split so that no single url carries more than this many symbols or characters.
+SYMBOL_CHUNK_SIZE = 100
+SYMBOL_CHUNK_LENGTH = 1500
 
 def requests_retry_session(
-        retries=5,
-        backoff_factor=0.3,
-        status_forcelist=(429, 500, 502, 503, 504),
+        retries=RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=STATUS_FORCELIST,
         session=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        retry_rate_limited=True,
 ):
+    # requests is imported when the first session is built, keeping it out of the package import.
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     session = session or requests.Session()
+    if not retry_rate_limited:
+        # urllib3 retries a 429 carrying Retry-After even when 429 is not in status_forcelist. Clients with a rate
+        # limiter handle every 429 themselves, so the session must hand them back on the first attempt.
+        class NoRateLimitRetry(Retry):
+            def is_retry(self, method, status_code, has_retry_after=False):
+                return status_code != 429 and super().is_retry(method, status_code, has_retry_after)
+
+        Retry = NoRateLimitRetry
     retry = Retry(
         total=retries,
         read=retries,
         connect=retries,
         backoff_factor=backoff_factor,
         status_forcelist=status_forcelist,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
     )
-    adapter = HTTPAdapter(max_retries=retry)
     session.mount('http://', adapter)
     session.mount('https://', adapter)
     return session
@@ -0,0 +1,46 @@
+from .benzinga_errors import IncorrectParameterEntry
+
+# Decoders tried in order by "auto".
+AUTO_DECODERS = ("orjson", "msgspec", "json")
+
+
+def check_decoder(decoder):
+    """Reject an unknown decoder name when the client is created, before any decoder is imported."""
+    if not callable(decoder) and decoder != "auto" and decoder not in AUTO_DECODERS:
+        raise IncorrectParameterEntry(
+            "decoder must be one of auto, %s or a callable. You entered %s" % (", ".join(AUTO_DECODERS), decoder)
+        )
+    return decoder
+
+
+def load_decoder(name):
+    """Return the bytes -> object function of a named decoder. Raises ImportError when it is not installed."""
+    check_decoder(name)
+    if name == "orjson":
+        import orjson
+        return orjson.loads
+    if name == "msgspec":
+        import msgspec
+        return msgspec.json.decode
+    import json
+    return json.loads
+
+
+def json_decoder(decoder="auto"):
+    """Resolve the decoder option of the clients into a function that decodes a JSON response body from bytes.
+
+    Arguments:
+        decoder (str or callable) - "orjson", "msgspec", "json", a callable taking bytes, or "auto" for the
+        fastest installed one, falling back to the standard library json
+
+    Returns:
+        callable decoding bytes into Python objects"""
+    if callable(decoder):
+        return decoder
+    if decoder != "auto":
+        return load_decoder(decoder)
+    for name in AUTO_DECODERS:
+        try:
+            return load_decoder(name)
+        except ImportError:
+            continue
@@ -0,0 +1,91 @@
+from .param_check import VALIDATORS
+
+
+class Endpoint:
+
+    __slots__ = ("name", "base", "path", "check", "pagination", "key", "symbols", "validator")
+
+    def __init__(self, name, base, path, check=None, pagination=None, key=None, symbols=None):
+        """One API endpoint, declared once at import and looked up by the public method of the same name.
+
+        Arguments:
+            name (str) - public method name, also used for logging, caching and concurrency
+            base (str) - url_dict entry holding the base url
+            path (str) - path appended to the base url
+            check (str) - Param_Check schema validating the query parameters
+            pagination (str) - "page" for page/pagesize endpoints, None when the endpoint is not paginated
+            key (str) - response key holding the records
+            symbols (str) - parameter carrying comma separated tickers, split into chunks on long lists"""
+        self.name = name
+        self.base = base
+        self.path = path
+        self.check = check
+        self.pagination = pagination
+        self.key = key
+        self.symbols = symbols
+        self.validator = None if check is None else VALIDATORS[check]
+
+    def url(self, url_dict):
+        return url_dict[self.base] + self.path
+
+    def __repr__(self):
+        return "Endpoint(%r, %r, %r)" % (self.name, self.base, self.path)
+
+
+def registry(*endpoints):
+    return {endpoint.name: endpoint for endpoint in endpoints}
+
+
+def calendar(name, path, key):
+    return Endpoint(name, "API v2", "calendar/%s" % path, "calendar_check", "page", key)
+
+
+def fundamentals(name, path):
+    return Endpoint(name, "V3", path, "fundamentals_check", symbols="symbols")
+
+
+# Endpoints of financial_data.Benzinga. The calendars are listed in the order of CALENDAR_KEYS.
+FINANCIAL_ENDPOINTS = registry(
+    Endpoint("price_history", "Data api v2", "batchhistory", "batchhistory_check"),
+    Endpoint("delayed_quote", "v1", "quoteDelayed", "delayed_quote_check"),
+    Endpoint("bars", "API v2", "bars", "bars_check"),
+    Endpoint("auto_complete", "Data v2", "autocomplete", "autocomplete_check"),
+    Endpoint("security", "Data api v2", "security", "security_check"),
+    Endpoint("chart", "Data api v2", "chart", "charts_check"),
+    Endpoint("quote", "Data v2", "quote", "fundamentals_check", symbols="symbols"),
+    Endpoint("instruments", "V3", "instruments", "instruments_check"),
+    calendar("dividends", "dividends", "dividends"),
+    calendar("earnings", "earnings", "earnings"),
+    calendar("splits", "splits", "splits"),
+    calendar("economics", "economics", "economics"),
+    calendar("guidance", "guidance", "guidance"),
+    calendar("ipo", "ipos", "ipos"),
+    calendar("retail", "retail", "retail"),
+    calendar("ratings", "ratings", "ratings"),
+    calendar("conference_calls", "conference-calls", "conference"),
+    fundamentals("fundamentals", "fundamentals/"),
+    fundamentals("financials", "fundamentals/financials"),
+    fundamentals("valuation_ratios", "fundamentals/valuationRatios"),
+    fundamentals("earning_ratios", "fundamentals/earningRatios"),
+    fundamentals("operation_ratios", "fundamentals/operationRatios"),
+    fundamentals("share_class", "fundamentals/shareClass"),
+    fundamentals("earning_reports", "fundamentals/earningReports"),
+    fundamentals("alpha_beta", "fundamentals/alphaBeta"),
+    fundamentals("company_profile", "fundamentals/companyProfile"),
+    fundamentals("company", "fundamentals/company"),
+    fundamentals("share_class_profile", "fundamentals/shareClassProfile"),
+    fundamentals("asset_classification", "fundamentals/assetClassification"),
+    fundamentals("summary", "ownership/summary"),
+    Endpoint("ticker_detail", "V3", "tickerDetail", "ticker_check"),
+    Endpoint("logos", "API v1.v1", "logos", "logos_check"),
+    Endpoint("movers", "IO API", "movers"),
+    Endpoint("options_activity", "v1 opt", "option_activity", "options_check", "page", "option_activity"),
+)
+
+# Endpoints of news_data.News.
+NEWS_ENDPOINTS = registry(
+    Endpoint("news", "API V2", "news/", "news_check", "page"),
+    Endpoint("top_news", "API V2", "news-top-stories/", "news_check"),
+    Endpoint("channels", "API V2", "channels/", "news_check"),
+    Endpoint("quantified_news", "API V2", "newsquantified/", "quantified_news_check", "page"),
+)
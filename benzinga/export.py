@@ -0,0 +1,215 @@
+import datetime as dt
+import json
+import os
+import tempfile
+from .backfill import to_date
+from .benzinga_errors import IncorrectParameterEntry
+from .financial_data import CALENDAR_KEYS
+from .frames import flatten
+from .records import MODELS, to_date as parse_date, to_float, to_int, to_time
+
+# File formats of CalendarExport and the extension of their files.
+EXPORT_FORMATS = {"parquet": "parquet", "arrow": "arrow"}
+
+MANIFEST = "_manifest.json"
+
+
+def calendar_schema(calendar, names):
+    """pyarrow schema of the files of a calendar export: the fields of the calendar's record model with their
+    types, then the other columns of names as strings. Every file of a calendar shares the model part of the
+    schema, so the partitions read back as one dataset whatever values a day happened to hold."""
+    import pyarrow as pa
+    types = {str: pa.string(), to_float: pa.float64(), to_int: pa.int64(), parse_date: pa.date32(),
+             to_time: pa.string()}
+    model = MODELS.get(calendar)
+    fields = model.FIELDS if model is not None else {}
+    schema = [pa.field(name, types[convert]) for name, convert in fields.items()]
+    schema += [pa.field(name, pa.string()) for name in names if name not in fields]
+    return pa.schema(schema)
+
+
+def cell(convert, value):
+    """Value of one cell of an export table: numbers and dates parsed by the model converter (None when they do
+    not parse), everything else as text, lists as JSON."""
+    if value is None or value == "":
+        return None
+    if convert in (to_float, to_int, parse_date):
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            return None
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def calendar_table(calendar, records):
+    """Build the pyarrow.Table of a batch of calendar records with the schema of calendar_schema. Model fields
+    missing from the batch are null columns."""
+    import pyarrow as pa
+    rows = [flatten(record) for record in records]
+    schema = calendar_schema(calendar, dict.fromkeys(name for row in rows for name in row))
+    model = MODELS.get(calendar)
+    fields = model.FIELDS if model is not None else {}
+    arrays = [
+        pa.array([cell(fields.get(field.name), row.get(field.name)) for row in rows], type=field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_table(table, path, format):
+    """Write a pyarrow.Table to path as Parquet or as an Arrow IPC file, through a temporary file so that a crash
+    never leaves a truncated file behind."""
+    import pyarrow as pa
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        if format == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(table, tmp_path)
+        else:
+            with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class CalendarExport:
+
+    def __init__(self, client, root, format="parquet", shard="week", pagesize=1000, batch_size=50000,
+                 max_pending=2):
+        """Bulk export of calendar data to columnar files partitioned by calendar and date, in the Hive layout
+        root/<calendar>/day=YYYY-MM-DD/part-00000.parquet. Records are streamed from Benzinga.backfill and
+        written in batches of at most batch_size rows by a background thread while the next pages download. The
+        export holds at most max_pending + 1 batches and the client's backfill window of max_workers shards,
+        however long the date range. A manifest in root records the days that are complete,
+        and a run that was interrupted resumes after the last complete day.
+
+        Arguments:
+            Required - client (financial_data.Benzinga)
+            Required - root (str) - directory of the export
+            Optional:
+            format (str) - "parquet" or "arrow" for Arrow IPC files. Default: "parquet"
+            shard (str) - initial backfill shard size: "day", "week" or "month". Default: "week"
+            pagesize (int) - records per request. Default: 1000
+            batch_size (int) - maximum rows per file. Default: 50000
+            max_pending (int) - batches queued for the writer before the download waits. Default: 2"""
+        if format not in EXPORT_FORMATS:
+            raise IncorrectParameterEntry(
+                "format must be one of %s. You entered %s" % (", ".join(EXPORT_FORMATS), format)
+            )
+        self.client = client
+        self.root = root
+        self.format = format
+        self.shard = shard
+        self.pagesize = pagesize
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.manifest_path = os.path.join(root, MANIFEST)
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {"format": self.format, "calendars": {}}
+        with open(self.manifest_path) as fh:
+            return json.load(fh)
+
+    def __save_manifest(self, manifest):
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(manifest, fh, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def __partition(self, calendar, day):
+        return os.path.join(self.root, calendar, "day=%s" % day)
+
+    def __write(self, calendar, day, part, records, entry):
+        """Private Method: Write one batch of a day. Runs on the writer thread, which also owns the manifest."""
+        directory = self.__partition(calendar, day)
+        os.makedirs(directory, exist_ok=True)
+        if part == 0:
+            # Parts left by an interrupted run of the same day are replaced.
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            entry["files"][day], entry["rows"][day] = [], 0
+        path = os.path.join(directory, "part-%05d.%s" % (part, EXPORT_FORMATS[self.format]))
+        write_table(calendar_table(calendar, records), path, self.format)
+        entry["files"][day].append(os.path.relpath(path, self.root))
+        entry["rows"][day] += len(records)
+
+    def __complete(self, manifest, entry, day):
+        """Private Method: Mark every day up to day as complete and save the manifest."""
+        entry["complete_through"] = day
+        self.__save_manifest(manifest)
+
+    def run(self, calendar, date_from, date_to, **kwargs):
+        """Public Method: Export a calendar over a date range, resuming after the last complete day of a previous
+        run with the same arguments.
+
+        Arguments:
+            Required - calendar (str) - name of a calendar method, e.g. "ratings", "options_activity"
+            Required - date_from (str) - "YYYY-MM-DD"
+            Required - date_to (str) - "YYYY-MM-DD"
+            Optional:
+            the other arguments of the calendar method, e.g. company_tickers
+
+        Returns:
+            the manifest entry of the calendar: complete_through, and the files and rows of every day"""
+        if calendar not in CALENDAR_KEYS:
+            raise IncorrectParameterEntry(
+                "calendar must be one of %s. You entered %s" % (", ".join(CALENDAR_KEYS), calendar)
+            )
+        os.makedirs(self.root, exist_ok=True)
+        manifest = self.load_manifest()
+        if manifest["format"] != self.format:
+            raise IncorrectParameterEntry(
+                "%s holds a %s export. You requested %s" % (self.root, manifest["format"], self.format)
+            )
+        params = json.loads(json.dumps(kwargs, sort_keys=True, default=str))
+        entry = manifest["calendars"].setdefault(
+            calendar, {"params": params, "complete_through": None, "files": {}, "rows": {}}
+        )
+        if entry["params"] != params:
+            raise IncorrectParameterEntry(
+                "%s was exported to %s with %s. You requested %s" % (calendar, self.root, entry["params"], params)
+            )
+        start, end = to_date(date_from), to_date(date_to)
+        if entry["complete_through"] is not None:
+            start = max(start, to_date(entry["complete_through"]) + dt.timedelta(days=1))
+        if start > end:
+            return entry
+
+        from concurrent.futures import ThreadPoolExecutor
+        records = self.client.backfill(
+            calendar, start, end, shard=self.shard, pagesize=self.pagesize, stream=True, **kwargs
+        )
+        executor = ThreadPoolExecutor(max_workers=1)
+        pending = []
+
+        def submit(function, *args):
+            pending.append(executor.submit(function, *args))
+            while len(pending) > self.max_pending:
+                pending.pop(0).result()
+
+        try:
+            day, part, batch = start.isoformat(), 0, []
+            for record in records:
+                record_day = (record.get("date") or "")[:10] or day
+                if record_day != day:
+                    if batch:
+                        submit(self.__write, calendar, day, part, batch, entry)
+                    previous = (to_date(record_day) - dt.timedelta(days=1)).isoformat()
+                    submit(self.__complete, manifest, entry, max(previous, day))
+                    day, part, batch = record_day, 0, []
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    submit(self.__write, calendar, day, part, batch, entry)
+                    part, batch = part + 1, []
+            if batch:
+                submit(self.__write, calendar, day, part, batch, entry)
+            submit(self.__complete, manifest, entry, end.isoformat())
+            while pending:
+                pending.pop(0).result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return entry
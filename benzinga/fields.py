@@ -0,0 +1,110 @@
+from .benzinga_errors import IncorrectParameterEntry
+from .client import page_records
+from .records import MODELS
+
+# Screener columns of instruments, all requested when no fields are given.
+INSTRUMENT_FIELDS = (
+    "symbol", "marketcap", "exchange", "isin", "country", "name", "previousClose", "open", "close", "change",
+    "changePercent", "sector",
+)
+
+# Sections of the fundamentals response.
+FUNDAMENTALS_SECTIONS = (
+    "company", "companyProfile", "shareClass", "shareClassProfile", "earningReports", "financialStatements",
+    "operationRatios", "earningRatios", "valuationRatios", "alphaBeta", "assetClassification",
+)
+
+# Known fields of every method accepting fields=, by method name. The calendars with a typed record model take
+# the fields of the model, the others the fields their methods document.
+CATALOGS = {
+    "instruments": INSTRUMENT_FIELDS,
+    "fundamentals": FUNDAMENTALS_SECTIONS,
+    "ratings": tuple(MODELS["ratings"].FIELDS),
+    "earnings": tuple(MODELS["earnings"].FIELDS),
+    "dividends": tuple(MODELS["dividends"].FIELDS),
+    "options_activity": tuple(MODELS["options_activity"].FIELDS),
+    "splits": (
+        "id", "date", "time", "ticker", "exchange", "importance", "ratio", "optionable", "date_ex", "date_recorded",
+        "date_distribution", "notes", "updated",
+    ),
+    "economics": (
+        "id", "date", "time", "country", "event_name", "event_period", "period_year", "actual", "actual_t",
+        "consensus", "consensus_t", "prior", "prior_t", "importance", "description", "notes", "updated",
+    ),
+    "guidance": (
+        "id", "date", "time", "ticker", "exchange", "name", "currency", "period", "period_year", "prelim",
+        "eps_guidance_est", "eps_guidance_max", "eps_guidance_min", "eps_guidance_prior_max",
+        "eps_guidance_prior_min", "revenue_guidance_est", "revenue_guidance_max", "revenue_guidance_min",
+        "revenue_guidance_prior_max", "revenue_guidance_prior_min", "importance", "notes", "updated",
+    ),
+    "ipo": (
+        "id", "date", "time", "ticker", "exchange", "name", "pricing_date", "price_min", "price_max", "deal_status",
+        "insider_lockup_days", "insider_lockup_date", "offering_value", "offering_shares", "lead_underwriters",
+        "underwriter_quiet_expiration_days", "underwriter_quiet_expiration_date", "importance", "notes", "updated",
+    ),
+    "retail": (
+        "id", "date", "time", "ticker", "exchange", "name", "importance", "period", "period_year", "sss", "sss_est",
+        "retail_surprise", "notes", "updated",
+    ),
+    "conference_calls": (
+        "id", "date", "time", "ticker", "exchange", "name", "start_time", "phone_num", "international_line",
+        "reservation_num", "access_code", "webcast_url", "importance", "notes", "updated",
+    ),
+}
+
+# Fields every calendar projection keeps: backfill deduplicates records by id and sorts them by date,
+# CalendarSync follows updated and CalendarExport partitions by date.
+KEY_FIELDS = ("id", "date", "updated")
+
+
+def field_list(name, fields, check=True):
+    """Normalize the fields= argument of method name into a list, checked against its catalog.
+
+    Arguments:
+        name (str) - method name, a key of CATALOGS
+        fields (str or list) - comma separated string or list of field names
+        check (bool) - reject fields missing from the catalog
+
+    Returns:
+        list of field names"""
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    if not isinstance(fields, (list, tuple)):
+        raise IncorrectParameterEntry("fields must be a str or list. You entered %s" % type(fields).__name__)
+    fields = [field.strip() for field in fields if field.strip()]
+    if not fields:
+        raise IncorrectParameterEntry("fields must name at least one field")
+    if check:
+        unknown = [field for field in fields if field not in CATALOGS[name]]
+        if unknown:
+            raise IncorrectParameterEntry(
+                "Unknown fields for %s: %s. Known fields: %s" % (name, ", ".join(unknown), ", ".join(CATALOGS[name]))
+            )
+    return fields
+
+
+def calendar_fields(name, fields, importance=None, check=True):
+    """Return the fields query parameter of calendar name, or None when every field is wanted. The requested
+    fields are extended with KEY_FIELDS, and with importance when the records are filtered on it."""
+    if fields is None:
+        return None
+    keep = KEY_FIELDS if importance is None else KEY_FIELDS + ("importance",)
+    return ",".join(dict.fromkeys(field_list(name, fields, check) + list(keep)))
+
+
+def section_projection(sections):
+    """Return a transform keeping only the requested sections of a fundamentals response. The response is
+    copied rather than changed in place, as it may be held by the response cache."""
+    drop = set(FUNDAMENTALS_SECTIONS).difference(sections)
+
+    def project(response):
+        records = [
+            {name: value for name, value in record.items() if name not in drop} if isinstance(record, dict) else record
+            for record in page_records(response, None)
+        ]
+        if isinstance(response, list):
+            return records
+        key = next((key for key, value in response.items() if isinstance(value, list)), None) if response else None
+        return response if key is None else dict(response, **{key: records})
+
+    return project
@@ -1,29 +1,25 @@
-import requests
-import json
-import datetime as dt
+from urllib.parse import quote
 from .param_check import Param_Check
-from .benzinga_errors import (
-    TokenAuthenticationError,
-    URLIncorrectlyFormattedError,
-    RateLimitError,
-    ServiceUnavailableError,
-    PreconditionFailedError,
-    NotFoundError,
-    BadRequestError,
-    GatewayTimeoutError)
+from .benzinga_errors import IncorrectParameterEntry
 
-from .config import requests_retry_session
-import structlog
+from .client import BaseClient, page_records
+from .backfill import date_shards, split_shard, merge_records
+from .endpoints import FINANCIAL_ENDPOINTS
+from .fields import INSTRUMENT_FIELDS, calendar_fields, field_list, section_projection
+from .output import candles_converter, record_converter, records_converter
 
+# Calendar methods and the response key that holds their records.
+CALENDAR_KEYS = {
+    name: endpoint.key for name, endpoint in FINANCIAL_ENDPOINTS.items() if endpoint.pagination == "page"
+}
 
-log = structlog.get_logger()
 
+class Benzinga(BaseClient):
 
-class Benzinga:
+    endpoints = FINANCIAL_ENDPOINTS
 
-    def __init__(self, api_token, log=True):
-        self.token = api_token
-        self.headers = {'accept': 'application/json'}
+    def __init__(self, api_token, log=True, **client_options):
+        super().__init__(api_token, log=log, **client_options)
         self.url_dict = {
             "API v1": "https://data-api.benzinga.com/rest/v2/",
             "API v1.v1": "https://api.benzinga.com/api/v1.1/",
@@ -39,129 +35,25 @@ class Benzinga:
             "API Fundamentals": "https://data-api.benzinga.com/rest/v3/"
         }
         self.param_initiate = Param_Check()
-        self.log = log
 
-    def __token_check(self, api_token):
-        """Private Method: Token check is a private method that does a basic check for whether the api token has
-        access to the fundamentals and/or calendar data. Different tokens have access to different endpoints.
-        Disregard the error if your request is fulfilled but the token authentication error is raised.
-
-         Arguments:
-             API Token.
-
-         Returns:
-             Token authentication error if token is invalid."""
-
-        end_date = dt.date.today().strftime('%Y-%m-%d')
-        company_ticker = "AAPL"
-        params = {
-            'token': api_token,
-            'parameters[date_to]': end_date,
-            'parameters[tickers]': company_ticker
-        }
-
-        ratingsUrl = self.__url_call("calendar", "dividends")
-        ratings = requests_retry_session().get(ratingsUrl, headers=self.headers, params=params, timeout=10)
-        if ratings.status_code == 401:
-            raise TokenAuthenticationError
-
-    def __env_selection(self, string, env=0):
-        result = "%s Internal" % string if env == 1 else "%s" % string
-        return result
-
-    def __url_call(self, resource, sub_resource="",env=0):
-        """Private Method: URL Call is used to take input from the public methods and return the appropriate url format
-        for the endpoint. For example, the resource is calendar and the subresource might be ratings. The correct
-        url endpoint call is created by using these two.
-
-        Arguments:
-            Resource and Sub- Resource
-
-        Returns:
-            url for the endpoint call"""
-
-        v2 = self.__env_selection(
-            string="API v2", env=env
-        )  # this is not working for calendar
-        v1 = self.__env_selection(
-            string="API v1", env=env
-        )  # this is not working for quoteDelayed
-        v1_1 = self.__env_selection(string="API v1.v1", env=env)
-        mover = self.__env_selection(string="IO API", env=env)
-
-        endpoint_type = {
-            "calendar": "%s%s/%s" % (self.url_dict["API v2"], resource, sub_resource),
-            "quote": "%s%s" % (self.url_dict["Data v2"], resource),
-            "security": "%s%s" % (self.url_dict["Data api v2"], resource),
-            "chart": "%s%s" % (self.url_dict["Data api v2"], resource),
-            "batchhistory": "%s%s" % (self.url_dict["Data api v2"], resource),
-            "autocomplete": "%s%s" % (self.url_dict["Data v2"], resource),
-            "instruments": "%s%s" % (self.url_dict["V3"], resource),
-            "quoteDelayed": "%s%s" % (self.url_dict["v1"], resource),
-            "logos": "%s%s" % (self.url_dict[v1_1], resource),
-            "fundamentals": "%s%s/%s" % (self.url_dict["V3"], resource, sub_resource),
-            "ownership": "%s%s/%s" % (self.url_dict["V3"], resource, sub_resource),
-            "movers": "%s%s" % (self.url_dict[mover], resource),
-            "tickerDetail": "%s%s" % (self.url_dict["V3"], resource),
-            "option_activity": "%s%s" % (self.url_dict["v1 opt"], resource),
-            "bars": "%s%s" % (self.url_dict["API v2"], resource),
-        }
-        if resource not in endpoint_type:
-            raise URLIncorrectlyFormattedError
-        url_string = endpoint_type[resource]
-        return url_string
-
-    def __check_status(self, status_code):
-        if status_code == 400:
-            raise BadRequestError
-        if status_code == 401:
-            raise TokenAuthenticationError
-        elif status_code == 403:
-            raise TokenAuthenticationError
-        elif status_code == 404:
-            raise NotFoundError
-        elif status_code == 412:
-            raise PreconditionFailedError
-        elif status_code == 429:
-            raise RateLimitError
-        elif status_code == 500:
-            raise ServiceUnavailableError
-        elif status_code == 502:
-            raise ServiceUnavailableError
-        elif status_code == 503:
-            raise ServiceUnavailableError
-        elif status_code == 504:
-            raise GatewayTimeoutError
-
-    def price_history(self, company_tickers, date_from, date_to):
-        """Public Method: Benzinga Price History requires 3 required arguments. It returns daily candles for a specific date range
-        for a company. The from and to date is required along with the company ticker.
+    def price_history(self, company_tickers, date_from, date_to, output=None):
+        """Public Method: Benzinga Price History requires 3 required arguments. It returns daily candles for a
+        specific date range for a company. The from and to date is required along with the company ticker.
 
         Arguments:
             Required - company_tickers (str)
             Required - date_from (str) - "YYYY-MM-DD"
             Required - date_to (str) - "YYYY-MM-DD"
+            Optional:
+            output (str) - "numpy" for {symbol: {"time", "open", "high", "low", "close", "volume"}} arrays
+            instead of the decoded JSON
 
         Returns:
             Daily candles for the company for a specific date range"""
 
         revised_input = "%s:%s:%s" % (company_tickers, date_from, date_to)
         params = {"symbol": revised_input, "apikey": self.token}
-        self.param_initiate.batchhistory_check(params)
-        try:
-            batchhistory_url = self.__url_call("batchhistory")
-            batchhistory = requests_retry_session().get(
-                batchhistory_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=batchhistory.url, status_code=batchhistory.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(batchhistory.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return batchhistory.json()
+        return self._call("price_history", params, transform=self.__candles("price_history", output, company_tickers))
 
     def delayed_quote(self, company_tickers=None, isin=None, cik=None, env=0):
         """Public Method: Delayed Quotes
@@ -183,23 +75,9 @@ class Benzinga:
             "isin": isin,
             "cik": cik,
         }
-        self.param_initiate.delayed_quote_check(params)
-        try:
-            delayedquote_url = self.__url_call("quoteDelayed", env=env)
-            delayed_quote = requests_retry_session().get(
-                delayedquote_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=delayed_quote.url, status_code=delayed_quote.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(delayed_quote.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return delayed_quote.json()
-
-    def bars(self, company_tickers, date_from, date_to=None, interval=None, session=None):
+        return self._call("delayed_quote", params)
+
+    def bars(self, company_tickers, date_from, date_to=None, interval=None, session=None, output=None):
         """Public Method: Benzinga Bars looks at detailed price values over a period of time.
 
                 Arguments:
@@ -210,6 +88,8 @@ class Benzinga:
                     date_to (str) - "YY-MM-DD"
                     interval (str) - "1MONTH", "1W", "1D", "1H", "15M". Default: "5M"
                     session (str) - "ANY", "REGULAR"
+                    output (str) - "numpy" for {symbol: {"time", "open", "high", "low", "close", "volume"}}
+                    arrays instead of the decoded JSON
 
                 Returns:
                     open, high, low, close, volume, time, dateTime"""
@@ -220,18 +100,7 @@ class Benzinga:
             "to": date_to,
             "interval": interval
         }
-        self.param_initiate.bars_check(params)
-        try:
-            bars_url = self.__url_call("bars")
-            bars = requests_retry_session().get(bars_url, headers=self.headers, params=params, timeout=10)
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(endpoint=bars.url,
-                                                                                 status_code=bars.status_code)
-            if self.log:
-                log.info(statement)
-            self.__check_status(bars.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return bars.json()
+        return self._call("bars", params, transform=self.__candles("bars", output, company_tickers))
 
     def auto_complete(
         self,
@@ -265,21 +134,7 @@ class Benzinga:
             "exchanges": exchanges,
             "types": types,
         }
-        self.param_initiate.autocomplete_check(params)
-        try:
-            autocomplete_url = self.__url_call("autocomplete")
-            autocomplete = requests_retry_session().get(
-                autocomplete_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=autocomplete.url, status_code=autocomplete.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(autocomplete.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return autocomplete.json()
+        return self._call("auto_complete", params)
 
     def security(self, company_tickers, cusip=None):
         """Public Method: Benzinga Security returns the information regarding the security.
@@ -293,24 +148,10 @@ class Benzinga:
             Symbol, exchange symbol, exchange, country, currency, cusip and description"""
 
         params = {"apikey": self.token, "symbol": company_tickers, "cusip": cusip}
-        self.param_initiate.security_check(params)
-        try:
-            security_url = self.__url_call("security")
-            security = requests_retry_session().get(
-                security_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=security.url, status_code=security.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(security.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return security.json()
+        return self._call("security", params)
 
     def chart(
-        self, company_tickers, date_from, date_to=None, interval=None, session=None
+        self, company_tickers, date_from, date_to=None, interval=None, session=None, output=None
     ):
         """Public Method: Benzinga Chart looks at detailed price values over a period of time.
 
@@ -322,6 +163,8 @@ class Benzinga:
             date_to (str) - "YY-MM-DD"
             interval (str) - "1MONTH", "1W", "1D", "1H", "15M". Default: "5M"
             session (str) - "ANY", "REGULAR"
+            output (str) - "numpy" for {symbol: {"time", "open", "high", "low", "close", "volume"}} arrays
+            instead of the decoded JSON
 
         Returns:
             open, high, low, close, volume, time, dateTime"""
@@ -333,27 +176,13 @@ class Benzinga:
             "interval": interval,
             "session": session,
         }
-        self.param_initiate.charts_check(params)
-        try:
-            chart_url = self.__url_call("chart")
-            chart = requests_retry_session().get(
-                chart_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=chart.url, status_code=chart.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(chart.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return chart.json()
+        return self._call("chart", params, transform=self.__candles("chart", output, company_tickers))
 
     def quote(self, company_tickers):
         """Public Method: Benzinga Quote looks at many different attributes of the ticker like high, low, close etc
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
 
         Returns:
             symbol, dxsymbol, exchange, bzexchange, isoexchange, type, name, description, open
@@ -363,21 +192,7 @@ class Benzinga:
         payout ratio, shares outstanding, open interest, shares per contract, multiplier"""
 
         params = {"apikey": self.token, "symbols": company_tickers}
-        self.param_initiate.fundamentals_check(params)
-        try:
-            quote_url = self.__url_call("quote")
-            quote = requests_retry_session().get(
-                quote_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=quote.url, status_code=quote.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(quote.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return quote.json()
+        return self._call("quote", params)
 
     def instruments(
         self,
@@ -390,6 +205,8 @@ class Benzinga:
         sector=None,
         sort_field=None,
         sort_dir=None,
+        fields=None,
+        stream=False,
     ):
         """Public Method: Benzinga Instruments looks at all of the screener data with price statistics, based
         on different attributes.
@@ -405,15 +222,14 @@ class Benzinga:
             sector (str) - sector like "healthcare"
             sort field (str) - field to sort by (un-tested)
             sortdir (str) - direction of sort (un-tested)
+            fields (str or list) - screener columns to return, from fields.INSTRUMENT_FIELDS. Default: all of them
+            stream (bool) - return a generator of instruments parsed while the response arrives, instead of
+            decoding the whole screener response at once
 
         Returns:
             all of the data related to the instrument including marketcap, sector, company name
         etc, that can be found on the Benzinga Pro screener."""
 
-        fields = (
-            "symbol,marketcap,exchange,"
-            "isin,country,name,previousClose,open,close,change,changePercent,sector"
-        )
         if market_cap_gt is not None:
             market_cap_greater = ";marketcap_gt_%s" % market_cap_gt
         else:
@@ -446,7 +262,9 @@ class Benzinga:
             )
         params = {
             "apikey": self.token,
-            "fields": fields,
+            "fields": ",".join(
+                INSTRUMENT_FIELDS if fields is None else field_list("instruments", fields, self.validate_params)
+            ),
             "query": query,
             "from": date_from,
             "to": date_to,
@@ -454,21 +272,9 @@ class Benzinga:
             "sortfield": sort_field,
             "sortdir": sort_dir,
         }
-        self.param_initiate.instruments_check(params)
-        try:
-            instruments_url = self.__url_call("instruments")
-            instruments = requests_retry_session().get(
-                instruments_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=instruments.url, status_code=instruments.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(instruments.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return instruments.json()
+        if stream:
+            return self._stream("instruments", params)
+        return self._call("instruments", params)
 
     def dividends(
         self,
@@ -484,6 +290,9 @@ class Benzinga:
         div_yield_operation=None,
         div_yield=None,
         env=0,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Benzinga Dividends looks at the relevant dividend information for a
         company.
@@ -503,6 +312,11 @@ class Benzinga:
             div_yield_operation (str) - to filter the div yield by for eg. "gt", "gte",
             "eq", "lte", "lt". Not tested
             div_yield (int) - div yield amount fo filter by. "1" for 100% or above.
+            fields (str or list) - fields to return, from fields.CATALOGS["dividends"]. Default: all of them
+            output (str) - "records" for typed records.Dividend objects, "pandas" for a DataFrame or "arrow"
+            for a pyarrow Table, instead of the decoded JSON
+            stream (bool) - return a generator of records parsed while the response arrives, for very
+            large pages. output may only be "records" then
 
         Returns:
             the id, date, updated, isin, ticker, name, exchange, frequency, dividend,
@@ -511,6 +325,7 @@ class Benzinga:
         """
         params = {
             "token": self.token,
+            "fields": calendar_fields("dividends", fields, importance, self.validate_params),
             "page": page,
             "pagesize": pagesize,
             "parameters[date]": date_asof,
@@ -523,26 +338,7 @@ class Benzinga:
             "paramaters[dividend_yield_operation]": div_yield_operation,
             "parameters[dividend_yield]": div_yield,
         }
-        self.param_initiate.calendar_check(params)
-        try:
-            dividends_url = self.__url_call("calendar", "dividends", env=env)
-            dividends = requests_retry_session().get(
-                dividends_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=dividends.url, status_code=dividends.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(dividends.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        result_out = (
-            dividends.json()
-            if importance == None or (not dividends.json())
-            else self.__importance("dividends", dividends.json(), importance)
-        )
-        return result_out
+        return self.__calendar("dividends", params, importance, output, stream)
 
     def earnings(
         self,
@@ -556,6 +352,9 @@ class Benzinga:
         date_sort=None,
         updated_params=None,
         env=0,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Benzinga Earnings looks at the quarterly earnings reports for different
         companies.
@@ -572,6 +371,11 @@ class Benzinga:
              date_sort - (str) - Dividend date field to sort on
              updated_params (int64) - records last updated unix time stamp. Forces the
              sort order to be greater or equal to the time stamp indicated.
+             fields (str or list) - fields to return, from fields.CATALOGS["earnings"]. Default: all of them
+             output (str) - "records" for typed records.Earning objects, "pandas" for a DataFrame or "arrow"
+             for a pyarrow Table, instead of the decoded JSON
+             stream (bool) - return a generator of records parsed while the response arrives, for very
+             large pages. output may only be "records" then
 
         Returns:
             id, date, date confirmed, time, isin, ticker, exchange, name, period, period_year,
@@ -582,6 +386,7 @@ class Benzinga:
         """
         params = {
             "token": self.token,
+            "fields": calendar_fields("earnings", fields, importance, self.validate_params),
             "page": page,
             "pagesize": pagesize,
             "parameters[date]": date_asof,
@@ -592,26 +397,7 @@ class Benzinga:
             "parameters[date_sort]": date_sort,
             "parameters[updated]": updated_params,
         }
-        self.param_initiate.calendar_check(params)
-        try:
-            earnings_url = self.__url_call("calendar", "earnings", env=env)
-            earnings = requests_retry_session().get(
-                earnings_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=earnings.url, status_code=earnings.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(earnings.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        result_out = (
-            earnings.json()
-            if importance == None
-            else self.__importance("earnings", earnings.json(), importance)
-        )
-        return result_out
+        return self.__calendar("earnings", params, importance, output, stream)
 
     def splits(
         self,
@@ -625,6 +411,9 @@ class Benzinga:
         date_sort=None,
         updated_params=None,
         env=0,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Benzinga Splits looks at the stock splits calendar data
 
@@ -640,6 +429,10 @@ class Benzinga:
              date_sort - (str) - Dividend date field to sort on
              updated_params (int64) - records last updated unix time stamp. Forces the
              sort order to be greater or equal to the time stamp indicated.
+             fields (str or list) - fields to return, from fields.CATALOGS["splits"]. Default: all of them
+             output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
+             stream (bool) - return a generator of records parsed while the response arrives, for very
+             large pages. output may only be "records" then
 
         Returns:
             id, updated, date, time, ticker, exchange, importance, ratio, optionable,
@@ -647,6 +440,7 @@ class Benzinga:
 
         params = {
             "token": self.token,
+            "fields": calendar_fields("splits", fields, importance, self.validate_params),
             "page": page,
             "pagesize": pagesize,
             "parameters[date]": date_asof,
@@ -657,26 +451,7 @@ class Benzinga:
             "parameters[date_sort]": date_sort,
             "parameters[updated]": updated_params,
         }
-        self.param_initiate.calendar_check(params)
-        try:
-            splits_url = self.__url_call("calendar", "splits", env=env)
-            splits = requests_retry_session().get(
-                splits_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=splits.url, status_code=splits.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(splits.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        result_out = (
-            splits.json()
-            if importance == None
-            else self.__importance("splits", splits.json(), importance)
-        )
-        return result_out
+        return self.__calendar("splits", params, importance, output, stream)
 
     def economics(
         self,
@@ -690,6 +465,9 @@ class Benzinga:
         updated_params=None,
         country=None,
         env=0,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Benzinga Economics looks at different economic events in a country.
 
@@ -706,6 +484,10 @@ class Benzinga:
              updated_params (int64) - records last updated unix time stamp. Forces the
              sort order to be greater or equal to the time stamp indicated.
              country (str) - 3 digit country code
+             fields (str or list) - fields to return, from fields.CATALOGS["economics"]. Default: all of them
+             output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
+             stream (bool) - return a generator of records parsed while the response arrives, for very
+             large pages. output may only be "records" then
 
         Returns:
             id, date, time, country, event_name, event_period, period_year, actual, actual_t
@@ -713,6 +495,7 @@ class Benzinga:
 
         params = {
             "token": self.token,
+            "fields": calendar_fields("economics", fields, importance, self.validate_params),
             "page": page,
             "pagesize": pagesize,
             "parameters[date]": date_asof,
@@ -723,26 +506,7 @@ class Benzinga:
             "parameters[updated]": updated_params,
             "country": country,
         }
-        self.param_initiate.calendar_check(params)
-        try:
-            economics_url = self.__url_call("calendar", "economics", env=env)
-            economics = requests_retry_session().get(
-                economics_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=economics.url, status_code=economics.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(economics.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        result_out = (
-            economics.json()
-            if importance == None
-            else self.__importance("economics", economics.json(), importance)
-        )
-        return result_out
+        return self.__calendar("economics", params, importance, output, stream)
 
     def guidance(
         self,
@@ -757,6 +521,9 @@ class Benzinga:
         updated_params=None,
         country=None,
         env=0,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Benzinga Guidance looks at different attributes like revenue guidance etc.
         Arguments:
@@ -772,6 +539,10 @@ class Benzinga:
              updated_params (int64) - records last updated unix time stamp. Forces the
              sort order to be greater or equal to the time stamp indicated.
              country (str) - 3 digit country code
+             fields (str or list) - fields to return, from fields.CATALOGS["guidance"]. Default: all of them
+             output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
+             stream (bool) - return a generator of records parsed while the response arrives, for very
+             large pages. output may only be "records" then
 
         Returns:
             id, date, time, ticker, exchange, name, period, period_year, prelim, eps_guidance_est,
@@ -781,6 +552,7 @@ class Benzinga:
 
         params = {
             "token": self.token,
+            "fields": calendar_fields("guidance", fields, importance, self.validate_params),
             "page": page,
             "pagesize": pagesize,
             "parameters[date]": date_asof,
@@ -792,26 +564,7 @@ class Benzinga:
             "parameters[updated]": updated_params,
             "country": country,
         }
-        self.param_initiate.calendar_check(params)
-        try:
-            guidance_url = self.__url_call("calendar", "guidance", env=env)
-            guidance = requests_retry_session().get(
-                guidance_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=guidance.url, status_code=guidance.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(guidance.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        result_out = (
-            guidance.json()
-            if importance == None
-            else self.__importance("guidance", guidance.json(), importance)
-        )
-        return result_out
+        return self.__calendar("guidance", params, importance, output, stream)
 
     def ipo(
         self,
@@ -825,6 +578,9 @@ class Benzinga:
         date_sort=None,
         updated_params=None,
         env=0,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Benzing IPO looks at initial public offering data for companies.
 
@@ -840,6 +596,10 @@ class Benzinga:
             date_sort - "str" - Dividend date field to sort on
             updated_params (int64) - records last updated unix time stamp. Forces the
             sort order to be greater or equal to the time stamp indicated.
+            fields (str or list) - fields to return, from fields.CATALOGS["ipo"]. Default: all of them
+            output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
+            stream (bool) - return a generator of records parsed while the response arrives, for very
+            large pages. output may only be "records" then
 
         Returns:
             id, date, time, ticker, exchange, name, pricing_date, price_min, price_max, deal_status,
@@ -848,6 +608,7 @@ class Benzinga:
 
         params = {
             "token": self.token,
+            "fields": calendar_fields("ipo", fields, importance, self.validate_params),
             "page": page,
             "pagesize": pagesize,
             "parameters[date]": date_asof,
@@ -858,26 +619,7 @@ class Benzinga:
             "parameters[date_sort]": date_sort,
             "parameters[updated]": updated_params,
         }
-        self.param_initiate.calendar_check(params)
-        try:
-            ipo_url = self.__url_call("calendar", "ipos", env=env)
-            ipo = requests_retry_session().get(
-                ipo_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=ipo.url, status_code=ipo.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(ipo.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        result_out = (
-            ipo.json()
-            if importance is None
-            else self.__importance("ipo", ipo.json(), importance)
-        )
-        return result_out
+        return self.__calendar("ipo", params, importance, output, stream)
 
     def retail(
         self,
@@ -891,6 +633,9 @@ class Benzinga:
         date_sort=None,
         updated_params=None,
         env=0,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Benzinga Retail looks at retail data.
 
@@ -906,6 +651,10 @@ class Benzinga:
             date_sort - (str) - Dividend date field to sort on
             updated_params (int64) - records last updated unix time stamp. Forces the
             sort order to be greater or equal to the time stamp indicated.
+            fields (str or list) - fields to return, from fields.CATALOGS["retail"]. Default: all of them
+            output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
+            stream (bool) - return a generator of records parsed while the response arrives, for very
+            large pages. output may only be "records" then
 
         Returns:
             id, date, time, ticker, exchange, name, importance, period, period_year, sss,
@@ -913,6 +662,7 @@ class Benzinga:
 
         params = {
             "token": self.token,
+            "fields": calendar_fields("retail", fields, importance, self.validate_params),
             "page": page,
             "pagesize": pagesize,
             "parameters[date]": date_asof,
@@ -924,26 +674,7 @@ class Benzinga:
             "parameters[updated]": updated_params,
         }
 
-        self.param_initiate.calendar_check(params)
-        try:
-            retail_url = self.__url_call("calendar", "retail", env=env)
-            retail = requests_retry_session().get(
-                retail_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=retail.url, status_code=retail.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(retail.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        result_out = (
-            retail.json()
-            if importance == None
-            else self.__importance("retail", retail.json(), importance)
-        )
-        return result_out
+        return self.__calendar("retail", params, importance, output, stream)
 
     def ratings(
         self,
@@ -958,6 +689,9 @@ class Benzinga:
         updated_params=None,
         action=None,
         env=0,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Benzinga Ratings looks at ratings from different firms.
 
@@ -975,6 +709,11 @@ class Benzinga:
             sort order to be greater or equal to the time stamp indicated.
             action - (str) - " Upgrades , Downgrades , Maintains , Lowers , Raises ,
             Initiates Coverage On , Terminates Coverage On"
+            fields (str or list) - fields to return, from fields.CATALOGS["ratings"]. Default: all of them
+            output (str) - "records" for typed records.Rating objects, "pandas" for a DataFrame or "arrow"
+            for a pyarrow Table, instead of the decoded JSON
+            stream (bool) - return a generator of records parsed while the response arrives, for very
+            large pages. output may only be "records" then
 
         Returns:
             id, date, time, ticker, exchange, name, action_pt, action_company, rating_current,
@@ -983,6 +722,7 @@ class Benzinga:
 
         params = {
             "token": self.token,
+            "fields": calendar_fields("ratings", fields, importance, self.validate_params),
             "page": page,
             "pagesize": pagesize,
             "parameters[date]": date_asof,
@@ -995,34 +735,44 @@ class Benzinga:
             "parameters[action]": action,
         }
 
-        self.param_initiate.calendar_check(params)
-        try:
-            ratings_url = self.__url_call("calendar", "ratings", env=env)
-            ratings = requests_retry_session().get(
-                ratings_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=ratings.url, status_code=ratings.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(ratings.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        result_out = (
-            ratings.json()
-            if importance == None or (not ratings.json())
-            else self.__importance("ratings", ratings.json(), importance)
-        )
-        return result_out
-
-    def __importance(self, name, calendar_obj, importance):
-        new_list, revised_dict = (
-            list(filter(lambda x: x["importance"] == importance, calendar_obj[name])),
-            {},
-        )
-        revised_dict[name] = new_list
-        return revised_dict
+        return self.__calendar("ratings", params, importance, output, stream)
+
+    def __candles(self, name, output, company_tickers):
+        """Private Method: Candles returns a transform converting a candle response into the requested output, or
+        None when the decoded JSON was asked for."""
+        if output is None:
+            return None
+        return candles_converter(name, output, company_tickers)
+
+    def __calendar(self, name, params, importance, output, stream):
+        """Private Method: Request a calendar endpoint, returning the decoded response or, with stream, a generator
+        of its records filtered by importance record by record."""
+        if not stream:
+            return self._call(name, params, transform=self.__importance(name, importance), output=output)
+        record_filter = None if importance is None else (lambda record: record.get("importance") == importance)
+        return self._stream(name, params, record_filter, self.__record_converter(name, output))
+
+    def __record_converter(self, name, output):
+        return None if output is None else record_converter(name, output)
+
+    def __importance(self, name, importance):
+        """Private Method: Importance returns a transform that keeps only the calendar records of the requested
+        importance, or None when no importance filter was asked for."""
+        if importance is None:
+            return None
+        key = self.endpoints[name].key
+
+        def transform(calendar_obj):
+            if not calendar_obj:
+                return calendar_obj
+            new_list, revised_dict = (
+                list(filter(lambda x: x.get("importance") == importance, calendar_obj[key])),
+                {},
+            )
+            revised_dict[key] = new_list
+            return revised_dict
+
+        return transform
 
     def conference_calls(
         self,
@@ -1036,6 +786,9 @@ class Benzinga:
         date_sort=None,
         updated_params=None,
         env=0,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Benzinga Conference calls looks at conference calls.
 
@@ -1051,6 +804,10 @@ class Benzinga:
             date_sort - "str" - Dividend date field to sort on
             updated_params (int64) - records last updated unix time stamp. Forces the
             sort order to be greater or equal to the time stamp indicated.
+            fields (str or list) - fields to return, from fields.CATALOGS["conference_calls"]. Default: all of them
+            output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
+            stream (bool) - return a generator of records parsed while the response arrives, for very
+            large pages. output may only be "records" then
 
         Returns:
             id, date, time, ticker, exchange, name, start_time, phone_num, international_line,
@@ -1058,6 +815,7 @@ class Benzinga:
 
         params = {
             "token": self.token,
+            "fields": calendar_fields("conference_calls", fields, importance, self.validate_params),
             "page": page,
             "pagesize": pagesize,
             "parameters[date]": date_asof,
@@ -1068,36 +826,19 @@ class Benzinga:
             "parameters[date_sort]": date_sort,
             "parameters[updated]": updated_params,
         }
-        self.param_initiate.calendar_check(params)
-        try:
-            conference_url = self.__url_call("calendar", "conference-calls", env=env)
-            conference = requests_retry_session().get(
-                conference_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=conference.url, status_code=conference.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(conference.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        result_out = (
-            conference.json()
-            if importance == None
-            else self.__importance("conference", conference.json(), importance)
-        )
-        return result_out
+        return self.__calendar("conference_calls", params, importance, output, stream)
 
-    def fundamentals(self, company_tickers, isin=None, cik=None, date_asof=None):
+    def fundamentals(self, company_tickers, isin=None, cik=None, date_asof=None, fields=None, output=None):
         """Public Method: Benzinga Fundamentals looks at overall financial data for a company.
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) "YYYY-MM-DD"
+                fields (str or list) - sections to keep, from fields.FUNDAMENTALS_SECTIONS. Default: all of them
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
 
         Returns:
             company, companyProfile, shareClass, earningReports, financialStatements, operation earning and valuation
@@ -1110,21 +851,10 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            financials_url = self.__url_call("fundamentals")
-            financials = requests_retry_session().get(
-                financials_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=financials.url, status_code=financials.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(financials.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return financials.json()
+        transform = None
+        if fields is not None:
+            transform = section_projection(field_list("fundamentals", fields, self.validate_params))
+        return self._call("fundamentals", params, transform=transform, output=output)
 
     def financials(
         self,
@@ -1134,17 +864,19 @@ class Benzinga:
         date_asof=None,
         period=None,
         reporttype=None,
+        output=None,
     ):
         """Public Method: Benzinga Financials looks at overall financial data like  for a company.
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
                 period (str) - select from (3M , 6M , 9M , 12M , 1Y)
                 reporttype (str) - select from (TTM, A (default), R,P)
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
 
         Returns:
             company, financials such as balance sheet information, assets and liabilities
@@ -1159,31 +891,18 @@ class Benzinga:
             "reportType": reporttype,
         }
 
-        self.param_initiate.fundamentals_check(params)
-        try:
-            financials_url = self.__url_call("fundamentals", "financials")
-            financials = requests_retry_session().get(
-                financials_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=financials.url, status_code=financials.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(financials.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return financials.json()
-
-    def valuation_ratios(self, company_tickers, isin=None, cik=None, date_asof=None):
+        return self._call("financials", params, output=output)
+
+    def valuation_ratios(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Benzinga Valuation Ratios looks at overall financial data like  for a company.
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the valuation ratios
         """
@@ -1195,31 +914,18 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            valuation_url = self.__url_call("fundamentals", "valuationRatios")
-            valuation = requests_retry_session().get(
-                valuation_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=valuation.url, status_code=valuation.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(valuation.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return valuation.json()
-
-    def earning_ratios(self, company_tickers, isin=None, cik=None, date_asof=None):
+        return self._call("valuation_ratios", params, output=output)
+
+    def earning_ratios(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Benzinga Earning Ratios
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the earning ratios
         """
@@ -1230,31 +936,18 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            earnings_url = self.__url_call("fundamentals", "earningRatios")
-            earnings = requests_retry_session().get(
-                earnings_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=earnings.url, status_code=earnings.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(earnings.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return earnings.json()
-
-    def operation_ratios(self, company_tickers, isin=None, cik=None, date_asof=None):
+        return self._call("earning_ratios", params, output=output)
+
+    def operation_ratios(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Benzinga Operation Ratios
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the operation ratios
         """
@@ -1265,31 +958,18 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            operations_url = self.__url_call("fundamentals", "operationRatios")
-            operations = requests_retry_session().get(
-                operations_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=operations.url, status_code=operations.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(operations.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return operations.json()
-
-    def share_class(self, company_tickers, isin=None, cik=None, date_asof=None):
+        return self._call("operation_ratios", params, output=output)
+
+    def share_class(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Benzinga Share Class
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the share class.
         """
@@ -1301,32 +981,19 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            shareclass_url = self.__url_call("fundamentals", "shareClass")
-            shareclass = requests_retry_session().get(
-                shareclass_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=shareclass.url, status_code=shareclass.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(shareclass.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return shareclass.json()
+        return self._call("share_class", params, output=output)
 
 
-    def earning_reports(self, company_tickers, isin=None, cik=None, date_asof=None):
+    def earning_reports(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Benzinga Earning Reports looks at overall earning reports for a company.
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the earning reports.
         """
@@ -1337,31 +1004,18 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            earningreports_url = self.__url_call("fundamentals", "earningReports")
-            earningreports = requests_retry_session().get(
-                earningreports_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=earningreports.url, status_code=earningreports.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(earningreports.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return earningreports.json()
-
-    def alpha_beta(self, company_tickers, isin=None, cik=None, date_asof=None):
+        return self._call("earning_reports", params, output=output)
+
+    def alpha_beta(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Benzinga Alpha Beta
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the alpha beta.
         """
@@ -1372,31 +1026,18 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            alphabeta_url = self.__url_call("fundamentals", "alphaBeta")
-            alphabeta = requests_retry_session().get(
-                alphabeta_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=alphabeta.url, status_code=alphabeta.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(alphabeta.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return alphabeta.json()
-
-    def company_profile(self, company_tickers, isin=None, cik=None, date_asof=None):
+        return self._call("alpha_beta", params, output=output)
+
+    def company_profile(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Benzinga Company Profile
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the company profile.
         """
@@ -1407,31 +1048,18 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            companyprofile_url = self.__url_call("fundamentals", "companyProfile")
-            company_profile = requests_retry_session().get(
-                companyprofile_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=company_profile.url, status_code=company_profile.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(company_profile.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return company_profile.json()
-
-    def company(self, company_tickers, isin=None, cik=None, date_asof=None):
+        return self._call("company_profile", params, output=output)
+
+    def company(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Benzinga Company
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the company.
         """
@@ -1442,31 +1070,18 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            company_url = self.__url_call("fundamentals", "company")
-            company = requests_retry_session().get(
-                company_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=company.url, status_code=company.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(company.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return company.json()
-
-    def share_class_profile(self, company_tickers, isin=None, cik=None, date_asof=None):
+        return self._call("company", params, output=output)
+
+    def share_class_profile(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Benzinga Share Class Profile History
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the share class profile history.
         """
@@ -1477,33 +1092,21 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            profilehistory_url = self.__url_call("fundamentals", "shareClassProfile")
-            profilehistory = requests_retry_session().get(
-                profilehistory_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=profilehistory.url, status_code=profilehistory.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(profilehistory.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return profilehistory.json()
+        return self._call("share_class_profile", params, output=output)
 
     def asset_classification(
-        self, company_tickers, isin=None, cik=None, date_asof=None
+        self, company_tickers, isin=None, cik=None, date_asof=None,
+        output=None,
     ):
         """Public Method: Benzinga Asset Classification
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the asset classification.
         """
@@ -1514,31 +1117,18 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            asset_url = self.__url_call("fundamentals", "assetClassification")
-            asset = requests_retry_session().get(
-                asset_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=asset.url, status_code=asset.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(asset.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return asset.json()
-
-    def summary(self, company_tickers, isin=None, cik=None, date_asof=None):
+        return self._call("asset_classification", params, output=output)
+
+    def summary(self, company_tickers, isin=None, cik=None, date_asof=None, output=None):
         """Public Method: Summary
 
         Arguments:
-            Required - company_tickers (str)
+            Required - company_tickers (str or list)
             Optional:
                 isin (str) - specifies company data to return.
                 cik (str) - cik identifier
                 date_asof (str) - "YYYY-MM-DD"
+                output (str) - "pandas" for a DataFrame or "arrow" for a pyarrow Table instead of the decoded JSON
         Returns:
             different attributes of the ownership summary.
         """
@@ -1549,21 +1139,7 @@ class Benzinga:
             "cik": cik,
             "asOf": date_asof,
         }
-        self.param_initiate.fundamentals_check(params)
-        try:
-            summary_url = self.__url_call("ownership", "summary")
-            summary = requests_retry_session().get(
-                summary_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=summary.url, status_code=summary.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(summary.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return summary.json()
+        return self._call("summary", params, output=output)
 
     def ticker_detail(self, company_tickers):
         """Public Method: Ticker detail provides key statistics, peers, and percentile information on the company.
@@ -1576,21 +1152,7 @@ class Benzinga:
         """
 
         params = {"apikey": self.token, "symbols": company_tickers}
-        self.param_initiate.ticker_check(params)
-        try:
-            ticker_url = self.__url_call("tickerDetail")
-            ticker = requests_retry_session().get(
-                ticker_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=ticker.url, status_code=ticker.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(ticker.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return ticker.json()
+        return self._call("ticker_detail", params)
 
     def logos(self, company_tickers, filters=None, env=0):
         """Public Method: Logos
@@ -1604,21 +1166,7 @@ class Benzinga:
             different attributes of the logos
         """
         params = {"token": self.token, "symbols": company_tickers, "filters": filters}
-        self.param_initiate.logos_check(params)
-        try:
-            logos_url = self.__url_call("logos", env=env)
-            logos = requests_retry_session().get(
-                logos_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=logos.url, status_code=logos.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(logos.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return logos.json()
+        return self._call("logos", params)
 
     def movers(
         self,
@@ -1689,25 +1237,12 @@ class Benzinga:
             "apikey": self.token,
             "from": period_from,
             "to": period_to,
-            "session": urllib.parse.quote(session),
-            "screenerQuery": urllib.parse.quote(screener_query),
+            "session": quote(session),
+            "screenerQuery": None if screener_query is None else quote(screener_query),
             "maxResults": max_results,
         }
 
-        try:
-            movers_url = self.__url_call("movers", env=env)
-            movers = requests_retry_session().get(
-                movers_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=movers.url, status_code=movers.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(movers.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return movers.json()
+        return self._call("movers", params)
 
     def options_activity(
         self,
@@ -1718,6 +1253,9 @@ class Benzinga:
         page=None,
         pagesize=None,
         updated=None,
+        fields=None,
+        output=None,
+        stream=False,
     ):
         """Public Method: Option Activity
 
@@ -1728,6 +1266,11 @@ class Benzinga:
             date_from
             date_to
             updated
+            fields (str or list) - fields to return, from fields.CATALOGS["options_activity"]. Default: all of them
+            output (str) - "records" for typed records.OptionActivity objects, "pandas" for a DataFrame or "arrow"
+            for a pyarrow Table, instead of the decoded JSON
+            stream (bool) - return a generator of records parsed while the response arrives, for very
+            large pages. output may only be "records" then
 
         Returns:
 
@@ -1758,6 +1301,7 @@ class Benzinga:
         """
         params = {
             "token": self.token,
+            "fields": calendar_fields("options_activity", fields, None, self.validate_params),
             "parameters[tickers]": company_tickers,
             "parameters[date_from]": date_from,
             "parameters[date_to]": date_to,
@@ -1766,22 +1310,234 @@ class Benzinga:
             "pagesize": pagesize,
             "parameters[updated]": updated,
         }
-        self.param_initiate.options_check(params)
+        if stream:
+            return self._stream("options_activity", params, convert=self.__record_converter("options_activity", output))
+        return self._call("options_activity", params, output=output)
+
+    def __iter_calendar(self, calendar, pagesize, kwargs):
+        """Private Method: Page through a calendar method with _paginate. The importance filter is applied per
+        record, so a page without records of that importance does not end the iteration."""
+        importance = kwargs.pop("importance", None)
+        record_filter = None if importance is None else (lambda record: record.get("importance") == importance)
+        output = kwargs.pop("output", None)
+        convert = None if output is None else record_converter(calendar, output)
+        return self._paginate(
+            getattr(self, calendar), CALENDAR_KEYS[calendar], dict(kwargs, pagesize=pagesize), record_filter, convert
+        )
+
+    def iter_dividends(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every dividend record matching the dividends() arguments. Pages are
+        read one at a time, the next one is fetched in the background, and iteration stops on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of dividends()
+
+        Returns:
+            a generator of dividend records"""
+        return self.__iter_calendar("dividends", pagesize, kwargs)
+
+    def iter_earnings(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every earnings record matching the earnings() arguments. Pages are
+        read one at a time, the next one is fetched in the background, and iteration stops on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of earnings()
+
+        Returns:
+            a generator of earnings records"""
+        return self.__iter_calendar("earnings", pagesize, kwargs)
+
+    def iter_splits(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every stock split record matching the splits() arguments. Pages are
+        read one at a time, the next one is fetched in the background, and iteration stops on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of splits()
+
+        Returns:
+            a generator of stock split records"""
+        return self.__iter_calendar("splits", pagesize, kwargs)
+
+    def iter_economics(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every economic event record matching the economics() arguments. Pages are
+        read one at a time, the next one is fetched in the background, and iteration stops on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of economics()
+
+        Returns:
+            a generator of economic event records"""
+        return self.__iter_calendar("economics", pagesize, kwargs)
+
+    def iter_guidance(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every guidance record matching the guidance() arguments. Pages are
+        read one at a time, the next one is fetched in the background, and iteration stops on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of guidance()
+
+        Returns:
+            a generator of guidance records"""
+        return self.__iter_calendar("guidance", pagesize, kwargs)
+
+    def iter_ipo(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every IPO record matching the ipo() arguments. Pages are
+        read one at a time, the next one is fetched in the background, and iteration stops on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of ipo()
+
+        Returns:
+            a generator of IPO records"""
+        return self.__iter_calendar("ipo", pagesize, kwargs)
+
+    def iter_retail(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every retail record matching the retail() arguments. Pages are
+        read one at a time, the next one is fetched in the background, and iteration stops on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of retail()
+
+        Returns:
+            a generator of retail records"""
+        return self.__iter_calendar("retail", pagesize, kwargs)
+
+    def iter_ratings(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every rating record matching the ratings() arguments. Pages are
+        read one at a time, the next one is fetched in the background, and iteration stops on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of ratings()
+
+        Returns:
+            a generator of rating records"""
+        return self.__iter_calendar("ratings", pagesize, kwargs)
+
+    def iter_conference_calls(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every conference call record matching the conference_calls()
+        arguments. Pages are read one at a time, the next one is fetched in the background, and iteration stops
+        on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of conference_calls()
+
+        Returns:
+            a generator of conference call records"""
+        return self.__iter_calendar("conference_calls", pagesize, kwargs)
+
+    def iter_options_activity(self, pagesize=1000, **kwargs):
+        """Public Method: Lazily iterate over every option activity record matching the options_activity()
+        arguments. Pages are read one at a time, the next one is fetched in the background, and iteration stops
+        on the first empty page.
+
+        Arguments:
+            Optional:
+            pagesize (int) - records per page. Default: 1000
+            the other arguments of options_activity()
+
+        Returns:
+            a generator of option activity records"""
+        return self.__iter_calendar("options_activity", pagesize, kwargs)
+
+    def __fetch_shard(self, calendar, shard, pagesize, kwargs):
+        """Private Method: Fetch the first page of one date shard. A full page on a shard of more than one day is
+        reported as too dense so that the shard is split, a full page on a single day is paged through."""
+        fetch, key = getattr(self, calendar), CALENDAR_KEYS[calendar]
+        params = dict(kwargs, pagesize=pagesize, date_from=shard[0].isoformat(), date_to=shard[1].isoformat())
+        records = page_records(fetch(page=0, **params), key)
+        if len(records) < pagesize:
+            return records, False
+        if shard[0] < shard[1]:
+            return None, True
+        return records + list(self._paginate(fetch, key, dict(params, page=1))), False
+
+    def __backfill(self, calendar, shards, pagesize, kwargs, record_filter):
+        """Private Method: Generator behind backfill. Shards are scheduled on a thread pool and their records are
+        released in shard order, so the output stays sorted by date while later shards are still downloading.
+        At most fan_out_workers shards are downloading or waiting to be consumed at once, and the next shard is
+        only scheduled once the caller has taken the records of the oldest one, so a slow consumer slows the
+        downloads instead of letting them pile up in memory."""
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        pending, futures, results, seen = list(shards), {}, {}, set()
+        window = self.fan_out_workers
+        executor = ThreadPoolExecutor(max_workers=window)
         try:
-            options_url = self.__url_call("option_activity")
-            options = requests_retry_session().get(
-                options_url, headers=self.headers, params=params, timeout=10
-            )
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(
-                endpoint=options.url, status_code=options.status_code
-            )
-            if self.log:
-                log.info(statement)
-            self.__check_status(options.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return options.json()
+            while pending:
+                scheduled = set(futures.values()).union(results)
+                for shard in pending:
+                    if len(futures) + len(results) >= window:
+                        break
+                    if shard not in scheduled:
+                        futures[executor.submit(self.__fetch_shard, calendar, shard, pagesize, kwargs)] = shard
+                if pending[0] in results:
+                    yield from merge_records(results.pop(pending.pop(0)), seen, record_filter)
+                    continue
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shard = futures.pop(future)
+                    records, too_dense = future.result()
+                    if too_dense:
+                        index = pending.index(shard)
+                        pending[index:index + 1] = split_shard(shard)
+                    else:
+                        results[shard] = records
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def backfill(self, calendar, date_from, date_to, shard="week", pagesize=1000, stream=False, **kwargs):
+        """Public Method: Backfill a calendar over a large date range. The range is split into day, week or month
+        shards that are fetched concurrently. Shards that fill a whole page are split in half until every shard
+        fits in one page or covers a single day, so busy periods end up with smaller shards than quiet ones.
+        Records are deduplicated by id across shards and returned sorted by date.
+
+        Arguments:
+            Required - calendar (str) - name of a calendar method, e.g. "earnings", "ratings"
+            Required - date_from (str) - "YYYY-MM-DD"
+            Required - date_to (str) - "YYYY-MM-DD"
+            Optional:
+            shard (str) - initial shard size: "day", "week" or "month". Default: "week"
+            pagesize (int) - records per request. Default: 1000
+            stream (bool) - return a generator that yields records in date order as shards complete
+            output (str) - "records" for typed records, or "pandas"/"arrow" for one table (not with stream)
+            the other arguments of the calendar method
+
+        Returns:
+            list (or generator) of calendar records sorted by date"""
+        if calendar not in CALENDAR_KEYS:
+            raise IncorrectParameterEntry(
+                "calendar must be one of %s. You entered %s" % (", ".join(CALENDAR_KEYS), calendar)
+            )
+        importance = kwargs.pop("importance", None)
+        record_filter = None if importance is None else (lambda record: record.get("importance") == importance)
+        output = kwargs.pop("output", None)
+        convert = None
+        if output is not None:
+            convert = record_converter(calendar, output) if stream else records_converter(calendar, output)
+        shards = date_shards(date_from, date_to, shard)
+        records = self.__backfill(calendar, shards, pagesize, kwargs, record_filter)
+        if stream:
+            return records if convert is None else map(convert, records)
+        return list(records) if convert is None else convert(list(records))
 
     def output(self, json_object):
+        import json
         result = json.dumps(json_object, indent=4)
         return result
@@ -0,0 +1,117 @@
+from .records import to_date, to_float, to_int
+
+# Frame formats. pandas and pyarrow are optional dependencies, imported only when a frame is requested.
+FRAMES = ("pandas", "arrow")
+
+
+def flatten(record, prefix=""):
+    """Flatten nested dicts into one level with dotted keys, e.g. {"company": {"cik": 1}} -> {"company.cik": 1}.
+    Lists are kept as they are."""
+    flat = {}
+    for name, value in record.items():
+        if isinstance(value, dict) and value:
+            flat.update(flatten(value, "%s%s." % (prefix, name)))
+        else:
+            flat[prefix + name] = value
+    return flat
+
+
+def numeric_strings(values):
+    """Return the column as floats when every value is a numeric string or None (calendar numbers arrive as
+    strings), or None when it is not numeric. Digits with a leading zero, such as cusips, are codes rather than
+    numbers."""
+    converted, seen = [], False
+    for value in values:
+        if value is None or value == "":
+            converted.append(None)
+            continue
+        if not isinstance(value, str) or (value[0] == "0" and value[1:2].isdigit()):
+            return None
+        try:
+            converted.append(float(value))
+        except ValueError:
+            return None
+        seen = True
+    return converted if seen else None
+
+
+def typed_columns(records, model=None):
+    """Build {column: list of values} from decoded records in one pass per column. Fields of the endpoint's
+    typed record model use its converters and its str fields stay strings, even when they look numeric (ids,
+    tickers such as "0700", cusips with leading zeros). Only string columns the model does not declare become
+    floats when they hold only numbers. Returns the columns and the kind of each column ("int", "float", "date",
+    "str" or None for values left as they are)."""
+    rows = [flatten(record) for record in records]
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    fields = model.FIELDS if model is not None else {}
+    columns, kinds = {}, {}
+    for name in names:
+        values = [row.get(name) for row in rows]
+        convert = fields.get(name)
+        if convert in (to_float, to_int, to_date):
+            typed = []
+            for value in values:
+                try:
+                    typed.append(None if value is None or value == "" else convert(value))
+                except (TypeError, ValueError):
+                    typed.append(None)
+            columns[name] = typed
+            kinds[name] = {to_float: "float", to_int: "int", to_date: "date"}[convert]
+            continue
+        if convert is str:
+            columns[name] = [None if value is None else str(value) for value in values]
+            kinds[name] = "str"
+            continue
+        if convert is not None:
+            columns[name], kinds[name] = values, None
+            continue
+        numbers = numeric_strings(values)
+        if numbers is not None:
+            columns[name], kinds[name] = numbers, "float"
+        else:
+            columns[name], kinds[name] = values, None
+    return columns, kinds
+
+
+def pandas_frame(columns, kinds):
+    import pandas as pd
+    data = {}
+    for name, values in columns.items():
+        kind = kinds[name]
+        if kind == "float":
+            data[name] = pd.array([float("nan") if value is None else value for value in values], dtype="float64")
+        elif kind == "int":
+            data[name] = pd.array(values, dtype="Int64")
+        elif kind == "date":
+            data[name] = pd.to_datetime(values)
+        else:
+            data[name] = values
+    return pd.DataFrame(data)
+
+
+def arrow_table(columns, kinds):
+    import json
+    import pyarrow as pa
+    types = {"float": pa.float64(), "int": pa.int64(), "date": pa.date32(), "str": pa.string()}
+    arrays = {}
+    for name, values in columns.items():
+        try:
+            arrays[name] = pa.array(values, type=types.get(kinds[name]))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Columns mixing types, e.g. a nested list that differs between records, are kept as JSON strings.
+            arrays[name] = pa.array([None if value is None else json.dumps(value) for value in values])
+    return pa.table(arrays)
+
+
+def to_frame(records, output, model=None):
+    """Build a pandas.DataFrame (output="pandas") or a pyarrow.Table (output="arrow") from decoded records,
+    with float, nullable integer and date columns where the values allow it.
+
+    Arguments:
+        records (list) - decoded JSON records
+        output (str) - "pandas" or "arrow"
+        model (records.Record) - typed record model giving the type of each field, if the endpoint has one"""
+    columns, kinds = typed_columns(records, model)
+    if output == "pandas":
+        return pandas_frame(columns, kinds)
+    return arrow_table(columns, kinds)
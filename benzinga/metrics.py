@@ -0,0 +1,161 @@
+import threading
+from bisect import bisect_left
+from urllib.parse import urlsplit
+
+# Upper bounds in seconds of the latency and decode time histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prometheus name, type and help text of every metric.
+METRICS = {
+    "requests": ("benzinga_requests_total", "counter", "Requests answered, by endpoint, host and status code."),
+    "latency": ("benzinga_request_seconds", "histogram",
+                "Request latency in seconds, by phase: ttfb until the response headers, total until the body."),
+    "bytes": ("benzinga_response_bytes_total", "counter", "Bytes of response bodies received."),
+    "decode": ("benzinga_decode_seconds", "histogram", "Time spent decoding JSON response bodies."),
+    "retries": ("benzinga_retries_total", "counter", "Retried attempts, by the session retries or after a 429."),
+    "errors": ("benzinga_errors_total", "counter", "Failed requests, by exception class."),
+    "cache": ("benzinga_cache_requests_total", "counter", "Response cache lookups, by result (hit or miss)."),
+}
+
+
+class Histogram:
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Cumulative counts of every bucket, the last one being +Inf."""
+        total, counts = 0, []
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+def label_text(labels):
+    return ",".join('%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"')) for name, value in labels)
+
+
+class MetricsRegistry:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, callback=None):
+        """Request metrics of a client, per endpoint and host: request counts by status, ttfb and total latency
+        histograms, response bytes, decode time, retries, errors by exception class and response cache hits.
+        Export them with prometheus() or snapshot(), or receive every observation as a dict through callback.
+
+        Arguments:
+            Optional:
+            buckets (tuple) - upper bounds in seconds of the histogram buckets
+            callback (callable) - called with a dict for every request, error and cache lookup"""
+        self.buckets = tuple(sorted(buckets))
+        self.callback = callback
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def __inc(self, metric, labels, value=1):
+        key = (metric, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def __observe(self, metric, labels, value):
+        key = (metric, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def observe(self, endpoint, url, status, total, ttfb=None, size=0, decode=None, retries=0):
+        """Record a request that got a response.
+
+        Arguments:
+            Required - endpoint (str) - name of the public method
+            Required - url (str) - request url, reported by host
+            Required - status (int) - final status code
+            Required - total (float) - seconds from sending the request to having the whole body
+            Optional:
+            ttfb (float) - seconds until the response headers arrived
+            size (int) - bytes of the response body
+            decode (float) - seconds spent decoding the body
+            retries (int) - attempts retried before the final response"""
+        host = urlsplit(url).netloc
+        labels = (("endpoint", endpoint), ("host", host))
+        with self._lock:
+            self.__inc("requests", labels + (("status", status),))
+            self.__observe("latency", labels + (("phase", "total"),), total)
+            if ttfb is not None:
+                self.__observe("latency", labels + (("phase", "ttfb"),), ttfb)
+            self.__inc("bytes", labels, size)
+            if decode is not None:
+                self.__observe("decode", labels, decode)
+            if retries:
+                self.__inc("retries", labels, retries)
+        if self.callback is not None:
+            self.callback({
+                "event": "request", "endpoint": endpoint, "host": host, "status": status, "total": total,
+                "ttfb": ttfb, "bytes": size, "decode": decode, "retries": retries,
+            })
+
+    def observe_error(self, endpoint, url, error, retries=0):
+        """Record a request that failed with error, a benzinga_errors or transport exception."""
+        host = urlsplit(url).netloc
+        labels = (("endpoint", endpoint), ("host", host))
+        name = type(error).__name__
+        with self._lock:
+            self.__inc("errors", labels + (("error", name),))
+            if retries:
+                self.__inc("retries", labels, retries)
+        if self.callback is not None:
+            self.callback({"event": "error", "endpoint": endpoint, "host": host, "error": name, "retries": retries})
+
+    def observe_cache(self, endpoint, hit):
+        """Record a response cache lookup."""
+        with self._lock:
+            self.__inc("cache", (("endpoint", endpoint), ("result", "hit" if hit else "miss")))
+        if self.callback is not None:
+            self.callback({"event": "cache", "endpoint": endpoint, "hit": hit})
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """Return the current values as {metric: {labels: value}}, histograms as {"buckets", "counts", "sum",
+        "count"} with cumulative counts."""
+        with self._lock:
+            result = {metric: {} for metric in METRICS}
+            for (metric, labels), value in self._counters.items():
+                result[metric][labels] = value
+            for (metric, labels), histogram in self._histograms.items():
+                result[metric][labels] = {
+                    "buckets": histogram.buckets, "counts": histogram.cumulative(), "sum": histogram.sum,
+                    "count": histogram.count,
+                }
+        return result
+
+    def prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric, series in self.snapshot().items():
+            name, kind, help_text = METRICS[metric]
+            lines.append("# HELP %s %s" % (name, help_text))
+            lines.append("# TYPE %s %s" % (name, kind))
+            for labels, value in sorted(series.items()):
+                if kind == "counter":
+                    lines.append("%s{%s} %s" % (name, label_text(labels), value))
+                    continue
+                for bound, count in zip(value["buckets"] + ("+Inf",), value["counts"]):
+                    lines.append("%s_bucket{%s} %d" % (name, label_text(labels + (("le", bound),)), count))
+                lines.append("%s_sum{%s} %r" % (name, label_text(labels), value["sum"]))
+                lines.append("%s_count{%s} %d" % (name, label_text(labels), value["count"]))
+        return "\n".join(lines) + "\n"
@@ -1,86 +1,193 @@
-import requests, json
-from .benzinga_errors import (AccessDeniedError, TokenAuthenticationError, URLIncorrectlyFormattedError,
-                              RateLimitError, ServiceUnavailableError, PreconditionFailedError, NotFoundError,
-                              BadRequestError, GatewayTimeoutError)
+import os
+import threading
+import time
+from collections import OrderedDict
+from .benzinga_errors import AccessDeniedError
 from .param_check import Param_Check
-from .config import requests_retry_session
-import structlog
+from .client import BaseClient
+from .endpoints import NEWS_ENDPOINTS
 
-log = structlog.get_logger()
 
+def story_timestamp(value):
+    """Parse a story "created"/"updated" date (RFC 2822, e.g. "Wed, 17 May 2017 14:20:15 -0400") into a unix
+    timestamp. Returns None when the value is missing or malformed."""
+    if not value:
+        return None
+    from email.utils import parsedate_to_datetime
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
 
-class News:
 
-    def __init__(self, api_token, log=True):
-        self.token = api_token
-        self.headers = {'accept': 'application/json'}
-        self.url_dict = {"API V2": "http://api.benzinga.com/api/v2/"}
+def story_key(story):
+    """Deduplication key of a story: its id, or (updated, title) for a story without one, so stories missing an
+    id are not taken for each other."""
+    story_id = story.get("id")
+    if story_id is not None:
+        return story_id
+    return story.get("updated"), story.get("title")
 
-        self.__token_check(self.token)
-        self.param_initiate = Param_Check()
-        self.log = log
 
-    def __token_check(self, api_token):
-        """Private Method: Token check is a private method that does a basic check for whether the api token has
-               access to the fundamentals and/or calendar data. Different tokens have access to different endpoints.
-               Disregard the error if your request is fullfilled but the token authentication error is raised.
+class TokenCache:
+
+    # Digests of the tokens validated by this process, shared by every News client.
+    validated = set()
 
-            Arguments:
-                API Token.
+    def __init__(self, path=None, ttl=86400):
+        """Remembers which api tokens were accepted by the news endpoint, so the token check costs no network time
+        after the first success. Tokens are kept as sha256 digests for the life of the process, and with path
+        also in a JSON file that expires them after ttl seconds, so cold starts of new processes skip it too."""
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
 
-            Returns:
-                Token authentication error if token is invalid."""
-        params = {'token': api_token}
+    @staticmethod
+    def digest(api_token):
+        import hashlib
+        return hashlib.sha256(str(api_token).encode()).hexdigest()
+
+    def __load(self):
+        import json
         try:
-            sample_url = self.__url_call("news")
-            sample = requests_retry_session().get(sample_url, headers=self.headers, params=params, timeout=10)
-            if sample.status_code == 401:
-                raise TokenAuthenticationError
-        except TokenAuthenticationError as t:
+            with open(self.path) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def is_valid(self, api_token):
+        digest = self.digest(api_token)
+        if digest in self.validated:
+            return True
+        if self.path is not None and self.__load().get(digest, 0) > time.time():
+            self.validated.add(digest)
+            return True
+        return False
+
+    def add(self, api_token):
+        digest = self.digest(api_token)
+        if digest in self.validated:
+            return
+        self.validated.add(digest)
+        if self.path is None:
+            return
+        import json
+        import tempfile
+        with self._lock:
+            now = time.time()
+            tokens = {key: expires for key, expires in self.__load().items() if expires > now}
+            tokens[digest] = now + self.ttl
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                json.dump(tokens, fh)
+            os.replace(tmp_path, self.path)
+
+
+class NewsCursor:
+
+    def __init__(self, updated_since=None, pagesize=100, min_interval=1.0, max_interval=30.0,
+                 backoff=1.5, seen_size=10000, on_lag=None):
+        """Polling state of News.stream. The cursor is the latest "updated" timestamp delivered, stories are
+        deduplicated by story_key with a bounded seen-set, and the polling interval shrinks while stories are flowing
+        and grows while the feed is quiet."""
+        self.updated_since = int(time.time()) if updated_since is None else int(updated_since)
+        self.page = 0
+        self.pagesize = pagesize
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.seen_size = seen_size
+        self.on_lag = on_lag
+        self._seen = OrderedDict()
+
+    def params(self):
+        return {"updated_since": str(self.updated_since), "page": self.page, "pagesize": self.pagesize}
+
+    def advance(self, stories):
+        """Take one polled page and return the stories not delivered yet, plus the delay before the next poll."""
+        stories = stories if isinstance(stories, list) else []
+        new_stories, latest = [], self.updated_since
+        for story in stories:
+            key = story_key(story)
+            updated = story_timestamp(story.get("updated"))
+            if updated is not None:
+                latest = max(latest, int(updated))
+            if key in self._seen:
+                continue
+            self._seen[key] = None
+            if len(self._seen) > self.seen_size:
+                self._seen.popitem(last=False)
+            new_stories.append(story)
+            if self.on_lag is not None:
+                created = story_timestamp(story.get("created"))
+                if created is not None:
+                    self.on_lag(story, time.time() - created)
+        full_page = len(stories) >= self.pagesize
+        if latest > self.updated_since:
+            self.updated_since, self.page = latest, 0
+        elif full_page:
+            self.page += 1
+        else:
+            self.page = 0
+        if full_page:
+            return new_stories, 0
+        if new_stories:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return new_stories, self.interval
+
+
+class News(BaseClient):
+
+    endpoints = NEWS_ENDPOINTS
+
+    def __init__(self, api_token, log=True, token_cache=None, token_ttl=86400, **client_options):
+        """The api token is not checked when the client is created. It is validated by the first response, or
+        explicitly with validate(), and a positive result is remembered for the life of the process.
+
+        Arguments:
+            Required - api_token (str)
+            Optional:
+            log (bool) - log the status code and endpoint of every call
+            token_cache (str) - JSON file remembering validated tokens across processes
+            token_ttl (int) - seconds a validated token is remembered in token_cache. Default: 86400
+            the BaseClient options, e.g. pool_maxsize, cache, rate_limiter"""
+        super().__init__(api_token, log=log, **client_options)
+        self.url_dict = {"API V2": "http://api.benzinga.com/api/v2/"}
+        self.token_cache = TokenCache(token_cache, token_ttl)
+        self.param_initiate = Param_Check()
+        self._validate_lock = threading.Lock()
+
+    @property
+    def token_validated(self):
+        return self.token_cache.is_valid(self.token)
+
+    def _check_status(self, status_code):
+        """Private Method: Status check that also validates the token lazily. A 401 before the token was ever
+        accepted raises AccessDeniedError, and the first successful response marks the token as valid."""
+        if status_code == 401 and not self.token_validated:
             raise AccessDeniedError
+        super()._check_status(status_code)
+        if status_code < 400:
+            self.token_cache.add(self.token)
 
-    def __url_call(self, resource, sub_resource=""):
-        """Private Method: URL Call is used to take input from the public methods and return the appropriate url format
-                for the endpoint. For example, the resource is calendar and the subresource might be ratings. The correct
-                url endpoint call is created by using these two.
-
-            Arguments:
-                Resource and Sub- Resource
-
-            Returns:
-                url for the endpoint call"""
-        endpoint_type = {
-            "news": "%s%s/%s" % (self.url_dict["API V2"], resource, sub_resource),
-            "news-top-stories": "%s%s/%s" % (self.url_dict["API V2"], resource, sub_resource),
-            "channels": "%s%s/%s" % (self.url_dict["API V2"], resource, sub_resource),
-            "newsquantified": "%s%s/%s" % (self.url_dict["API V2"], resource, sub_resource)
-        }
-        if resource not in endpoint_type:
-            raise URLIncorrectlyFormattedError
-        url_string = endpoint_type[resource]
-        return url_string
-
-    def __check_status(self, status_code):
-        if status_code == 400:
-            raise BadRequestError
-        if status_code == 401:
-            raise TokenAuthenticationError
-        elif status_code == 403:
-            raise TokenAuthenticationError
-        elif status_code == 404:
-            raise NotFoundError
-        elif status_code == 412:
-            raise PreconditionFailedError
-        elif status_code == 429:
-            raise RateLimitError
-        elif status_code == 500:
-            raise ServiceUnavailableError
-        elif status_code == 502:
-            raise ServiceUnavailableError
-        elif status_code == 503:
-            raise ServiceUnavailableError
-        elif status_code == 504:
-            raise GatewayTimeoutError
+    def validate(self):
+        """Public Method: Check the api token against the news endpoint, unless it was already validated in this
+        process or within token_ttl in the token_cache file.
+
+        Returns:
+            True, or raises AccessDeniedError if the token is invalid"""
+        if self.token_validated:
+            return True
+        # Concurrent first calls wait for the one check in flight instead of each sending their own.
+        with self._validate_lock:
+            if self.token_validated:
+                return True
+            params = {"token": self.token, "pageSize": 1}
+            return self._request("validate", self._url("news"), params, transform=lambda result: True)
 
     def news(self, pagesize=None, page=None, display_output=None, base_date=None,
              date_from=None, date_to=None, last_id=None, updated_since=None,
@@ -120,15 +227,103 @@ class News:
             "tickers": company_tickers,
             "channels": channel
         }
-        self.param_initiate.news_check(params)
-        try:
-            news_url = self.__url_call("news")
-            news = requests_retry_session().get(news_url, headers=self.headers, params=params, timeout=10)
-            statement = "Status Code: {status_code} Endpoint: {endpoint}".format(endpoint=news.url,
-                                                                                 status_code=news.status_code)
-            if self.log:
-                log.info(statement)
-            self.__check_status(news.status_code)
-        except requests.exceptions.RequestException as err:
-            self.__check_status(err.response.status_code)
-        return news.json()
+        return self._call("news", params)
+
+    def top_news(self, type=None, channel=None, limit=None, display_output=None):
+        """Public Method: Benzinga Top News
+
+        Arguments:
+            Optional:
+            type (str) - The type of content to select
+            channel (str) - multiple channels separated by comma.
+            limit (int) - max period
+            display_output (str) - select from (full, abstract, headline)
+
+        Returns:
+            Author, created, updated, title, teaser, body, url, image, channels, stocks, tags
+        """
+        params = {
+            "token": self.token,
+            "type": type,
+            "channel": channel,
+            "limit": limit,
+            "displayOutput": display_output
+        }
+        return self._call("top_news", params)
+
+    def channels(self, pagesize=None, page=None):
+        """Public Method: Benzinga Channels lists the channel names and ids used to filter news().
+
+        Arguments:
+            Optional:
+            pagesize (int) - default is 15
+            page (int) - default is 0
+
+        Returns:
+            Channel name, channel id.
+        """
+        params = {
+            "token": self.token,
+            "pageSize": pagesize,
+            "page": page,
+        }
+        return self._call("channels", params)
+
+    def quantified_news(self, pagesize=None, page=None, base_date=None, date_from=None, date_to=None,
+                        updated_since=None, company_tickers=None):
+        """Public Method: Benzinga Quantified News
+
+        Arguments:
+            Optional:
+            pagesize (int) - default is 15
+            page (int) - default is 0
+            base_date (str) - "YYYY-MM-DD" The date to query for calendar data. Shorthand for date_from and date_to if
+            they are the same. Defaults for latest.
+            date_from (str) - "YYYY-MM-DD"
+            date_to (str) - "YYYY-MM-DD"
+            updated_since (int) - he last updated unix timestamp (UTC) to pull and sort by.
+            company_tickers (str)
+
+        Returns:
+            multiple attributes like headlines, volume, day open, open gap, range etc.
+        """
+        params = {
+            "token": self.token,
+            "pagesize": pagesize,
+            "page": page,
+            "date": base_date,
+            "date_from": date_from,
+            "date_to": date_to,
+            "updated_since": updated_since,
+            "symbols": company_tickers
+        }
+        return self._call("quantified_news", params)
+
+    def stream(self, company_tickers=None, channel=None, display_output=None, updated_since=None,
+               pagesize=100, min_interval=1.0, max_interval=30.0, seen_size=10000, on_lag=None):
+        """Public Method: Poll the news feed and yield every new story exactly once. The cursor follows the
+        latest updated timestamp seen, full pages are followed up immediately, and the polling interval adapts
+        between min_interval while stories are flowing and max_interval while the feed is quiet.
+
+        Arguments:
+            Optional:
+            company_tickers (str)
+            channel (str) - multiple channels separated by comma.
+            display_output (str) - select from (full, abstract, headline)
+            updated_since (int) - unix timestamp (UTC) to start from. Default: now
+            pagesize (int) - stories per poll. Default: 100
+            min_interval (float) - seconds between polls while stories are flowing. Default: 1
+            max_interval (float) - seconds between polls while the feed is quiet. Default: 30
+            seen_size (int) - number of story ids remembered for deduplication. Default: 10000
+            on_lag (callable) - called as on_lag(story, seconds) with the delay from publish time to delivery
+
+        Returns:
+            a generator of stories"""
+        cursor = NewsCursor(updated_since, pagesize, min_interval, max_interval, seen_size=seen_size, on_lag=on_lag)
+        while True:
+            stories = self.news(display_output=display_output, company_tickers=company_tickers, channel=channel,
+                                **cursor.params())
+            new_stories, delay = cursor.advance(stories)
+            yield from new_stories
+            if delay:
+                time.sleep(delay)
@@ -0,0 +1,58 @@
+from .benzinga_errors import IncorrectParameterEntry
+from .candles import candle_arrays
+from .client import page_records
+from .frames import FRAMES, to_frame
+from .records import MODELS
+
+# Output modes of the calendar and fundamentals methods, besides the decoded JSON returned by default.
+OUTPUTS = ("records",) + FRAMES
+
+
+def check_output(name, output):
+    if output not in OUTPUTS:
+        raise IncorrectParameterEntry("output must be one of %s. You entered %s" % (", ".join(OUTPUTS), output))
+    if output == "records" and name not in MODELS:
+        raise IncorrectParameterEntry(
+            "output='records' is available for %s. You requested it for %s" % (", ".join(MODELS), name)
+        )
+
+
+def record_converter(name, output):
+    """Return the function converting one decoded record of endpoint name, for outputs that work record by
+    record (iterators and streams). Only "records" does."""
+    check_output(name, output)
+    if output != "records":
+        raise IncorrectParameterEntry(
+            "output=%r builds a whole table and is not available record by record. Collect the records first"
+            % output
+        )
+    return MODELS[name].from_dict
+
+
+def records_converter(name, output):
+    """Return the function converting a list of decoded records of endpoint name into the requested output: a
+    list of typed records, a pandas.DataFrame or a pyarrow.Table."""
+    check_output(name, output)
+    if output == "records":
+        from_dict = MODELS[name].from_dict
+        return lambda records: [from_dict(record) for record in records]
+    model = MODELS.get(name)
+    return lambda records: to_frame(records, output, model)
+
+
+def response_converter(name, key, output):
+    """Return the function converting a decoded response of endpoint name, whose records are held under key,
+    into the requested output."""
+    convert = records_converter(name, output)
+    return lambda response: convert(page_records(response, key))
+
+
+def candles_converter(name, output, symbols):
+    """Return the function converting a decoded bars, chart or price_history response into the requested
+    output. Only "numpy" is available: {symbol: {"time", "open", "high", "low", "close", "volume"}} arrays."""
+    if output != "numpy":
+        raise IncorrectParameterEntry("output must be numpy for %s. You entered %s" % (name, output))
+    if isinstance(symbols, str):
+        symbols = symbols.split(",")
+    symbols = tuple(symbol.strip() for symbol in symbols)
+    return lambda response: candle_arrays(response, symbols)
@@ -1,196 +1,254 @@
+import datetime as dt
+import numbers
 from .benzinga_errors import IncorrectParameterEntry
-class Param_Check:
 
-    def __init__(self):
-        self.stri = "str"
-        self.inte = "int"
-        self.nonetype = "NoneType"
-        self.float = "float"
-
-    def __para_type_matching(self, param_metadata, para_dict):
-        for param, value in para_dict.items():
-            if (type(value).__name__ != param_metadata[param]) and (
-                type(value).__name__ != self.nonetype
-            ):
-                raise IncorrectParameterEntry(
-                    "Parameter Type for %s doesn't match: Correct Type: %s. "
-                    "You entered %s"
-                    % (param, param_metadata[param], type(value).__name__)
-                )
+
+class ParamType:
+
+    __slots__ = ("label", "exact", "coercions")
+
+    def __init__(self, label, exact, coercions=()):
+        """Type of a query parameter. Values of the exact types are accepted as they are, values that are an
+        instance of one of the coercions' types are converted, and anything else is rejected.
+
+        Arguments:
+            label (str) - type name used in error messages
+            exact (tuple) - types accepted unchanged
+            coercions (tuple) - (type, convert) pairs tried in order"""
+        self.label = label
+        self.exact = exact
+        self.coercions = coercions
+
+    def coerce(self, name, value):
+        if not isinstance(value, bool):
+            for value_type, convert in self.coercions:
+                if isinstance(value, value_type):
+                    return convert(value)
+        raise IncorrectParameterEntry(
+            "Parameter Type for %s doesn't match: Correct Type: %s. "
+            "You entered %s"
+            % (name, self.label, type(value).__name__)
+        )
+
+
+def date_string(value):
+    return value.strftime("%Y-%m-%d")
+
+
+# numpy and pandas scalars register with the numbers ABCs, so numpy.int64 passes as an int, and dates (including
+# datetime and pandas.Timestamp) are sent as "YYYY-MM-DD".
+STR = ParamType("str", (str,), ((str, str), (dt.date, date_string)))
+INT = ParamType("int", (int,), ((numbers.Integral, int),))
+FLOAT = ParamType("float", (float,), ((numbers.Real, float),))
+SYMBOLS = ParamType("str or list or tuple", (str, list, tuple), ((str, str), (list, list), (tuple, tuple)))
+
+# Query parameter types of every check, by check name.
+SCHEMAS = {
+    "calendar_check": {
+        "token": STR,
+        "fields": STR,
+        "page": INT,
+        "pagesize": INT,
+        "parameters[date]": STR,
+        "parameters[date_from]": STR,
+        "parameters[date_to]": STR,
+        "parameters[tickers]": STR,
+        "parameters[importance]": INT,
+        "parameters[date_sort]": STR,
+        "parameters[updated]": INT,
+        "paramaters[dividend_yield_operation]": STR,
+        "parameters[dividend_yield]": FLOAT,
+        "parameters[action]": STR,
+        "country": STR,
+        "parameters[eps_surprise_percent]": STR,
+        "parameters[revenue_surprise_percent]": STR,
+    },
+    "fundamentals_check": {
+        "apikey": STR,
+        "symbols": SYMBOLS,
+        "symbol": STR,
+        "isin": STR,
+        "cik": STR,
+        "asOf": STR,
+        "period": STR,
+        "reportType": STR,
+        "token": STR,
+    },
+    "delayed_quote_check": {
+        "token": STR,
+        "symbols": STR,
+        "isin": STR,
+        "cik": STR,
+    },
+    "logos_check": {
+        "token": STR,
+        "symbols": STR,
+        "filters": STR,
+    },
+    "instruments_check": {
+        "apikey": STR,
+        "fields": STR,
+        "query": STR,
+        "to": STR,
+        "from": STR,
+        "asOf": STR,
+        "sortfield": STR,
+        "sortdir": STR,
+    },
+    "security_check": {
+        "apikey": STR,
+        "symbol": STR,
+        "cusip": STR,
+    },
+    "bars_check": {
+        "token": STR,
+        "symbols": STR,
+        "from": STR,
+        "to": STR,
+        "interval": STR,
+    },
+    "charts_check": {
+        "apikey": STR,
+        "symbol": STR,
+        "from": STR,
+        "to": STR,
+        "interval": STR,
+        "session": STR,
+    },
+    "ticker_check": {
+        "apikey": STR,
+        "symbols": STR,
+    },
+    "autocomplete_check": {
+        "apikey": STR,
+        "query": STR,
+        "limit": INT,
+        "searchMethod": STR,
+        "exchanges": STR,
+        "types": STR,
+    },
+    "batchhistory_check": {
+        "apikey": STR,
+        "symbol": STR,
+    },
+    "news_check": {
+        "token": STR,
+        "pageSize": INT,
+        "page": INT,
+        "displayOutput": STR,
+        "date": STR,
+        "dateFrom": STR,
+        "dateTo": STR,
+        "lastId": STR,
+        "updatedSince": STR,
+        "publishedSince": STR,
+        "tickers": STR,
+        "channels": STR,
+        "type": STR,
+        "limit": INT,
+        "channel": STR,
+    },
+    "quantified_news_check": {
+        "token": STR,
+        "pagesize": INT,
+        "page": INT,
+        "date": STR,
+        "date_from": STR,
+        "date_to": STR,
+        "updated_since": INT,
+        "symbols": STR,
+        "apikey": STR,
+    },
+    "movers_check": {
+        "apikey": STR,
+        "from": STR,
+        "to": STR,
+        "session": STR,
+        "maxResults": STR,
+        "screenerQuery": STR,
+    },
+    "options_check": {
+        "token": STR,
+        "fields": STR,
+        "page": INT,
+        "pagesize": INT,
+        "parameters[date]": STR,
+        "parameters[date_from]": STR,
+        "parameters[date_to]": STR,
+        "parameters[tickers]": STR,
+        "parameters[updated]": INT,
+    },
+}
+
+
+def compile_validator(schema):
+    """Build the validator of a schema once. The validator checks a params dict in place: None values are
+    skipped, values of the exact type pass with a single type lookup, and other values are coerced or
+    rejected with IncorrectParameterEntry."""
+    rules = {name: (param_type.exact, param_type) for name, param_type in schema.items()}
+
+    def validate(params):
+        for name, value in params.items():
+            if value is None:
+                continue
+            rule = rules.get(name)
+            if rule is None:
+                raise IncorrectParameterEntry("Unknown parameter %s" % name)
+            if type(value) not in rule[0]:
+                params[name] = rule[1].coerce(name, value)
+        return params
+
+    return validate
+
+
+VALIDATORS = {check: compile_validator(schema) for check, schema in SCHEMAS.items()}
+
+
+class Param_Check:
+    """Parameter checks by name. Each check runs the compiled validator of its schema and returns the params,
+    with numeric and date values coerced."""
 
     def calendar_check(self, dict):
-        param_type = {
-            'token': self.stri,
-            "page": self.inte ,
-            "pagesize": self.inte,
-            "parameters[date]": self.stri,
-            "parameters[date_from]": self.stri,
-            "parameters[date_to]": self.stri,
-            "parameters[tickers]": self.stri,
-            "parameters[importance]": self.inte,
-            "parameters[date_sort]": self.stri,
-            "parameters[updated]": self.inte,
-            "paramaters[dividend_yield_operation]": self.stri,
-            "parameters[dividend_yield]": self.float,
-            "parameters[action]": self.stri,
-            "country": self.stri,
-            "parameters[eps_surprise_percent]": self.stri,
-            "parameters[revenue_surprise_percent]": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["calendar_check"](dict)
 
     def fundamentals_check(self, dict):
-        param_type = {
-            'apikey': self.stri,
-            "symbols": self.stri,
-            "symbol": self.stri,
-            "isin": self.stri,
-            "cik": self.stri,
-            "asOf": self.stri,
-            "period": self.stri,
-            "reportType": self.stri,
-            "token": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["fundamentals_check"](dict)
 
     def delayed_quote_check(self, dict):
-        param_type = {
-            'token': self.stri,
-            "symbols": self.stri,
-            "isin": self.stri,
-            "cik": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["delayed_quote_check"](dict)
 
     def logos_check(self, dict):
-        param_type = {
-            'token': self.stri,
-            "symbols": self.stri,
-            "filters": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["logos_check"](dict)
 
     def instruments_check(self, dict):
-        param_type = {
-            "apikey": self.stri,
-            "fields": self.stri,
-            "query": self.stri,
-            "to": self.stri,
-            "from": self.stri,
-            "asOf": self.stri,
-            "sortfield": self.stri,
-            "sortdir": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["instruments_check"](dict)
 
     def security_check(self, dict):
-        param_type = {
-            "apikey": self.stri,
-            "symbol": self.stri,
-            "cusip": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["security_check"](dict)
 
     def bars_check(self, dict):
-        param_type = {
-            "token": self.stri,
-            "symbols": self.stri,
-            "from": self.stri,
-            "to": self.stri,
-            "interval": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["bars_check"](dict)
 
     def charts_check(self, dict):
-        param_type = {
-            "apikey": self.stri,
-            "symbol": self.stri,
-            "from": self.stri,
-            "to": self.stri,
-            "interval": self.stri,
-            "session": self.stri,
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["charts_check"](dict)
 
     def ticker_check(self, dict):
-        param_type = {
-            "apikey": self.stri,
-            "symbols": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["ticker_check"](dict)
 
     def autocomplete_check(self, dict):
-        param_type = {
-            "token": self.stri,
-            "query": self.stri,
-            "limit": self.inte,
-            "searchMethod": self.stri,
-            "exchanges": self.stri,
-            "types": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["autocomplete_check"](dict)
 
     def batchhistory_check(self, dict):
-        param_type = {
-            "apikey": self.stri,
-            "symbol": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["batchhistory_check"](dict)
 
     def news_check(self, dict):
-        param_type = {
-            "token": self.stri,
-            "pageSize": self.inte,
-            "page": self.inte,
-            "displayOutput": self.stri,
-            "date": self.stri,
-            "dateFrom": self.stri,
-            "dateTo": self.stri,
-            "lastId": self.stri,
-            "updatedSince": self.stri,
-            "publishedSince": self.stri,
-            "tickers": self.stri,
-            "channels": self.stri,
-            "type": self.stri,
-            "limit": self.inte,
-            "channel": self.stri
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["news_check"](dict)
 
     def quantified_news_check(self, dict):
-        param_type = {
-            "token": self.stri,
-            "pagesize": self.inte,
-            "page": self.inte,
-            "date": self.stri,
-            "date_from": self.stri,
-            "date_to": self.stri,
-            "updated_since": self.inte,
-            "symbols": self.stri,
-            "apikey": self.stri,
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["quantified_news_check"](dict)
 
     def movers_check(self, dict):
-        param_type = {
-            "apikey": self.stri,
-            "from": self.stri,
-            "to": self.stri,
-            "session": self.stri,
-            "maxResults": self.stri,
-            "screenerQuery": self.stri,
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["movers_check"](dict)
 
     def options_check(self, dict):
-        param_type = {
-            "token": self.stri,
-            "page": self.inte,
-            "pagesize": self.inte,
-            "parameters[date]": self.stri,
-            "parameters[date_from]": self.stri,
-            "parameters[date_to]": self.stri,
-            "parameters[tickers]": self.stri,
-            "parameters[updated]": self.inte
-        }
-        self.__para_type_matching(param_type, dict)
+        return VALIDATORS["options_check"](dict)
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def retry_after_seconds(value, default=0.0):
+    """Parse a Retry-After header, given either in seconds or as an HTTP date. Returns default when the header
+    is missing or malformed."""
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+def reserve_token(tokens, updated, now, rate, burst):
+    """Token bucket step shared by the buckets. Refills the bucket up to now, takes one token (the balance may
+    go negative, reserving a future token) and returns the new (tokens, updated) state and the seconds to wait
+    before sending. An updated time in the future means the bucket is paused until then."""
+    tokens = min(float(burst), tokens + max(0.0, now - updated) * rate)
+    updated = max(now, updated)
+    tokens -= 1
+    delay = (updated - now) + (-tokens / rate if tokens < 0 else 0.0)
+    return tokens, updated, delay
+
+
+class TokenBucket:
+
+    def __init__(self, rate, burst):
+        """Token bucket shared by all threads of a process: up to burst requests can be sent at once, then rate
+        requests per second."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return the seconds to wait before sending the request."""
+        with self._lock:
+            self._tokens, self._updated, delay = reserve_token(
+                self._tokens, self._updated, time.monotonic(), self.rate, self.burst
+            )
+        return delay
+
+    def pause(self, seconds):
+        """Stop handing out tokens for the given number of seconds, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, time.monotonic() + seconds)
+
+
+class FileTokenBucket:
+
+    def __init__(self, path, rate, burst):
+        """Token bucket whose state is kept in a file and locked with flock, so it is shared by every process on
+        the host that uses the same path. Not available on Windows, where it raises OSError."""
+        if fcntl is None:
+            raise OSError("FileTokenBucket needs fcntl, which is not available on this platform")
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+
+    def __update(self, step):
+        with self._lock, open(self.path, "a+") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                fh.seek(0)
+                content = fh.read()
+                now = time.time()
+                state = json.loads(content) if content else {"tokens": float(self.burst), "updated": now}
+                tokens, updated, result = step(state["tokens"], state["updated"], now)
+                fh.seek(0)
+                fh.truncate()
+                fh.write(json.dumps({"tokens": tokens, "updated": updated}))
+                fh.flush()
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+        return result
+
+    def reserve(self):
+        return self.__update(lambda tokens, updated, now: reserve_token(tokens, updated, now, self.rate, self.burst))
+
+    def pause(self, seconds):
+        self.__update(lambda tokens, updated, now: (min(tokens, 0.0), max(updated, now + seconds), None))
+
+
+class RateLimiter:
+
+    def __init__(self, rate=10.0, burst=20, per_host=None, path=None):
+        """Client-side rate limiter with one token bucket per host. Requests are paced before they are sent
+        instead of reacting to 429 responses, and a 429 with Retry-After pauses the host for every thread (and,
+        with path, every process) sharing the limiter.
+
+        Arguments:
+            Optional:
+            rate (float) - requests per second per host. Default: 10
+            burst (int) - requests that can be sent at once per host. Default: 20
+            per_host (dict) - {host: (rate, burst)} overrides for specific hosts
+            path (str) - directory for bucket state files shared by all processes on the host"""
+        self.rate = rate
+        self.burst = burst
+        self.per_host = per_host or {}
+        self.path = path
+        self._buckets = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.per_host.get(host, (self.rate, self.burst))
+                if self.path is None:
+                    bucket = TokenBucket(rate, burst)
+                else:
+                    bucket = FileTokenBucket(os.path.join(self.path, "%s.bucket" % host.replace(":", "_")), rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def reserve(self, host):
+        """Take a token for host and return the seconds to wait before sending."""
+        return self.bucket(host).reserve()
+
+    def pause(self, host, seconds):
+        """Pause host for the given number of seconds."""
+        self.bucket(host).pause(seconds)
@@ -0,0 +1,183 @@
+import datetime as dt
+
+
+def to_float(value):
+    return float(value)
+
+
+def to_int(value):
+    return int(float(value)) if isinstance(value, str) else int(value)
+
+
+def to_date(value):
+    return dt.date.fromisoformat(value[:10])
+
+
+def to_time(value):
+    return dt.time.fromisoformat(value)
+
+
+class Record:
+    """Base of the typed calendar records. Subclasses declare FIELDS, an ordered {field: converter} dict, and use
+    it as their __slots__, so a record holds no per-instance dict and its numbers and dates are parsed once.
+    Empty and unparsable values become None."""
+
+    __slots__ = ()
+    FIELDS = {}
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls.__new__(cls)
+        for name, convert in cls.FIELDS.items():
+            value = data.get(name)
+            if value is None or value == "":
+                value = None
+            elif convert is not str:
+                try:
+                    value = convert(value)
+                except (TypeError, ValueError):
+                    value = None
+            setattr(record, name, value)
+        return record
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return "%s(%s)" % (
+            type(self).__name__,
+            ", ".join("%s=%r" % (name, getattr(self, name)) for name in self.FIELDS if getattr(self, name) is not None)
+        )
+
+
+class Rating(Record):
+
+    FIELDS = {
+        "id": str,
+        "date": to_date,
+        "time": to_time,
+        "ticker": str,
+        "exchange": str,
+        "name": str,
+        "currency": str,
+        "action_pt": str,
+        "action_company": str,
+        "rating_current": str,
+        "pt_current": to_float,
+        "rating_prior": str,
+        "pt_prior": to_float,
+        "analyst": str,
+        "analyst_name": str,
+        "importance": to_int,
+        "notes": str,
+        "url": str,
+        "url_calendar": str,
+        "url_news": str,
+        "updated": to_int,
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class Earning(Record):
+
+    FIELDS = {
+        "id": str,
+        "date": to_date,
+        "date_confirmed": to_int,
+        "time": to_time,
+        "ticker": str,
+        "exchange": str,
+        "name": str,
+        "currency": str,
+        "period": str,
+        "period_year": to_int,
+        "eps_type": str,
+        "eps": to_float,
+        "eps_est": to_float,
+        "eps_prior": to_float,
+        "eps_surprise": to_float,
+        "eps_surprise_percent": to_float,
+        "revenue_type": str,
+        "revenue": to_float,
+        "revenue_est": to_float,
+        "revenue_prior": to_float,
+        "revenue_surprise": to_float,
+        "revenue_surprise_percent": to_float,
+        "importance": to_int,
+        "notes": str,
+        "updated": to_int,
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class Dividend(Record):
+
+    FIELDS = {
+        "id": str,
+        "date": to_date,
+        "ticker": str,
+        "exchange": str,
+        "name": str,
+        "currency": str,
+        "frequency": to_int,
+        "dividend": to_float,
+        "dividend_prior": to_float,
+        "dividend_type": str,
+        "dividend_yield": to_float,
+        "ex_dividend_date": to_date,
+        "payable_date": to_date,
+        "record_date": to_date,
+        "importance": to_int,
+        "notes": str,
+        "updated": to_int,
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class OptionActivity(Record):
+
+    FIELDS = {
+        "id": str,
+        "date": to_date,
+        "time": to_time,
+        "ticker": str,
+        "exchange": str,
+        "description": str,
+        "sentiment": str,
+        "aggressor_ind": to_float,
+        "option_symbol": str,
+        "option_activity_type": str,
+        "put_call": str,
+        "date_expiration": to_date,
+        "strike_price": to_float,
+        "price": to_float,
+        "size": to_int,
+        "bid": to_float,
+        "ask": to_float,
+        "midpoint": to_float,
+        "cost_basis": to_float,
+        "volume": to_int,
+        "open_interest": to_int,
+        "trade_count": to_int,
+        "underlying_price": to_float,
+        "underlying_type": str,
+        "execution_estimate": str,
+        "updated": to_int,
+    }
+    __slots__ = tuple(FIELDS)
+
+
+# Typed record model of each calendar method that has one.
+MODELS = {
+    "ratings": Rating,
+    "earnings": Earning,
+    "dividends": Dividend,
+    "options_activity": OptionActivity,
+}
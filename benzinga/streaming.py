@@ -0,0 +1,107 @@
+import codecs
+import json
+
+# Bytes read from the response body at a time when streaming records.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = " \t\n\r"
+
+# Characters that may follow a value, and characters that may continue a number cut at the end of a chunk.
+DELIMITERS = WHITESPACE + ",]}"
+NUMBER_CHARS = "0123456789.eE+-"
+
+
+class RecordParser:
+
+    def __init__(self, key=None):
+        """Incremental parser yielding the records of a JSON response while its body arrives. The records are the
+        elements of a top-level array, or of the array held under key in a top-level object (the first array
+        value when key is None), as read by client.page_records. Only the record being parsed is buffered, so
+        memory does not grow with the size of the response. Other values of the top-level object are skipped.
+
+        Arguments:
+            key (str) - response key holding the records"""
+        self.key = key
+        self.state = "start"
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+        self.text = codecs.getincrementaldecoder("utf-8")()
+
+    def feed(self, data):
+        """Parse the next chunk of the body and return the records it completed."""
+        if self.state == "done":
+            return []
+        self.buffer = self.buffer[self.pos:] + self.text.decode(data)
+        self.pos = 0
+        records = []
+        while self.state != "done" and self.__step(records):
+            pass
+        return records
+
+    def close(self):
+        """Check that the body ended after the records. Raises json.JSONDecodeError on a truncated body."""
+        self.text.decode(b"", final=True)
+        if self.state not in ("start", "done"):
+            raise json.JSONDecodeError("Truncated JSON response", self.buffer, self.pos)
+
+    def __skip(self, pos, separators=""):
+        buffer = self.buffer
+        while pos < len(buffer) and (buffer[pos] in WHITESPACE or buffer[pos] in separators):
+            pos += 1
+        return pos
+
+    def __value(self, pos):
+        """Decode the value starting at pos, or return None while it is incomplete. A value is only accepted once
+        a delimiter follows it, so a number cut at the end of a chunk ("12." or "1e") is not taken for a whole
+        one; the body always goes on with a delimiter after a record, as the records sit in an array."""
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, pos)
+        except json.JSONDecodeError:
+            return None
+        if end >= len(self.buffer):
+            return None
+        following = self.buffer[end]
+        if following not in DELIMITERS:
+            if following in NUMBER_CHARS and isinstance(value, (int, float)) and not isinstance(value, bool):
+                return None
+            raise json.JSONDecodeError("Expecting ',' delimiter", self.buffer, end)
+        return value, end
+
+    def __step(self, records):
+        """Advance over one token of the body, returning False when more bytes are needed."""
+        pos = self.__skip(self.pos, "," if self.state != "start" else "")
+        if pos >= len(self.buffer):
+            return False
+        char = self.buffer[pos]
+        if self.state == "start":
+            self.pos, self.state = pos + 1, {"[": "array", "{": "object"}.get(char, "done")
+            return True
+        if self.state == "array":
+            if char == "]":
+                self.pos, self.state = pos + 1, "done"
+                return True
+            decoded = self.__value(pos)
+            if decoded is None:
+                return False
+            records.append(decoded[0])
+            self.pos = decoded[1]
+            return True
+        if char == "}":
+            self.pos, self.state = pos + 1, "done"
+            return True
+        try:
+            name, pos = json.decoder.scanstring(self.buffer, pos + 1)
+        except json.JSONDecodeError:
+            return False
+        pos = self.__skip(pos, ":")
+        if pos >= len(self.buffer):
+            return False
+        if self.buffer[pos] == "[" and (self.key is None or name == self.key):
+            self.pos, self.state = pos + 1, "array"
+            return True
+        decoded = self.__value(pos)
+        if decoded is None:
+            return False
+        self.pos = decoded[1]
+        return True
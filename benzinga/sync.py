@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from .benzinga_errors import IncorrectParameterEntry
+from .financial_data import CALENDAR_KEYS
+
+
+class MemoryWatermarkStore:
+    """Watermark store kept in memory, for the life of the process. Other stores implement the same get/set."""
+
+    def __init__(self):
+        self._watermarks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._watermarks.get(key)
+
+    def set(self, key, watermark):
+        with self._lock:
+            self._watermarks[key] = watermark
+
+
+class JSONWatermarkStore(MemoryWatermarkStore):
+    """Watermark store persisted to a JSON file. The file is rewritten atomically on every update."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path) as fh:
+                self._watermarks = json.load(fh)
+
+    def set(self, key, watermark):
+        with self._lock:
+            self._watermarks[key] = watermark
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                json.dump(self._watermarks, fh)
+            os.replace(tmp_path, self.path)
+
+
+class SQLiteWatermarkStore:
+    """Watermark store persisted to a SQLite database, safe to share between processes."""
+
+    def __init__(self, path):
+        self.path = path
+        with self.__connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS watermarks (key TEXT PRIMARY KEY, watermark TEXT NOT NULL)")
+
+    def __connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        with self.__connect() as conn:
+            row = conn.execute("SELECT watermark FROM watermarks WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key, watermark):
+        with self.__connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO watermarks (key, watermark) VALUES (?, ?)", (key, json.dumps(watermark))
+            )
+
+
+class CalendarSync:
+
+    def __init__(self, client, store=None, pagesize=1000):
+        """Incremental sync of calendar data. The highest "updated" timestamp seen is stored per calendar and
+        ticker set, and every run only asks the API for records updated since then (parameters[updated]), so a
+        refresh downloads the delta instead of the whole window.
+
+        Arguments:
+            Required - client (financial_data.Benzinga)
+            Optional:
+            store - watermark store with get(key) and set(key, watermark), e.g. JSONWatermarkStore or
+            SQLiteWatermarkStore. Default: MemoryWatermarkStore
+            pagesize (int) - records per request. Default: 1000"""
+        self.client = client
+        self.store = store if store is not None else MemoryWatermarkStore()
+        self.pagesize = pagesize
+
+    @staticmethod
+    def watermark_key(calendar, company_tickers=None):
+        if isinstance(company_tickers, str):
+            company_tickers = company_tickers.split(",")
+        tickers = ",".join(sorted({ticker.strip().upper() for ticker in company_tickers or [] if ticker.strip()}))
+        return "%s:%s" % (calendar, tickers or "*")
+
+    def run(self, calendar, company_tickers=None, **kwargs):
+        """Public Method: Fetch the records of a calendar that are new or changed since the last run, and move
+        the watermark forward. The first run for a calendar and ticker set pulls the whole window. Records the
+        API returns without an "updated" timestamp are always included and do not move the watermark.
+
+        Arguments:
+            Required - calendar (str) - name of a calendar method, e.g. "ratings", "earnings"
+            Optional:
+            company_tickers (str or list)
+            the other arguments of the calendar method, e.g. date_from
+
+        Returns:
+            list of new or changed calendar records"""
+        if calendar not in CALENDAR_KEYS:
+            raise IncorrectParameterEntry(
+                "calendar must be one of %s. You entered %s" % (", ".join(CALENDAR_KEYS), calendar)
+            )
+        key = self.watermark_key(calendar, company_tickers)
+        watermark = self.store.get(key) or {"updated": None, "ids": []}
+        since, boundary_ids = watermark["updated"], set(watermark["ids"])
+        if company_tickers is not None:
+            if not isinstance(company_tickers, str):
+                company_tickers = ",".join(company_tickers)
+            kwargs["company_tickers"] = company_tickers
+        kwargs["updated" if calendar == "options_activity" else "updated_params"] = since
+
+        records, latest, latest_ids = [], since, set(boundary_ids)
+        iterate = getattr(self.client, "iter_%s" % calendar)
+        for record in iterate(pagesize=self.pagesize, **kwargs):
+            if record.get("updated") in (None, ""):
+                # A record without a timestamp cannot be placed against the watermark, so it is always returned
+                # and leaves the watermark where it is.
+                records.append(record)
+                continue
+            updated = int(record["updated"])
+            if since is not None and (updated < since or (updated == since and record.get("id") in boundary_ids)):
+                continue
+            records.append(record)
+            if latest is None or updated > latest:
+                latest, latest_ids = updated, {record.get("id")}
+            elif updated == latest:
+                latest_ids.add(record.get("id"))
+        if latest is not None:
+            self.store.set(key, {"updated": latest, "ids": sorted(latest_ids - {None})})
+        return records
@@ -0,0 +1,223 @@
+import datetime as dt
+import json
+import os
+import shutil
+import tempfile
+import threading
+from .backfill import to_date
+from .benzinga_errors import IncorrectParameterEntry
+from .candles import OHLCV
+
+COLUMNS = ("time",) + OHLCV
+DAY_MS = 86400 * 1000
+EPOCH = dt.date(1970, 1, 1)
+
+
+def day_ms(day):
+    """Milliseconds since the epoch of midnight UTC of a date."""
+    return (day - EPOCH).days * DAY_MS
+
+
+def merge_ranges(ranges):
+    """Merge inclusive (start, end) date ranges that overlap or touch."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + dt.timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(ranges, start, end):
+    """Return the inclusive date ranges of start..end that are not covered by the merged ranges."""
+    gaps = []
+    for held_start, held_end in ranges:
+        if held_end < start:
+            continue
+        if held_start > end:
+            break
+        if held_start > start:
+            gaps.append((start, held_start - dt.timedelta(days=1)))
+        start = max(start, held_end + dt.timedelta(days=1))
+    if start <= end:
+        gaps.append((start, end))
+    return gaps
+
+
+class CandleStore:
+
+    def __init__(self, client, root):
+        """Local store of bars and price_history candles, kept as memory-mapped NumPy column files per symbol and
+        interval under root/<method>/<interval>/<symbol>/. The store records which days it holds, and a request
+        only downloads the days that are missing, merges them into the files and serves the whole range from
+        disk as read-only views of the memory-mapped columns, without copying them.
+
+        Days are UTC days. Today and later days are always downloaded again and never recorded as held, as their
+        candles are still changing.
+
+        Arguments:
+            Required - client (financial_data.Benzinga)
+            Required - root (str) - directory of the store"""
+        self.client = client
+        self.root = root
+        self._lock = threading.Lock()
+        self._locks = {}
+
+    def __directory(self, method, interval, symbol):
+        return os.path.join(self.root, method, interval, symbol.upper())
+
+    def __series_lock(self, directory):
+        """Private Method: Lock of one (method, interval, symbol) series, held while its files are read or
+        replaced but never during a download."""
+        with self._lock:
+            lock = self._locks.get(directory)
+            if lock is None:
+                lock = self._locks[directory] = threading.Lock()
+            return lock
+
+    def __load_meta(self, directory):
+        path = os.path.join(directory, "meta.json")
+        if not os.path.exists(path):
+            return {"version": None, "ranges": []}
+        with open(path) as fh:
+            return json.load(fh)
+
+    def ranges(self, method, symbol, interval="1D"):
+        """Public Method: Date ranges held for a symbol.
+
+        Arguments:
+            Required - method (str) - "bars" or "price_history"
+            Required - symbol (str)
+            Optional:
+            interval (str) - bars interval. Default: "1D"
+
+        Returns:
+            list of inclusive (date_from, date_to) date tuples"""
+        meta = self.__load_meta(self.__directory(method, interval, symbol))
+        return [(to_date(start), to_date(end)) for start, end in meta["ranges"]]
+
+    def __columns(self, directory, meta):
+        """Private Method: Memory-map the columns of the current version, or return empty arrays."""
+        import numpy as np
+        if meta["version"] is None:
+            return {name: np.empty(0, dtype=np.int64 if name == "time" else np.float64) for name in COLUMNS}
+        version = os.path.join(directory, "v%d" % meta["version"])
+        return {name: np.load(os.path.join(version, name + ".npy"), mmap_mode="r") for name in COLUMNS}
+
+    def __save_meta(self, directory, meta):
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(meta, fh)
+        os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+    def __merge(self, directory, version, arrays, fetched):
+        """Private Method: Write the held columns merged with the fetched candles as a new version directory,
+        sorted by time. Fetched candles replace held candles with the same timestamp."""
+        import numpy as np
+        times = np.concatenate([arrays["time"], fetched["time"]])
+        # Fetched candles come last, so they win over held candles with the same timestamp.
+        order = np.argsort(times, kind="stable")[::-1]
+        _, last = np.unique(times[order], return_index=True)
+        index = order[last]
+        path = os.path.join(directory, "v%d" % version)
+        os.makedirs(path, exist_ok=True)
+        for name in COLUMNS:
+            np.save(os.path.join(path, name + ".npy"), np.concatenate([arrays[name], fetched[name]])[index])
+
+    def __fetch(self, method, symbol, gap, interval):
+        if method == "bars":
+            result = self.client.bars(symbol, gap[0].isoformat(), gap[1].isoformat(), interval=interval, output="numpy")
+        else:
+            result = self.client.price_history(symbol, gap[0].isoformat(), gap[1].isoformat(), output="numpy")
+        for name, arrays in result.items():
+            if name is None or name.upper() == symbol.upper() or len(result) == 1:
+                return arrays
+        return None
+
+    def __series(self, method, symbol, start, end, interval):
+        """Private Method: Fill the gaps of one symbol and return its columns between start and end. The missing
+        days are downloaded without holding the series lock, which is only taken to read the files and to merge
+        the downloaded candles into them, so other threads keep reading the series meanwhile."""
+        import numpy as np
+        directory = self.__directory(method, interval, symbol)
+        lock = self.__series_lock(directory)
+        with lock:
+            meta = self.__load_meta(directory)
+            held = [(to_date(held_start), to_date(held_end)) for held_start, held_end in meta["ranges"]]
+            arrays = self.__columns(directory, meta)
+        gaps = missing_ranges(held, start, end)
+        if gaps:
+            fetched = [self.__fetch(method, symbol, gap, interval) for gap in gaps]
+            fetched = [candles for candles in fetched if candles is not None]
+            with lock:
+                os.makedirs(directory, exist_ok=True)
+                # Another thread may have merged the series while the gaps downloaded.
+                meta = self.__load_meta(directory)
+                held = [(to_date(held_start), to_date(held_end)) for held_start, held_end in meta["ranges"]]
+                previous = meta["version"]
+                if fetched:
+                    version = 0 if previous is None else previous + 1
+                    merged = {name: np.concatenate([candles[name] for candles in fetched]) for name in COLUMNS}
+                    self.__merge(directory, version, self.__columns(directory, meta), merged)
+                    meta["version"] = version
+                last_closed = dt.date.today() - dt.timedelta(days=1)
+                held += [(gap_start, min(gap_end, last_closed)) for gap_start, gap_end in gaps
+                         if gap_start <= last_closed]
+                meta["ranges"] = [[held_start.isoformat(), held_end.isoformat()]
+                                  for held_start, held_end in merge_ranges(held)]
+                # Readers holding views of the previous version keep them after its files are removed.
+                self.__save_meta(directory, meta)
+                if previous is not None and previous != meta["version"]:
+                    shutil.rmtree(os.path.join(directory, "v%d" % previous), ignore_errors=True)
+                arrays = self.__columns(directory, meta)
+        times = arrays["time"]
+        first, last = np.searchsorted(times, [day_ms(start), day_ms(end + dt.timedelta(days=1))])
+        return {name: column[first:last] for name, column in arrays.items()}
+
+    def __get(self, method, company_tickers, date_from, date_to, interval):
+        try:
+            start, end = to_date(date_from), to_date(date_to)
+        except (TypeError, ValueError):
+            raise IncorrectParameterEntry(
+                "The candle store takes YYYY-MM-DD dates. You entered %s and %s" % (date_from, date_to)
+            )
+        if start > end:
+            raise IncorrectParameterEntry("date_from %s is after date_to %s" % (start, end))
+        if isinstance(company_tickers, str):
+            company_tickers = company_tickers.split(",")
+        symbols = list(dict.fromkeys(symbol.strip() for symbol in company_tickers if symbol.strip()))
+        if len(symbols) <= 1:
+            return {symbol: self.__series(method, symbol, start, end, interval) for symbol in symbols}
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(self.client.fan_out_workers, len(symbols))) as executor:
+            series = executor.map(lambda symbol: self.__series(method, symbol, start, end, interval), symbols)
+            return dict(zip(symbols, series))
+
+    def bars(self, company_tickers, date_from, date_to, interval="1D"):
+        """Public Method: Bars of one or more symbols, downloading only the days the store does not hold.
+
+        Arguments:
+            Required - company_tickers (str or list)
+            Required - date_from (str) - "YYYY-MM-DD"
+            Required - date_to (str) - "YYYY-MM-DD"
+            Optional:
+            interval (str) - "1MONTH", "1W", "1D", "1H", "15M"... Default: "1D"
+
+        Returns:
+            dict of symbol to read-only {"time", "open", "high", "low", "close", "volume"} arrays, as returned by
+            bars(output="numpy")"""
+        return self.__get("bars", company_tickers, date_from, date_to, interval)
+
+    def price_history(self, company_tickers, date_from, date_to):
+        """Public Method: Daily candles of one or more symbols, downloading only the days the store does not
+        hold.
+
+        Arguments:
+            Required - company_tickers (str or list)
+            Required - date_from (str) - "YYYY-MM-DD"
+            Required - date_to (str) - "YYYY-MM-DD"
+
+        Returns:
+            dict of symbol to read-only {"time", "open", "high", "low", "close", "volume"} arrays"""
+        return self.__get("price_history", company_tickers, date_from, date_to, "1D")
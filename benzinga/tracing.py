@@ -0,0 +1,105 @@
+import time
+from urllib.parse import urlsplit
+
+# Parameters carrying the api token, replaced by REDACTED in the parameters handed to hooks.
+SECRET_PARAMS = ("token", "apikey")
+REDACTED = "[REDACTED]"
+
+
+def redact(params):
+    """Copy of the query parameters without None values and with the api token redacted."""
+    return {
+        name: REDACTED if name in SECRET_PARAMS else value for name, value in params.items() if value is not None
+    }
+
+
+class RequestContext:
+
+    __slots__ = ("endpoint", "url", "params", "started", "status", "ttfb", "duration", "bytes", "retries", "state")
+
+    def __init__(self, endpoint, url, params):
+        """One traced request, handed to every hook callback. Timings are in seconds; ttfb, duration, status,
+        bytes and retries are set once the response (or error) is known. state is a dict where hooks keep their
+        own per-request data, e.g. a span."""
+        self.endpoint = endpoint
+        self.url = url
+        self.params = redact(params)
+        self.started = time.perf_counter()
+        self.status = None
+        self.ttfb = None
+        self.duration = None
+        self.bytes = None
+        self.retries = 0
+        self.state = {}
+
+    @property
+    def host(self):
+        return urlsplit(self.url).netloc
+
+    def __repr__(self):
+        return "RequestContext(%r, %r, status=%r)" % (self.endpoint, self.url, self.status)
+
+
+class RequestHook:
+    """Base class of the tracing hooks registered with a client (hooks= or add_hook). Every callback is optional
+    and does nothing by default. Exceptions raised by a hook propagate to the caller."""
+
+    def before_request(self, context):
+        """Called before the request is sent."""
+
+    def after_response(self, context):
+        """Called once the response is received and decoded, with status, timings and size set."""
+
+    def on_error(self, context, error):
+        """Called when the request fails, with the benzinga_errors or transport exception."""
+
+
+class OpenTelemetryHook(RequestHook):
+
+    def __init__(self, tracer=None, tracer_provider=None):
+        """Record every request as an OpenTelemetry client span named "benzinga.<endpoint>", a child of the span
+        that is current when the call is made. Needs the opentelemetry-api package.
+
+        Arguments:
+            Optional:
+            tracer (opentelemetry.trace.Tracer) - tracer creating the spans. Default: the "benzinga" tracer of
+            tracer_provider
+            tracer_provider (opentelemetry.trace.TracerProvider) - Default: the global tracer provider"""
+        from opentelemetry import trace
+        self.trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer("benzinga", tracer_provider=tracer_provider)
+
+    def before_request(self, context):
+        attributes = {
+            "http.request.method": "GET",
+            "server.address": context.host,
+            "url.full": context.url,
+            "benzinga.endpoint": context.endpoint,
+        }
+        for name, value in context.params.items():
+            attributes["benzinga.param.%s" % name] = str(value)
+        context.state["span"] = self.tracer.start_span(
+            "benzinga.%s" % context.endpoint, kind=self.trace.SpanKind.CLIENT, attributes=attributes
+        )
+
+    def after_response(self, context):
+        span = context.state.pop("span", None)
+        if span is None:
+            return
+        span.set_attribute("http.response.status_code", context.status)
+        span.set_attribute("http.response.body.size", context.bytes)
+        span.set_attribute("benzinga.retries", context.retries)
+        if context.ttfb is not None:
+            span.set_attribute("benzinga.ttfb", context.ttfb)
+        span.end()
+
+    def on_error(self, context, error):
+        span = context.state.pop("span", None)
+        if span is None:
+            return
+        if context.status is not None:
+            span.set_attribute("http.response.status_code", context.status)
+        span.set_attribute("error.type", type(error).__name__)
+        span.record_exception(error)
+        span.set_status(self.trace.Status(self.trace.StatusCode.ERROR, str(error)))
+        span.end()
@@ -13,6 +13,8 @@ setuptools.setup(
         install_requires=['requests',
                           "structlog",
                           "urllib3>=2.6.3"],
+        extras_require={"async": ["aiohttp"], "orjson": ["orjson"], "pandas": ["pandas"], "arrow": ["pyarrow"],
+                        "numpy": ["numpy"], "opentelemetry": ["opentelemetry-api"]},
         long_description = long_description,
         long_description_content_type="text/markdown",
         classifiers=[
@@ -0,0 +1,54 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubServer:
+    """Local HTTP server answering every GET with respond(path), a (status, headers, body) tuple, and counting
+    the requests it receives and the client addresses (one per connection) they came from."""
+
+    def __init__(self):
+        self.hits = 0
+        self.paths = []
+        self.peers = []
+        self.respond = lambda path: (200, {}, b"{}")
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.hits += 1
+                stub.paths.append(self.path)
+                stub.peers.append(self.client_address)
+                status, headers, body = stub.respond(self.path)
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:%d/" % self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def point(self, client):
+        """Send every request of client to the stub."""
+        client.url_dict = {name: self.url for name in client.url_dict}
+        return client
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from benzinga import financial_data
+from benzinga.benzinga_errors import NotFoundError
+
+async_client = pytest.importorskip("benzinga.async_client")
+
+
+def test_coroutines_return_what_the_sync_client_returns(stub_server):
+    stub_server.respond = lambda path: (200, {}, {"ratings": [{"id": "1", "ticker": "AAPL"}]})
+    expected = stub_server.point(financial_data.Benzinga("token", log=False)).ratings(company_tickers="AAPL")
+
+    async def main():
+        async with async_client.AsyncBenzinga("token", log=False) as fin:
+            stub_server.point(fin)
+            return await fin.ratings(company_tickers="AAPL")
+
+    assert asyncio.run(main()) == expected
+
+
+def test_server_errors_are_retried_and_statuses_mapped(stub_server):
+    statuses = [503, 200]
+    stub_server.respond = lambda path: (statuses.pop(0) if statuses else 404, {}, {"ratings": []})
+
+    async def main():
+        async with async_client.AsyncBenzinga("token", log=False, backoff_factor=0) as fin:
+            stub_server.point(fin)
+            assert await fin.ratings() == {"ratings": []}
+            with pytest.raises(NotFoundError):
+                await fin.ratings()
+
+    asyncio.run(main())
+    assert stub_server.hits == 3
+
+
+def test_requests_in_flight_stay_within_max_concurrency(stub_server):
+    lock, active = threading.Lock(), [0, 0]
+
+    def slow(path):
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return 200, {}, {"ratings": []}
+
+    stub_server.respond = slow
+
+    async def main():
+        async with async_client.AsyncBenzinga("token", log=False, max_concurrency=3) as fin:
+            stub_server.point(fin)
+            await asyncio.gather(*(fin.ratings() for _ in range(12)))
+
+    asyncio.run(main())
+    assert stub_server.hits == 12 and 1 < active[1] <= 3
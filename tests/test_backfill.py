@@ -0,0 +1,42 @@
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from benzinga import financial_data
+
+
+def query(path):
+    return {name: values[0] for name, values in parse_qs(urlsplit(path).query).items()}
+
+
+def one_rating_per_day(path):
+    params = query(path)
+    start, end = params["parameters[date_from]"], params["parameters[date_to]"]
+    return 200, {}, {"ratings": [{"id": start, "date": start}] if start == end else [
+        {"id": start, "date": start}, {"id": end, "date": end}
+    ]}
+
+
+def test_backfill_returns_sorted_unique_records(stub_server):
+    stub_server.respond = one_rating_per_day
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    records = client.backfill("ratings", "2024-01-01", "2024-01-31", shard="week", pagesize=2)
+    dates = [record["date"] for record in records]
+    assert dates == sorted(set(dates))
+    assert dates[0] == "2024-01-01" and dates[-1] == "2024-01-31"
+
+
+def test_stream_keeps_a_bounded_window_for_a_slow_consumer(stub_server):
+    stub_server.respond = one_rating_per_day
+    client = stub_server.point(financial_data.Benzinga("token", log=False, max_workers=4))
+    records = client.backfill("ratings", "2024-01-01", "2024-04-30", shard="day", stream=True)
+    first = next(records)
+    time.sleep(0.3)
+    assert first["date"] == "2024-01-01"
+    # The consumed shard plus at most max_workers shards downloading or waiting.
+    assert stub_server.hits <= 5
+    for _ in range(10):
+        next(records)
+    time.sleep(0.3)
+    assert stub_server.hits <= 15
+    assert len(list(records)) == 121 - 11
+    assert stub_server.hits == 121
@@ -0,0 +1,102 @@
+import sqlite3
+import time
+
+from benzinga import cache, financial_data
+from benzinga.cache import DiskCache, ResponseCache
+
+
+def key(name):
+    return "quote", "https://api.benzinga.com/api/v1/", (("symbols", name),)
+
+
+def stored_bytes(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+
+def test_running_total_follows_every_write(tmp_path):
+    path = str(tmp_path / "cache.db")
+    disk = DiskCache(path)
+    for name in ("A", "B", "C"):
+        disk.set(key(name), {"symbol": name, "price": list(range(50))})
+    disk.set(key("B"), {"symbol": "B"})
+    disk.set(key("C"), {"symbol": "C"}, ttl=-1)
+    disk.invalidate("quote")
+    disk.set(key("D"), {"symbol": "D"}, ttl=0.000001)
+    assert disk.get(key("D")) == (False, None)
+    disk.set(key("E"), {"symbol": "E"})
+    assert disk.stats()["bytes"] == stored_bytes(path) > 0
+
+
+def test_total_is_initialized_for_an_existing_database(tmp_path):
+    path = str(tmp_path / "cache.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE responses (key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, "
+            "expires REAL, accessed REAL NOT NULL, size INTEGER NOT NULL, value BLOB NOT NULL)"
+        )
+        conn.execute("INSERT INTO responses VALUES ('k', 'quote', NULL, 0, 42, x'00')")
+    assert DiskCache(path).stats()["bytes"] == 42
+
+
+def test_eviction_keeps_recently_read_entries(tmp_path):
+    path = str(tmp_path / "cache.db")
+    disk = DiskCache(path, max_bytes=10 ** 9)
+    for name in ("A", "B", "C", "D"):
+        disk.set(key(name), {"symbol": name, "data": name * 200})
+    # A is read last, so B is the least recently used entry once the access times are written.
+    assert disk.get(key("A"))[0]
+    disk.max_bytes = stored_bytes(path) - 1
+    disk.set(key("E"), {"symbol": "E"})
+    assert not disk.get(key("B"))[0]
+    assert disk.get(key("A"))[0] and disk.get(key("E"))[0]
+    assert disk.stats()["bytes"] == stored_bytes(path) <= disk.max_bytes
+
+
+def test_access_times_are_written_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "ACCESS_BATCH", 3)
+    path = str(tmp_path / "cache.db")
+    disk = DiskCache(path)
+    for name in ("A", "B", "C"):
+        disk.set(key(name), {"symbol": name})
+
+    def accessed():
+        with sqlite3.connect(path) as conn:
+            return dict(conn.execute("SELECT key, accessed FROM responses").fetchall())
+
+    written = accessed()
+    disk.get(key("A"))
+    disk.get(key("B"))
+    disk.get(key("A"))
+    assert accessed() == written
+    disk.get(key("C"))
+    assert all(accessed()[digest] > when for digest, when in written.items())
+
+
+def test_each_endpoint_is_cached_for_its_own_ttl(stub_server):
+    stub_server.respond = lambda path: (200, {}, [{"symbol": "AAPL"}])
+    client = stub_server.point(financial_data.Benzinga("token", log=False, cache=ResponseCache(ttls={"quote": 0.2})))
+    client.delayed_quote(company_tickers="AAPL")
+    client.delayed_quote(company_tickers="AAPL")
+    assert stub_server.hits == 1
+    client.ratings(company_tickers="AAPL")
+    client.ratings(company_tickers="AAPL")
+    # ratings has no ttl and is not cached.
+    assert stub_server.hits == 3
+    client.quote("AAPL")
+    client.quote("AAPL")
+    assert stub_server.hits == 4
+    time.sleep(0.3)
+    client.quote("AAPL")
+    client.delayed_quote(company_tickers="AAPL")
+    # quote expired after its 0.2 seconds, delayed_quote keeps its default 15.
+    assert stub_server.hits == 5
+    assert client.cache.stats()["hits"] == 3
+
+
+def test_closed_historical_windows_never_expire():
+    response_cache = ResponseCache(ttls={"bars": 0.01})
+    closed = ("bars", "url", (("from", "2020-01-01"), ("to", "2020-01-31")))
+    response_cache.set(closed, [1])
+    time.sleep(0.05)
+    assert response_cache.get(closed) == (True, [1])
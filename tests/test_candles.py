@@ -0,0 +1,34 @@
+import os
+import time
+
+import pytest
+
+from benzinga.candles import candle_arrays
+
+
+@pytest.fixture
+def eastern_timezone():
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available")
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "America/New_York"
+    time.tzset()
+    yield
+    if previous is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+
+def test_date_times_convert_to_the_same_epochs_in_any_timezone(eastern_timezone):
+    pytest.importorskip("numpy")
+    response = {"symbol": "AAPL", "candles": [
+        {"dateTime": "2024-01-02T14:30:00", "close": 1},
+        {"dateTime": "2024-01-02T14:35:00Z", "close": 2},
+        {"dateTime": "2024-01-02T09:40:00-05:00", "close": 3},
+        {"time": 1704206700000, "close": 4},
+    ]}
+    arrays = candle_arrays(response)["AAPL"]
+    assert arrays["time"].tolist() == [1704205800000, 1704206100000, 1704206400000, 1704206700000]
+    assert arrays["close"].tolist() == [1, 2, 3, 4]
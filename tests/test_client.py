@@ -0,0 +1,41 @@
+from urllib.parse import parse_qs, urlsplit
+
+from benzinga import financial_data
+from benzinga.client import chunk_symbols
+
+
+def query(path):
+    return {name: values[0] for name, values in parse_qs(urlsplit(path).query).items()}
+
+
+def test_calls_reuse_one_pooled_connection(stub_server):
+    stub_server.respond = lambda path: (200, {}, {"ratings": []})
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    session = client.session
+    for _ in range(5):
+        client.ratings(company_tickers="AAPL")
+    assert client.session is session
+    assert stub_server.hits == 5 and len(set(stub_server.peers)) == 1
+    client.close()
+    client.ratings(company_tickers="AAPL")
+    assert client.session is not session and len(set(stub_server.peers)) == 2
+
+
+def test_chunks_respect_the_ticker_and_length_limits():
+    symbols = ["T%03d" % number for number in range(250)]
+    chunks = chunk_symbols(symbols)
+    assert [len(chunk.split(",")) for chunk in chunks] == [100, 100, 50]
+    assert ",".join(chunks) == ",".join(symbols)
+    assert all(len(chunk) <= 30 for chunk in chunk_symbols(symbols, chunk_length=30))
+
+
+def test_long_ticker_lists_are_fetched_in_chunks_and_merged_in_order(stub_server):
+    stub_server.respond = lambda path: (200, {}, {"result": [
+        {"id": symbol} for symbol in query(path)["symbols"].split(",")
+    ]})
+    client = stub_server.point(financial_data.Benzinga("token", log=False, max_workers=3))
+    symbols = ["T%03d" % number for number in range(250)]
+    response = client.fundamentals(symbols)
+    assert stub_server.hits == 3
+    assert sorted(len(query(path)["symbols"].split(",")) for path in stub_server.paths) == [50, 100, 100]
+    assert [company["id"] for company in response["result"]] == symbols
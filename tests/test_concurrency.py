@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+
+from benzinga import financial_data
+from benzinga.concurrency import AIMDController
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_async_waiters_stay_within_the_limit():
+    controller = AIMDController(initial=2, max_limit=2)
+    in_flight, peak = 0, 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with controller.slot("base"):
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(300)))
+
+    run(main())
+    assert peak == 2
+    report = controller.report()["base"]
+    assert report["in_flight"] == 0 and report["successes"] == 300
+
+
+def test_waiters_sleep_until_a_unit_is_released():
+    controller = AIMDController(initial=1, max_limit=1)
+    limit = controller.limit("base")
+
+    async def main():
+        holder = controller.slot("base")
+        await holder.__aenter__()
+        waiters = [asyncio.ensure_future(controller.slot("base").__aenter__()) for _ in range(200)]
+        started = time.process_time()
+        await asyncio.sleep(0.2)
+        # Waiting coroutines are parked on futures, not polling.
+        assert time.process_time() - started < 0.05
+        assert not any(waiter.done() for waiter in waiters)
+        # A release from another thread hands the unit over to the first waiter.
+        thread = threading.Thread(target=limit.release, args=(holder.started,))
+        thread.start()
+        thread.join()
+        slot = await waiters[0]
+        assert limit.in_flight == 1 and not waiters[1].done()
+        for waiter in waiters[1:]:
+            waiter.cancel()
+        await asyncio.gather(*waiters[1:], return_exceptions=True)
+        await slot.__aexit__(None, None, None)
+
+    run(main())
+    assert limit.in_flight == 0 and not limit._waiters
+
+
+def test_cancelled_waiter_passes_its_unit_on():
+    controller = AIMDController(initial=1, max_limit=1)
+    limit = controller.limit("base")
+
+    async def main():
+        holder = await controller.slot("base").__aenter__()
+        first = asyncio.ensure_future(controller.slot("base").__aenter__())
+        second = asyncio.ensure_future(controller.slot("base").__aenter__())
+        await asyncio.sleep(0)
+        await holder.__aexit__(None, None, None)
+        # The unit is on its way to first, which is cancelled before it runs.
+        first.cancel()
+        slot = await asyncio.wait_for(second, 1)
+        assert first.cancelled()
+        await slot.__aexit__(None, None, None)
+
+    run(main())
+    assert limit.in_flight == 0
+
+
+def test_connection_pool_holds_every_fan_out_worker():
+    client = financial_data.Benzinga("token", log=False, concurrency=AIMDController(max_limit=32))
+    assert client.session.get_adapter("https://api.benzinga.com/").poolmanager.connection_pool_kw["maxsize"] == 32
+    client = financial_data.Benzinga("token", log=False, pool_maxsize=20, max_workers=8)
+    assert client.session.get_adapter("https://api.benzinga.com/").poolmanager.connection_pool_kw["maxsize"] == 20
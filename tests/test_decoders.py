@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+
+import pytest
+
+from benzinga import financial_data
+from benzinga.decoders import AUTO_DECODERS, json_decoder, load_decoder
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+ENDPOINTS = ("instruments", "financials", "options_activity")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name + ".json"), "rb") as fh:
+        return fh.read()
+
+
+@pytest.mark.parametrize("name", AUTO_DECODERS)
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_decoders_agree_on_fixtures(name, endpoint):
+    try:
+        decode = load_decoder(name)
+    except ImportError:
+        pytest.skip("%s is not installed" % name)
+    body = fixture(endpoint)
+    assert decode(body) == json.loads(body)
+
+
+def test_auto_falls_back_to_json(monkeypatch):
+    # A None entry in sys.modules makes the import raise ImportError, as when the package is not installed.
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    assert json_decoder("auto") is json.loads
+    with pytest.raises(ImportError):
+        json_decoder("orjson")
+
+
+def test_client_decodes_with_the_fallback(stub_server, monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    body = fixture("instruments")
+    stub_server.respond = lambda path: (200, {"Content-Type": "application/json"}, body)
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    assert client.instruments() == json.loads(body)
+    assert client._decode is json.loads
@@ -0,0 +1,73 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from benzinga import financial_data
+from benzinga.export import CalendarExport
+
+RATINGS = [
+    {"id": "5f1", "ticker": "AAPL", "date": "2021-01-04", "pt_current": "", "notes": None, "source": None},
+    {"id": "1", "ticker": "0700", "date": "2021-01-05", "pt_current": "12.5", "notes": "upgrade",
+     "source": "1"},
+]
+
+
+def ratings_page(path):
+    query = {name: values[0] for name, values in parse_qs(urlsplit(path).query).items()}
+    if query.get("page", "0") != "0":
+        return 200, {}, {"ratings": []}
+    start, end = query["parameters[date_from]"], query["parameters[date_to]"]
+    return 200, {}, {"ratings": [record for record in RATINGS if start <= record["date"] <= end]}
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_export_reads_back_as_one_dataset(stub_server, tmp_path, format):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.dataset as ds
+    stub_server.respond = ratings_page
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    entry = CalendarExport(client, str(tmp_path), format=format, shard="day").run(
+        "ratings", "2021-01-04", "2021-01-05"
+    )
+    assert entry["rows"] == {"2021-01-04": 1, "2021-01-05": 1}
+
+    dataset_format = "ipc" if format == "arrow" else "parquet"
+    table = ds.dataset(str(tmp_path / "ratings"), format=dataset_format, partitioning="hive").to_table()
+    assert table.schema.field("id").type == pa.string()
+    assert table.schema.field("pt_current").type == pa.float64()
+    assert table.schema.field("notes").type == pa.string()
+    assert table.schema.field("source").type == pa.string()
+    rows = sorted(table.to_pylist(), key=lambda row: row["day"])
+    assert [row["id"] for row in rows] == ["5f1", "1"]
+    assert [row["ticker"] for row in rows] == ["AAPL", "0700"]
+    assert [row["pt_current"] for row in rows] == [None, 12.5]
+    assert [row["source"] for row in rows] == [None, "1"]
+
+
+def test_long_export_holds_a_bounded_number_of_rows(stub_server, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from benzinga import export
+    per_day, batch_size, max_pending, workers = 120, 50, 1, 4
+    state = {"served": 0, "written": 0, "held": 0}
+
+    def dense_days(path):
+        query = {name: values[0] for name, values in parse_qs(urlsplit(path).query).items()}
+        day = query["parameters[date_from]"]
+        state["held"] = max(state["held"], state["served"] - state["written"])
+        state["served"] += per_day
+        return 200, {}, {"ratings": [{"id": "%s-%d" % (day, i), "date": day} for i in range(per_day)]}
+
+    write_table = export.write_table
+
+    def counting_write_table(table, path, format):
+        write_table(table, path, format)
+        state["written"] += table.num_rows
+
+    monkeypatch.setattr(export, "write_table", counting_write_table)
+    stub_server.respond = dense_days
+    client = stub_server.point(financial_data.Benzinga("token", log=False, max_workers=workers))
+    entry = CalendarExport(client, str(tmp_path), shard="day", batch_size=batch_size, max_pending=max_pending).run(
+        "ratings", "2021-01-01", "2021-03-31"
+    )
+    assert sum(entry["rows"].values()) == state["written"] == 90 * per_day
+    assert state["held"] <= batch_size * (max_pending + 1) + workers * per_day
@@ -0,0 +1,61 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from benzinga import financial_data
+from benzinga.benzinga_errors import IncorrectParameterEntry
+from benzinga.fields import CATALOGS, calendar_fields
+
+
+def fields_sent(path):
+    return parse_qs(urlsplit(path).query)["fields"][0].split(",")
+
+
+def client_for(stub_server, body, **options):
+    stub_server.respond = lambda path: (200, {}, body)
+    return stub_server.point(financial_data.Benzinga("token", log=False, **options))
+
+
+def test_importance_filter_keeps_its_field(stub_server):
+    # The API returns only the requested fields, the filter must still see importance.
+    body = {"ratings": [{"id": "1", "date": "2024-01-02", "ticker": "AAPL", "importance": 1},
+                        {"id": "2", "date": "2024-01-02", "ticker": "MSFT", "importance": 3},
+                        {"id": "3", "date": "2024-01-02", "ticker": "IBM"}]}
+    client = client_for(stub_server, body)
+    result = client.ratings(fields=["ticker", "date"], importance=1)
+    assert [record["ticker"] for record in result["ratings"]] == ["AAPL"]
+    assert fields_sent(stub_server.paths[0]) == ["ticker", "date", "id", "updated", "importance"]
+
+
+def test_projection_keeps_the_key_fields(stub_server):
+    client = client_for(stub_server, {"earnings": []})
+    client.earnings(fields="eps,eps_est")
+    assert fields_sent(stub_server.paths[0]) == ["eps", "eps_est", "id", "date", "updated"]
+    assert calendar_fields("earnings", None) is None
+
+
+@pytest.mark.parametrize("calendar", [
+    "splits", "economics", "guidance", "ipo", "retail", "conference_calls", "options_activity",
+])
+def test_every_calendar_accepts_fields(stub_server, calendar):
+    client = client_for(stub_server, {})
+    field = next(name for name in CATALOGS[calendar] if name not in ("id", "date", "updated"))
+    getattr(client, calendar)(fields=[field])
+    assert fields_sent(stub_server.paths[0])[0] == field
+    with pytest.raises(IncorrectParameterEntry):
+        getattr(client, calendar)(fields=["no_such_field"])
+
+
+def test_unknown_fields_pass_with_validate_false(stub_server):
+    client = client_for(stub_server, {"dividends": []}, validate=False)
+    client.dividends(fields=["no_such_field"])
+    assert fields_sent(stub_server.paths[0])[0] == "no_such_field"
+
+
+def test_fundamentals_sections_are_projected_client_side(stub_server):
+    body = {"result": [{"company": {"cik": "1"}, "valuationRatios": [{"peRatio": 20}], "alphaBeta": []}]}
+    client = client_for(stub_server, body)
+    result = client.fundamentals("AAPL", fields=["valuationRatios"])
+    assert result == {"result": [{"valuationRatios": [{"peRatio": 20}]}]}
+    # The cached or shared response is not changed in place.
+    assert "company" in body["result"][0]
@@ -0,0 +1,38 @@
+import pytest
+
+from benzinga.frames import to_frame, typed_columns
+from benzinga.records import MODELS
+
+RATINGS = [
+    {"id": "1", "ticker": "0700", "cusip": "037833100", "pt_current": "12.5", "importance": "3", "date": "2024-01-02",
+     "extra": "4.5"},
+    {"id": "2", "ticker": "AAPL", "cusip": None, "pt_current": "", "importance": None, "date": "2024-01-03",
+     "extra": "1"},
+]
+
+
+def test_model_str_fields_stay_strings():
+    columns, kinds = typed_columns(RATINGS, MODELS["ratings"])
+    assert columns["id"] == ["1", "2"] and kinds["id"] == "str"
+    assert columns["ticker"] == ["0700", "AAPL"]
+    assert columns["pt_current"] == [12.5, None] and kinds["pt_current"] == "float"
+    assert columns["importance"] == [3, None] and kinds["importance"] == "int"
+    # Fields the model does not declare are still inferred.
+    assert columns["extra"] == [4.5, 1.0] and kinds["extra"] == "float"
+    # Undeclared codes with a leading zero are not numbers.
+    assert columns["cusip"] == ["037833100", None] and kinds["cusip"] is None
+
+
+def test_pandas_keeps_identifiers():
+    pytest.importorskip("pandas")
+    frame = to_frame(RATINGS, "pandas", MODELS["ratings"])
+    assert list(frame["id"]) == ["1", "2"]
+    assert list(frame["ticker"]) == ["0700", "AAPL"]
+    assert str(frame["pt_current"].dtype) == "float64"
+
+
+def test_arrow_keeps_identifiers():
+    pa = pytest.importorskip("pyarrow")
+    table = to_frame(RATINGS, "arrow", MODELS["ratings"])
+    assert table.schema.field("id").type == pa.string()
+    assert table.column("ticker").to_pylist() == ["0700", "AAPL"]
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+
+# Seconds a cold import of benzinga.financial_data may take. requests and structlog alone take well over this,
+# so the budget fails as soon as either is imported eagerly again. BENZINGA_IMPORT_BUDGET overrides it on slow
+# machines.
+IMPORT_BUDGET = float(os.environ.get("BENZINGA_IMPORT_BUDGET", "0.1"))
+
+# Modules the package must only import on first use.
+DEFERRED = ("requests", "structlog", "numpy")
+
+COLD_IMPORT = """
+import json, sys, time
+started = time.perf_counter()
+import benzinga.financial_data
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [name for name in %r if name in sys.modules]}))
+""" % (DEFERRED,)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cold_import():
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_IMPORT], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_cold_import_stays_under_budget():
+    # The best of a few runs, so a busy machine does not fail the suite.
+    seconds = min(cold_import()["seconds"] for _ in range(3))
+    assert seconds < IMPORT_BUDGET, "import benzinga.financial_data took %.3fs, budget %.3fs" % (
+        seconds, IMPORT_BUDGET
+    )
+
+
+def test_cold_import_defers_heavy_modules():
+    assert cold_import()["loaded"] == []
@@ -0,0 +1,55 @@
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from benzinga import financial_data
+from benzinga.benzinga_errors import NotFoundError
+from benzinga.metrics import MetricsRegistry
+
+BODY = json.dumps({"ratings": [{"id": "1"}]}).encode()
+
+
+def test_requests_errors_and_cache_lookups_are_recorded(stub_server):
+    stub_server.respond = lambda path: (404, {}, {}) if "dividends" in path else (200, {}, BODY)
+    events = []
+    client = stub_server.point(financial_data.Benzinga(
+        "token", log=False, metrics=MetricsRegistry(callback=events.append), cache=True
+    ))
+    host = urlsplit(stub_server.url).netloc
+    client.ratings()
+    client.ratings()
+    with pytest.raises(NotFoundError):
+        client.dividends()
+    client.quote("AAPL")
+    client.quote("AAPL")
+
+    snapshot = client.metrics.snapshot()
+    labels = (("endpoint", "ratings"), ("host", host))
+    assert snapshot["requests"][labels + (("status", 200),)] == 2
+    assert snapshot["bytes"][labels] == 2 * len(BODY)
+    assert snapshot["latency"][labels + (("phase", "total"),)]["count"] == 2
+    assert snapshot["errors"][(("endpoint", "dividends"), ("host", host), ("error", "NotFoundError"))] == 1
+    assert snapshot["cache"][(("endpoint", "quote"), ("result", "hit"))] == 1
+    assert [event["event"] for event in events].count("request") == 3
+    assert {"event": "cache", "endpoint": "quote", "hit": True} in events
+
+
+def test_prometheus_output_is_well_formed():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.observe("ratings", "https://api.benzinga.com/api/v2.1/calendar/ratings", 200, 0.5, ttfb=0.05, size=10)
+    registry.observe("ratings", "https://api.benzinga.com/api/v2.1/calendar/ratings", 200, 2.0, ttfb=0.5, size=30)
+    lines = registry.prometheus().splitlines()
+    labels = 'endpoint="ratings",host="api.benzinga.com"'
+    assert "# TYPE benzinga_requests_total counter" in lines
+    assert "# TYPE benzinga_request_seconds histogram" in lines
+    assert 'benzinga_requests_total{%s,status="200"} 2' % labels in lines
+    assert "benzinga_response_bytes_total{%s} 40" % labels in lines
+    total = labels + ',phase="total"'
+    assert [line for line in lines if line.startswith("benzinga_request_seconds_bucket{%s," % total)] == [
+        'benzinga_request_seconds_bucket{%s,le="0.1"} 0' % total,
+        'benzinga_request_seconds_bucket{%s,le="1.0"} 1' % total,
+        'benzinga_request_seconds_bucket{%s,le="+Inf"} 2' % total,
+    ]
+    assert "benzinga_request_seconds_sum{%s} 2.5" % total in lines
+    assert "benzinga_request_seconds_count{%s} 2" % total in lines
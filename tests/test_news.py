@@ -0,0 +1,77 @@
+import itertools
+import threading
+import time
+from email.utils import formatdate
+from urllib.parse import parse_qs, urlsplit
+
+from benzinga import news_data
+from benzinga.news_data import NewsCursor, TokenCache
+
+
+def query(path):
+    return {name: values[0] for name, values in parse_qs(urlsplit(path).query).items()}
+
+
+def story(story_id, updated, title="title"):
+    return {"id": story_id, "updated": formatdate(updated), "title": title}
+
+
+def test_cursor_keeps_stories_without_an_id():
+    cursor = NewsCursor(updated_since=1000, pagesize=10, min_interval=0, max_interval=0)
+    new_stories, _ = cursor.advance([story(None, 1000, "a"), story(None, 1000, "b"), story(1, 1000)])
+    assert [item["title"] for item in new_stories] == ["a", "b", "title"]
+    new_stories, _ = cursor.advance([story(None, 1000, "a"), story(None, 1000, "c"), story(1, 1000)])
+    assert [item["title"] for item in new_stories] == ["c"]
+
+
+def test_stream_moves_the_watermark_and_pages_through_full_pages(stub_server):
+    pages = {
+        ("1000", "0"): [story(1, 1000), story(2, 1000)],
+        ("1000", "1"): [story(2, 1000), story(None, 2000, "a")],
+        ("2000", "0"): [story(None, 2000, "a"), story(None, 2000, "b")],
+        ("2000", "1"): [story(3, 3000)],
+        ("3000", "0"): [story(4, 3000)],
+    }
+
+    def respond(path):
+        # Each page is served once, so a poll the cursor should not repeat fails instead of spinning.
+        page = pages.pop((query(path)["updatedSince"], query(path)["page"]), None)
+        return (404, {}, {}) if page is None else (200, {}, page)
+
+    stub_server.respond = respond
+    client = stub_server.point(news_data.News("token", log=False))
+    stories = client.stream(updated_since=1000, pagesize=2, min_interval=0, max_interval=0)
+    delivered = [(item["id"], item["title"]) for item in itertools.islice(stories, 6)]
+    assert delivered == [(1, "title"), (2, "title"), (None, "a"), (None, "b"), (3, "title"), (4, "title")]
+    polls = [(query(path)["updatedSince"], query(path)["page"]) for path in stub_server.paths]
+    assert polls == [("1000", "0"), ("1000", "1"), ("2000", "0"), ("2000", "1"), ("3000", "0")]
+
+
+def test_token_is_checked_once_and_then_reused(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(TokenCache, "validated", set())
+    path = str(tmp_path / "tokens.json")
+    client = stub_server.point(news_data.News("reused-token", log=False, token_cache=path))
+    assert not client.token_validated
+    assert client.validate() and client.validate()
+    assert stub_server.hits == 1
+    # A new process, without the in-memory set, finds the token in the cache file.
+    monkeypatch.setattr(TokenCache, "validated", set())
+    assert stub_server.point(news_data.News("reused-token", log=False, token_cache=path)).validate()
+    assert stub_server.hits == 1
+
+
+def test_concurrent_first_calls_check_the_token_once(stub_server, monkeypatch):
+    monkeypatch.setattr(TokenCache, "validated", set())
+
+    def slow(path):
+        time.sleep(0.1)
+        return 200, {}, []
+
+    stub_server.respond = slow
+    client = stub_server.point(news_data.News("concurrent-token", log=False))
+    threads = [threading.Thread(target=client.validate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stub_server.hits == 1 and client.token_validated
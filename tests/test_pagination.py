@@ -0,0 +1,42 @@
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from benzinga import financial_data
+
+
+def query(path):
+    return {name: values[0] for name, values in parse_qs(urlsplit(path).query).items()}
+
+
+def pages(*sizes):
+    def respond(path):
+        page = int(query(path)["page"])
+        size = sizes[page] if page < len(sizes) else 0
+        return 200, {}, {"ratings": [{"id": "%d-%d" % (page, number)} for number in range(size)]}
+    return respond
+
+
+def test_iteration_stops_on_the_first_empty_page(stub_server):
+    stub_server.respond = pages(2, 2, 0, 2)
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    records = list(client.iter_ratings(pagesize=2))
+    assert [record["id"] for record in records] == ["0-0", "0-1", "1-0", "1-1"]
+    assert [query(path)["page"] for path in stub_server.paths] == ["0", "1", "2"]
+
+
+def test_iteration_stops_on_a_short_page(stub_server):
+    stub_server.respond = pages(2, 1, 2)
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    assert len(list(client.iter_ratings(pagesize=2))) == 3
+    assert stub_server.hits == 2
+
+
+def test_the_next_page_is_read_ahead_one_page_at_a_time(stub_server):
+    stub_server.respond = pages(2, 2, 2, 2, 2)
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    records = client.iter_ratings(pagesize=2)
+    assert next(records)["id"] == "0-0"
+    time.sleep(0.2)
+    # The first page is being read while the second one has already been fetched, and no further.
+    assert stub_server.hits == 2
+    records.close()
@@ -0,0 +1,33 @@
+import datetime as dt
+
+import pytest
+
+from benzinga import financial_data
+from benzinga.benzinga_errors import IncorrectParameterEntry
+from benzinga.param_check import VALIDATORS
+
+
+def test_auto_complete_passes_validation(stub_server):
+    stub_server.respond = lambda path: (200, {}, {"result": []})
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    assert client.auto_complete("AAP", limit=5) == {"result": []}
+    assert "apikey=token" in stub_server.paths[0]
+
+
+def test_validator_coerces_numbers_and_dates():
+    params = VALIDATORS["calendar_check"]({"page": 2, "parameters[date_from]": dt.date(2024, 1, 2)})
+    assert params == {"page": 2, "parameters[date_from]": "2024-01-02"}
+    numpy = pytest.importorskip("numpy")
+    params = VALIDATORS["calendar_check"](
+        {"pagesize": numpy.int64(100), "parameters[dividend_yield]": numpy.float32(1)}
+    )
+    assert type(params["pagesize"]) is int and type(params["parameters[dividend_yield]"]) is float
+
+
+def test_validator_rejects_unknown_and_mistyped_parameters():
+    with pytest.raises(IncorrectParameterEntry):
+        VALIDATORS["autocomplete_check"]({"token": "token"})
+    with pytest.raises(IncorrectParameterEntry):
+        VALIDATORS["calendar_check"]({"page": "2"})
+    with pytest.raises(IncorrectParameterEntry):
+        VALIDATORS["calendar_check"]({"page": True})
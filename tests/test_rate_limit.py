@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from benzinga import financial_data, rate_limit
+from benzinga.benzinga_errors import RateLimitError
+from benzinga.config import RETRIES
+from benzinga.rate_limit import FileTokenBucket, RateLimiter
+
+
+def test_persistent_429_is_retried_by_the_limiter_only(stub_server):
+    stub_server.respond = lambda path: (429, {"Retry-After": "0"}, {})
+    client = stub_server.point(financial_data.Benzinga(
+        "token", log=False, rate_limiter=RateLimiter(rate=1000, burst=1000), metrics=True
+    ))
+    started = time.monotonic()
+    with pytest.raises(RateLimitError):
+        client.dividends()
+    assert stub_server.hits == RETRIES + 1
+    assert time.monotonic() - started < 5
+    retries = client.metrics.snapshot()["retries"]
+    assert sum(retries.values()) == RETRIES
+
+
+def test_limiter_session_still_retries_server_errors(stub_server):
+    responses = iter([(503, {}, {}), (200, {}, {"dividends": []})])
+    stub_server.respond = lambda path: next(responses)
+    client = stub_server.point(financial_data.Benzinga(
+        "token", log=False, rate_limiter=RateLimiter(rate=1000, burst=1000)
+    ))
+    assert client.dividends() == {"dividends": []}
+    assert stub_server.hits == 2
+
+
+def test_file_bucket_without_fcntl_raises_os_error(monkeypatch, tmp_path):
+    monkeypatch.setattr(rate_limit, "fcntl", None)
+    with pytest.raises(OSError, match="fcntl"):
+        FileTokenBucket(str(tmp_path / "bucket"), rate=10, burst=10)
@@ -0,0 +1,35 @@
+import datetime as dt
+import json
+import os
+
+import pytest
+
+from benzinga import financial_data
+from benzinga.records import OptionActivity, Rating
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def test_records_parse_their_fields_once_and_hold_no_dict():
+    rating = Rating.from_dict({"id": "1", "date": "2024-03-21", "time": "09:30:00", "pt_current": "12.5",
+                               "pt_prior": "", "importance": "3", "updated": 1710029905, "unknown": "x"})
+    assert not hasattr(rating, "__dict__")
+    assert (rating.date, rating.time, rating.pt_current) == (dt.date(2024, 3, 21), dt.time(9, 30), 12.5)
+    assert rating.pt_prior is None and rating.importance == 3
+    with pytest.raises(AttributeError):
+        rating.unknown = "x"
+    assert Rating(**rating.to_dict()) == rating
+    assert Rating.from_dict({"pt_current": "n/a"}).pt_current is None
+
+
+def test_output_records_converts_calls_and_iterators(stub_server):
+    with open(os.path.join(FIXTURES, "options_activity.json"), "rb") as fh:
+        body = fh.read()
+    stub_server.respond = lambda path: (200, {}, body if "page=" not in path or "page=0" in path else [])
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    expected = json.loads(body)["option_activity"]
+    records = client.options_activity(output="records")
+    assert all(isinstance(record, OptionActivity) for record in records)
+    assert [record.id for record in records] == [record["id"] for record in expected]
+    assert records[0].strike_price == float(expected[0]["strike_price"])
+    assert list(client.iter_options_activity(pagesize=len(expected) + 1, output="records")) == records
@@ -0,0 +1,71 @@
+import json
+import os
+
+import pytest
+
+from benzinga.streaming import RecordParser
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name + ".json"), "rb") as fh:
+        return json.load(fh)
+
+
+def responses():
+    """Small responses built from the fixtures, with numbers, escapes and multi-byte characters to cut."""
+    instruments = fixture("instruments")
+    options = fixture("options_activity")
+    yield "instruments", {"instruments": instruments["instruments"][:3]}
+    yield "option_activity", {"total": 12.5, "option_activity": options["option_activity"][:2]}
+    yield "ratings", {"meta": {"page": [0, -1]}, "total": -0.25e-2, "ratings": [
+        12.5, -3, 0.5, 1e3, -7E+2, 0, True, None, "é✓ \"q\" \\n", {"a": [1, 2.75, {"b": -0.0}]}, [],
+    ], "tail": 1e-5}
+    yield None, [1, 22, 333.25, -4e-2, {"id": "中"}]
+
+
+def parse(chunks, key):
+    parser = RecordParser(key)
+    records = []
+    for chunk in chunks:
+        records += parser.feed(chunk)
+    parser.close()
+    return records
+
+
+def expected(response, key):
+    return response if key is None else response[key]
+
+
+@pytest.mark.parametrize("key, response", list(responses()))
+def test_every_split_point_matches_json_loads(key, response):
+    body = json.dumps(response, ensure_ascii=False).encode()
+    assert json.loads(body) == response
+    for offset in range(len(body) + 1):
+        assert parse([body[:offset], body[offset:]], key) == expected(response, key), offset
+
+
+@pytest.mark.parametrize("key, response", list(responses()))
+def test_byte_by_byte_matches_json_loads(key, response):
+    body = json.dumps(response, ensure_ascii=False, indent=1).encode()
+    assert parse([body[i:i + 1] for i in range(len(body))], key) == expected(response, key)
+
+
+def test_a_cut_number_is_not_decoded_early():
+    parser = RecordParser("ratings")
+    assert parser.feed(b'{"total": 12.') == []
+    assert parser.feed(b'5, "ratings": [-') == []
+    assert parser.feed(b"1") == []
+    assert parser.feed(b"e") == []
+    assert parser.feed(b"2, 0.") == [-100.0]
+    assert parser.feed(b"5]}") == [0.5]
+    parser.close()
+
+
+def test_truncated_and_invalid_bodies_raise():
+    body = json.dumps({"ratings": [{"id": 1}, {"id": 2}]}).encode()
+    with pytest.raises(json.JSONDecodeError):
+        parse([body[:-5]], "ratings")
+    with pytest.raises(json.JSONDecodeError):
+        parse([b'{"ratings": [1x, 2]}'], "ratings")
@@ -0,0 +1,32 @@
+from urllib.parse import parse_qs, urlsplit
+
+from benzinga import financial_data
+from benzinga.sync import CalendarSync, JSONWatermarkStore
+
+
+def query(path):
+    return {name: values[0] for name, values in parse_qs(urlsplit(path).query).items()}
+
+
+def test_watermark_persists_and_resumes_across_runs(stub_server, tmp_path):
+    ratings = [{"id": "a", "updated": 100}, {"id": "b", "updated": 200}, {"id": "c"}]
+
+    def respond(path):
+        params = query(path)
+        since = int(params.get("parameters[updated]", 0))
+        page = [rating for rating in ratings if rating.get("updated", since) >= since]
+        return 200, {}, {"ratings": page if params["page"] == "0" else []}
+
+    stub_server.respond = respond
+    path = str(tmp_path / "watermarks.json")
+    client = stub_server.point(financial_data.Benzinga("token", log=False))
+    first = CalendarSync(client, JSONWatermarkStore(path)).run("ratings", company_tickers="AAPL")
+    assert [rating["id"] for rating in first] == ["a", "b", "c"]
+
+    ratings.append({"id": "d", "updated": 300})
+    stub_server.paths.clear()
+    second = CalendarSync(client, JSONWatermarkStore(path)).run("ratings", company_tickers="AAPL")
+    assert query(stub_server.paths[0])["parameters[updated]"] == "200"
+    # "b" sits on the watermark and was delivered already; "c" has no timestamp and is kept.
+    assert [rating["id"] for rating in second] == ["c", "d"]
+    assert JSONWatermarkStore(path).get("ratings:AAPL") == {"updated": 300, "ids": ["d"]}
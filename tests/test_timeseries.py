@@ -0,0 +1,81 @@
+import datetime as dt
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from benzinga import financial_data
+from benzinga.timeseries import CandleStore, day_ms, merge_ranges, missing_ranges
+
+
+def query(path):
+    return {name: values[0] for name, values in parse_qs(urlsplit(path).query).items()}
+
+
+def day(text):
+    return dt.date.fromisoformat(text)
+
+
+def test_merge_ranges_joins_overlapping_and_touching_ranges():
+    ranges = [(day("2024-01-10"), day("2024-01-12")), (day("2024-01-01"), day("2024-01-05")),
+              (day("2024-01-06"), day("2024-01-07")), (day("2024-01-11"), day("2024-01-20"))]
+    assert merge_ranges(ranges) == [(day("2024-01-01"), day("2024-01-07")), (day("2024-01-10"), day("2024-01-20"))]
+
+
+def test_missing_ranges_returns_the_gaps_around_held_ranges():
+    held = [(day("2024-01-05"), day("2024-01-10")), (day("2024-01-15"), day("2024-01-20"))]
+    assert missing_ranges(held, day("2024-01-01"), day("2024-01-31")) == [
+        (day("2024-01-01"), day("2024-01-04")), (day("2024-01-11"), day("2024-01-14")),
+        (day("2024-01-21"), day("2024-01-31")),
+    ]
+    assert missing_ranges(held, day("2024-01-06"), day("2024-01-09")) == []
+    assert missing_ranges([], day("2024-01-01"), day("2024-01-02")) == [(day("2024-01-01"), day("2024-01-02"))]
+
+
+def daily_bars(close):
+    def respond(path):
+        params = query(path)
+        start, end = day(params["from"]), day(params["to"])
+        candles = [{"time": day_ms(start + dt.timedelta(days=offset)), "open": 1, "high": 2, "low": 0,
+                    "close": close, "volume": 10} for offset in range((end - start).days + 1)]
+        return 200, {}, [{"symbol": params["symbols"], "candles": candles}]
+    return respond
+
+
+def test_store_downloads_only_missing_days_and_merges_them(stub_server, tmp_path):
+    pytest.importorskip("numpy")
+    stub_server.respond = daily_bars(5)
+    store = CandleStore(stub_server.point(financial_data.Benzinga("token", log=False)), str(tmp_path))
+    first = store.bars("AAPL", "2024-01-10", "2024-01-20")["AAPL"]
+    assert len(first["time"]) == 11
+    stub_server.respond = daily_bars(6)
+    both = store.bars("AAPL", "2024-01-01", "2024-01-31")["AAPL"]
+    assert [query(path)["from"] for path in stub_server.paths] == ["2024-01-10", "2024-01-01", "2024-01-21"]
+    assert store.ranges("bars", "AAPL") == [(day("2024-01-01"), day("2024-01-31"))]
+    assert list(both["time"]) == [day_ms(day("2024-01-01")) + offset * 86400000 for offset in range(31)]
+    # Held days keep their candles; the newly downloaded days come from the second response.
+    assert list(both["close"][:9]) == [6] * 9 and list(both["close"][9:20]) == [5] * 11
+    store.bars("AAPL", "2024-01-05", "2024-01-25")
+    assert stub_server.hits == 3
+
+
+def test_store_downloads_symbols_concurrently(stub_server, tmp_path):
+    pytest.importorskip("numpy")
+    respond, lock, active = daily_bars(5), threading.Lock(), [0, 0]
+
+    def slow(path):
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.2)
+        with lock:
+            active[0] -= 1
+        return respond(path)
+
+    stub_server.respond = slow
+    store = CandleStore(stub_server.point(financial_data.Benzinga("token", log=False, max_workers=4)), str(tmp_path))
+    series = store.bars(["AAPL", "MSFT", "TSLA"], "2024-01-01", "2024-01-05")
+    assert sorted(series) == ["AAPL", "MSFT", "TSLA"]
+    assert all(len(candles["time"]) == 5 for candles in series.values())
+    assert active[1] > 1
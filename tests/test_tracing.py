@@ -0,0 +1,70 @@
+import pytest
+
+from benzinga import financial_data, news_data
+from benzinga.tracing import REDACTED, OpenTelemetryHook, RequestHook, redact
+
+SECRET = "secret-token"
+
+
+class Recorder(RequestHook):
+
+    def __init__(self):
+        self.seen = []
+
+    def before_request(self, context):
+        self.seen.append(("before", dict(context.params)))
+
+    def after_response(self, context):
+        self.seen.append(("after", dict(context.params)))
+
+    def on_error(self, context, error):
+        self.seen.append(("error", dict(context.params)))
+
+
+def test_redact_masks_tokens_and_drops_none():
+    assert redact({"token": SECRET, "apikey": SECRET, "symbols": "AAPL", "page": None}) == {
+        "token": REDACTED, "apikey": REDACTED, "symbols": "AAPL"
+    }
+
+
+def test_hooks_never_see_the_token(stub_server):
+    recorder = Recorder()
+    stub_server.respond = lambda path: (200, {}, {"ratings": []} if "ratings" in path else {"result": []})
+    client = stub_server.point(financial_data.Benzinga(SECRET, log=False, hooks=[recorder]))
+    client.ratings(company_tickers="AAPL")
+    client.company_profile("AAPL")
+    stub_server.respond = lambda path: (401, {}, {})
+    with pytest.raises(Exception):
+        client.ratings()
+    news = stub_server.point(news_data.News(SECRET, log=False, hooks=[recorder]))
+    stub_server.respond = lambda path: (200, {}, [])
+    news.news()
+
+    assert [event for event, _ in recorder.seen] == ["before", "after"] * 2 + ["before", "error"] + ["before", "after"]
+    for _, params in recorder.seen:
+        assert SECRET not in params.values()
+        assert REDACTED in (params.get("token"), params.get("apikey"))
+    # The token still reaches the server.
+    assert all(SECRET in path for path in stub_server.paths)
+
+
+def test_opentelemetry_spans_carry_redacted_params(stub_server):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    stub_server.respond = lambda path: (200, {}, {"result": []})
+    client = stub_server.point(financial_data.Benzinga(
+        SECRET, log=False, hooks=[OpenTelemetryHook(tracer_provider=provider)]
+    ))
+    client.company_profile("AAPL")
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "benzinga.company_profile"
+    assert span.attributes["benzinga.param.apikey"] == REDACTED
+    assert span.attributes["http.response.status_code"] == 200
+    assert all(SECRET not in str(value) for value in span.attributes.values())